@@ -14,55 +14,49 @@ from bpy.props import BoolProperty, StringProperty, FloatProperty, IntProperty
 from . import props
 from . import utils
 from . import math_utils
+from . import kernels
 from . import core
 from . import operators
 from . import ui
 from . import handlers
 
-def _ensure_scene_props():
-    # 这些属性名来自你插件的 UI：确保它们都已注册到 bpy.types.Scene
-    if not hasattr(bpy.types.Scene, "psd_show_captures"):
-        bpy.types.Scene.psd_show_captures = BoolProperty(
-            name="PSD Show Captures", description="显示/隐藏 PSD 捕捉数据", default=False
-        )
-    if not hasattr(bpy.types.Scene, "psd_show_triggers"):
-        bpy.types.Scene.psd_show_triggers = BoolProperty(
-            name="PSD Show Triggers", description="显示/隐藏 PSD 触发器", default=False
-        )
+# 表达式工作线程数的默认值：模块导入时只算一次
+_DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
 
+# _ensure_scene_props 注册的 Scene 属性：(属性名, 构造器, 参数)
+_SCENE_PROP_SPECS = (
+    # 这些属性名来自你插件的 UI
+    ("psd_show_captures", BoolProperty,
+     dict(name="PSD Show Captures", description="显示/隐藏 PSD 捕捉数据", default=False)),
+    ("psd_show_triggers", BoolProperty,
+     dict(name="PSD Show Triggers", description="显示/隐藏 PSD 触发器", default=False)),
     # 下面是 psd_expr_ui.py 中用到的属性
-    if not hasattr(bpy.types.Scene, "psd_expr_mapping_path"):
-        bpy.types.Scene.psd_expr_mapping_path = StringProperty(
-            name="PSD Mapping File", subtype='FILE_PATH', default=""
-        )
-    if not hasattr(bpy.types.Scene, "psd_expr_workers"):
-        bpy.types.Scene.psd_expr_workers = IntProperty(
-            name="Workers", default=max(1, (os.cpu_count() or 2) - 1), min=1, soft_max=64
-        )
-    if not hasattr(bpy.types.Scene, "psd_expr_chunk_size"):
-        bpy.types.Scene.psd_expr_chunk_size = IntProperty(
-            name="Chunk Size", default=64, min=1, soft_max=1024
-        )
-    if not hasattr(bpy.types.Scene, "psd_expr_threshold"):
-        bpy.types.Scene.psd_expr_threshold = FloatProperty(
-            name="Threshold", default=1e-6, precision=6, min=0.0
-        )
-    if not hasattr(bpy.types.Scene, "psd_expr_running"):
-        bpy.types.Scene.psd_expr_running = BoolProperty(
-            name="Expr Running", default=False
-        )
+    ("psd_expr_mapping_path", StringProperty,
+     dict(name="PSD Mapping File", subtype='FILE_PATH', default="")),
+    ("psd_expr_workers", IntProperty,
+     dict(name="Workers", default=_DEFAULT_WORKERS, min=1, soft_max=64)),
+    ("psd_expr_chunk_size", IntProperty,
+     dict(name="Chunk Size", default=64, min=1, soft_max=1024)),
+    ("psd_expr_threshold", FloatProperty,
+     dict(name="Threshold", default=1e-6, precision=6, min=0.0)),
+    ("psd_expr_running", BoolProperty,
+     dict(name="Expr Running", default=False)),
+)
+
+def _ensure_scene_props():
+    # 确保这些属性都已注册到 bpy.types.Scene
+    for name, ctor, kw in _SCENE_PROP_SPECS:
+        if not hasattr(bpy.types.Scene, name):
+            setattr(bpy.types.Scene, name, ctor(**kw))
 
 def _del_scene_props():
-    for prop in ("psd_show_captures", "psd_show_triggers",
-                 "psd_expr_mapping_path", "psd_expr_workers",
-                 "psd_expr_chunk_size", "psd_expr_threshold",
-                 "psd_expr_running"):
-        if hasattr(bpy.types.Scene, prop):
+    for name, _ctor, _kw in _SCENE_PROP_SPECS:
+        if hasattr(bpy.types.Scene, name):
             try:
-                delattr(bpy.types.Scene, prop)
+                delattr(bpy.types.Scene, name)
             except Exception:
                 try:
-                    del bpy.types.Scene.__dict__[prop]
+                    del bpy.types.Scene.__dict__[name]
                 except Exception:
                     pass
 
@@ -72,6 +66,7 @@ classes = (
     props.PSDBoneTrigger,
     props.PSDShapeDriverFile,
     props.PSDPoseDriverFile,
+    props.PSDSceneProps,
     ui.PSDBonePairUIList,
     ui.PSDSavedPoseUIList,
     ui.PSDBoneTriggerUIList,
@@ -102,9 +97,7 @@ classes = (
     operators.PSD_OT_AddTrigger,
     operators.PSD_OT_RemoveTrigger,
     operators.PSD_OT_SelectTriggerBone,
-    operators.PSDRecordChannelX,
-    operators.PSDRecordChannelY,
-    operators.PSDRecordChannelZ,
+    operators.PSDRecordChannel,
     operators.PSD_OT_invalidate_cache,
     operators.PSD_OT_register_cache_empty_ui,
     operators.PSD_OT_unregister_cache_empty_ui,
@@ -112,17 +105,40 @@ classes = (
     handlers.PSDStopOperator,
 )
 
+# 按 classes 顺序注册；注销见 _unregister_classes（逐个容错）
+_register_classes, _ = bpy.utils.register_classes_factory(classes)
+
+def _unregister_classes():
+    # 逆序逐个注销：register 中途失败时部分类未注册，跳过即可
+    for cls in reversed(classes):
+        try:
+            bpy.utils.unregister_class(cls)
+        except Exception:
+            pass
+
+def _poll_cache_empty(self, obj):
+    # 选择器只列出 Empty
+    return obj.type == 'EMPTY'
+
 def register():
+    try:
+        _register()
+    except Exception:
+        # 中途失败时回滚已注册的部分，避免下次启用时报 "already registered"
+        unregister()
+        raise
+
+def _register():
     #_ensure_scene_props()
 
     bpy.types.Scene.psd_cache_empty = bpy.props.PointerProperty(
         name="PSD Cache Empty",
         description="选择用于 PSD 缓存的 Empty（必须是 Empty 类型）",
-        type=bpy.types.Object
+        type=bpy.types.Object,
+        poll=_poll_cache_empty
     )
 
-    for cls in classes:
-        bpy.utils.register_class(cls)
+    _register_classes()
 
     # 在 register() 中
     #if not hasattr(bpy.types.Object, "psd_mapping_path"):
@@ -143,7 +159,11 @@ def register():
     # 其他初始化（如核心变量，如果需要）
     core.init_globals()  # 如果 core.py 有初始化函数
 
+    # numba 可用时预编译批量权重内核，避免首帧卡顿
+    kernels.warmup()
+
 def unregister():
+    # 每一步都容错：可在 register 中途失败后调用，也可重复调用
     #_del_scene_props()
     #if hasattr(bpy.types.Object, "psd_mapping_path"):
     #    try: del bpy.types.Object.psd_mapping_path
@@ -155,15 +175,24 @@ def unregister():
     #psd_regmapp.unregister_mapping_sidebar()
 
     #psd_expr_ui.unregister_expr_ui()
-    del bpy.types.Scene.psd_cache_empty
+    if hasattr(bpy.types.Scene, "psd_cache_empty"):
+        try:
+            del bpy.types.Scene.psd_cache_empty
+        except Exception:
+            pass
     # 注销处理器（从 handlers.py 调用）
-    handlers.unregister_handlers()
+    try:
+        handlers.unregister_handlers()
+    except Exception as e:
+        print("[PSD] 注销处理器失败:", e)
     
     # 注销属性（从 props.py 调用）
-    props.unregister_props()
+    try:
+        props.unregister_props()
+    except Exception as e:
+        print("[PSD] 注销属性失败:", e)
     
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
+    _unregister_classes()
 
 if __name__ == "__main__":
     register()
\ No newline at end of file
@@ -1,3 +1,15 @@
+import logging
+
 #计算缓存==================
 _psd_math_cache = {}
-_psd_math_dep_cache = {}
\ No newline at end of file
+_psd_math_dep_cache = {}
+
+#UI==================
+# PSD 结果面板的版本号：删除条目 / 导入配置时递增，面板据此重建过滤排序后的键列表
+_psd_results_view_version = 0
+
+#调试==================
+# 每帧调试输出开关（控制台打印会拖慢播放，正式使用保持 False）
+_PSD_DEBUG = False
+# 每帧警告走 logging，可通过 logging.getLogger("psd").setLevel(...) 统一过滤
+psd_log = logging.getLogger("psd")
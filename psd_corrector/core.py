@@ -3,21 +3,50 @@ import os
 import bpy
 import time
 import math
+from collections import deque
 from mathutils import Vector, Euler, Quaternion # 导入依赖
-from .utils import _safe_name, _get_rest_matrix, _get_pose_matrix, _capture_bone_local_rotation_deg, _capture_bone_local_translation_effective, _capture_bone_local_scale, _is_animation_playing, psd_set_result_datablock_only, psd_set_result_cache_only, psd_get_results_for_arm, psd_set_result_datablock_empty_only, _arm_key_for_obj, psd_flush_mem_to_registered_empty  # 导入捕获函数（如果移动到 utils）
-from .utils import PREFIX_RESULT, PREFIX_RESULT_LOC, PREFIX_RESULT_SCA, _psd_results_cache
+from .utils import _safe_name, _get_rest_matrix, _get_pose_matrix, _capture_bone_local_rotation_deg, _capture_bone_local_translation_effective, _capture_bone_local_rot_loc, _capture_bones_local_batch, _capture_bone_local_scale, _is_animation_playing, psd_set_result_cache_only, psd_get_results_for_arm, psd_set_result_datablock_empty_only, _arm_key_for_obj, psd_flush_mem_to_registered_empty  # 导入捕获函数（如果移动到 utils）
+from .utils import PREFIX_RESULT, PREFIX_RESULT_LOC, PREFIX_RESULT_SCA, _psd_results_cache, psd_result_key
+from . import caches
 from .json_shape_driver import ShapeDriver
 from .json_pose_driver import PoseDriver
 from .math_utils import (
     compute_direct_channel_weight, compute_rotation_weight,
-    compute_location_weight, compute_scale_weight, compute_triggers
+    compute_location_weight, compute_scale_weight, compute_triggers,
+    compute_cone_weights_batch, compute_rotation_weights_batch, compute_location_weights_batch,
+    compute_scale_weights_batch,
+    compute_direct_channel_weights_batch,
+    _euler_deg_to_quat_batch, _cone_cos2_half, _AXIS_IDX, _DIRECT_TWIST_IDX
 )
+import numpy as np
 
 # 全局变量
 last_compute_time = 0.0
+# 节流间隔（秒）：由 scene.psd.idle_hz 的 update 回调和播放状态变化（msgbus）刷新，计算时只读这一个值
+_current_min_interval = 0.05
+# 播放时本帧已计算过的帧号：frame_change_post 与 depsgraph_update_post 会为同一帧各触发一次，第二次直接跳过
+_psd_last_tick_frame = None
+# 性能调试开关 / 历史长度：由 scene.psd.perf_* 的 update 回调和文件加载 / 撤销刷新，计算时不再逐次读取场景属性
+_psd_perf_enabled = False
+_psd_perf_history_len = 10
 _psd_perf_stats = {}
+# 骨骼状态缓存：{ arm_key -> {"names": 骨骼名元组, "samples": (N,9) 上次计算时的 loc/rot/sca} }，缺失 / 失效的行为 NaN
 _psd_bone_state_cache = {}
 
+# 条目 SoA 缓存：{ arm_key -> {"stamp", "entries", "pose_rot", "q_center", "cone_angle", "cone_cos2_half", "cone_axis_idx", "flags", "bone_names", "entry_names"} }
+# 条目属性 update 回调 / 增删条目的操作器 / undo / load 时失效，另外条目数量变化时自动重建
+_psd_entry_cache = {}
+# 骨骼过滤集合缓存：{ arm_key -> (骨骼对数量, soa, frozenset, sorted_tuple) }
+_psd_bone_filter_cache = {}
+
+# flags 位
+ENTRY_F_HAS_ROT = 1
+ENTRY_F_CONE = 2
+ENTRY_F_HAS_LOC = 4
+ENTRY_F_LOC_ENABLED = 8
+ENTRY_F_DIRECT = 16
+ENTRY_F_HAS_SCA = 32
+
 #计算缓存==================
 POST_PROCESS_EXPRESSIONS = {}
 POSE_DRIVERS = {}
@@ -184,13 +213,17 @@ def psd_get_result_snapshot():
 
 
 def init_globals():
-    global last_compute_time, _psd_perf_stats, _psd_bone_state_cache
+    global last_compute_time
     # global POST_PROCESS_EXPRESSIONS
     # global POSE_DRIVERS
 
     last_compute_time = 0.0
-    _psd_perf_stats = {}
-    _psd_bone_state_cache = {}
+    # 原地清空而不是重新绑定：ui 等模块按名字导入了这些字典，重新绑定会让它们拿到旧对象
+    _psd_perf_stats.clear()
+    _psd_bone_state_cache.clear()
+    # 条目 SoA / 骨骼过滤缓存：热路径只读这些缓存，psd_saved_poses 集合只在条目变化后重建时读取一次
+    _psd_entry_cache.clear()
+    _psd_bone_filter_cache.clear()
     # POSE_DRIVERS = load_pose_drivers()
 
     # # === 新增：插件初始化时只加载一次 JSON（仅此一次）===
@@ -204,75 +237,617 @@ def init_globals():
     # shape_driver_instance = ShapeDriver(POST_PROCESS_EXPRESSIONS)
     # pose_driver_instance = PoseDriver(POSE_DRIVERS)
 
+def psd_update_min_interval(scene=None):
+    """
+    重新计算节流间隔：播放时不节流 -> 0.0；空闲时为 1 / scene.psd.idle_hz。
+    """
+    global _current_min_interval, _psd_last_tick_frame
+    # 播放状态或节流参数变化时重置帧守卫
+    _psd_last_tick_frame = None
+    try:
+        if scene is None:
+            scene = bpy.context.scene if (bpy.context and getattr(bpy.context, "scene", None)) else None
+        if _is_animation_playing():
+            _current_min_interval = 0.0
+        else:
+            hz = int(getattr(getattr(scene, "psd", None), "idle_hz", 10) or 10)
+            if hz < 1:
+                hz = 1
+            elif hz > 240:
+                hz = 240
+            _current_min_interval = 1.0 / float(hz)
+    except Exception:
+        _current_min_interval = 0.05
+    return _current_min_interval
+
+def psd_update_perf_settings(scene=None):
+    """从 scene.psd 重新读取性能调试开关与历史长度"""
+    global _psd_perf_enabled, _psd_perf_history_len
+    try:
+        if scene is None:
+            scene = bpy.context.scene if (bpy.context and getattr(bpy.context, "scene", None)) else None
+        settings = getattr(scene, "psd", None)
+        _psd_perf_enabled = bool(settings and settings.perf_enabled)
+        _psd_perf_history_len = int(getattr(settings, "perf_history_len", 10) or 10)
+    except Exception:
+        _psd_perf_enabled = False
+        _psd_perf_history_len = 10
+
+def psd_throttle_remaining():
+    """距离节流窗口结束还剩多少秒（0.0 表示现在调用 _psd_compute_all 不会被节流）"""
+    min_interval = _current_min_interval
+    if min_interval <= 0.0:
+        return 0.0
+    return max(0.0, min_interval - (time.time() - last_compute_time))
+
 def psd_invalidate_bone_cache(arm_name=None, bone_name=None):
     """
     清空缓存：
       - psd_invalidate_bone_cache()             -> 清空全部缓存
       - psd_invalidate_bone_cache(arm_name)     -> 清空某个 arm 的缓存
       - psd_invalidate_bone_cache(arm_name, bn) -> 清空某个 arm 下的某个骨骼缓存
-    在添加/删除 saved entry、切换 arm、或手动需要强制刷新时调用。
+    arm_name 可以是骨架对象、对象名或缓存 key（缓存按 as_pointer() 存储，旧数据可能按名字存储）。
+    在添加/删除 saved entry、撤销、切换 arm、或手动需要强制刷新时调用。
     """
     global _psd_bone_state_cache
     if arm_name is None:
         _psd_bone_state_cache.clear()
         return
-    arm_cache = _psd_bone_state_cache.get(arm_name)
-    if not arm_cache:
+    keys = [arm_name]
+    try:
+        arm_obj = bpy.data.objects.get(arm_name) if isinstance(arm_name, str) else arm_name
+        if arm_obj is not None and hasattr(arm_obj, "as_pointer"):
+            keys.append(_arm_key_for_obj(arm_obj))
+    except Exception:
+        pass
+    for key in keys:
+        if bone_name is None:
+            _psd_bone_state_cache.pop(key, None)
+        else:
+            arm_cache = _psd_bone_state_cache.get(key)
+            if arm_cache:
+                try:
+                    # 该行置为 NaN：下一帧一定判定为已变化
+                    arm_cache["samples"][arm_cache["names"].index(bone_name)] = np.nan
+                except Exception:
+                    pass
+
+class _EntrySnapshot:
+    """
+    PSDSavedPose 的纯 Python 快照（属性名与 PSDSavedPose 一致，可直接传给 math_utils 的计算函数）。
+    热循环中读取普通属性，避免反复跨越 RNA 边界。
+    """
+    __slots__ = (
+        "ptr", "name", "bone_name", "is_direct_channel", "channel_axis", "record_rot_channel_mode",
+        "direct_twist_idx", "direct_ch_idx",
+        "has_rot", "rest_rot", "pose_rot", "cone_enabled", "cone_angle", "cone_axis", "cone_cos2_half",
+        "has_loc", "rest_loc", "pose_loc", "loc_enabled", "loc_radius",
+        "has_sca", "rest_sca", "pose_sca",
+        "rot_key", "loc_key", "sca_key", "perf_key",
+    )
+
+    def __init__(self, e):
+        try:
+            self.ptr = e.as_pointer()
+        except Exception:
+            self.ptr = id(e)
+        self.name = e.name
+        self.bone_name = e.bone_name
+        self.is_direct_channel = bool(getattr(e, 'is_direct_channel', False))
+        self.channel_axis = getattr(e, 'channel_axis', 'X')
+        self.record_rot_channel_mode = getattr(e, 'record_rot_channel_mode', 'NONE')
+        # Direct Channel 的模式/通道只在录制时变化，预先编码为整数
+        self.direct_twist_idx = _DIRECT_TWIST_IDX.get(self.record_rot_channel_mode, 0)
+        self.direct_ch_idx = _AXIS_IDX.get(self.channel_axis, 0)
+        self.has_rot = bool(getattr(e, 'has_rot', False))
+        self.rest_rot = tuple(e.rest_rot)
+        self.pose_rot = tuple(e.pose_rot)
+        self.cone_enabled = bool(getattr(e, 'cone_enabled', False))
+        self.cone_angle = float(getattr(e, 'cone_angle', 60.0))
+        self.cone_axis = getattr(e, 'cone_axis', 'Z')
+        self.cone_cos2_half = _cone_cos2_half(self.cone_angle)
+        self.has_loc = bool(getattr(e, 'has_loc', False))
+        self.rest_loc = tuple(e.rest_loc)
+        self.pose_loc = tuple(e.pose_loc)
+        self.loc_enabled = bool(getattr(e, 'loc_enabled', False))
+        self.loc_radius = float(getattr(e, 'loc_radius', 0.1))
+        self.has_sca = bool(getattr(e, 'has_sca', False))
+        self.rest_sca = tuple(e.rest_sca)
+        self.pose_sca = tuple(e.pose_sca)
+        # 结果键只依赖骨骼名/条目名，改名会触发快照重建
+        self.rot_key = psd_result_key(PREFIX_RESULT, self.bone_name, self.name)
+        self.loc_key = psd_result_key(PREFIX_RESULT_LOC, self.bone_name, self.name)
+        self.sca_key = psd_result_key(PREFIX_RESULT_SCA, self.bone_name, self.name)
+        # perf 记录用的代表键：优先旋转，其次位移、缩放
+        if self.has_loc and not self.has_rot:
+            self.perf_key = self.loc_key
+        elif self.has_sca and not self.has_rot:
+            self.perf_key = self.sca_key
+        else:
+            self.perf_key = self.rot_key
+
+    def as_pointer(self):
+        return self.ptr
+
+
+def _snapshot_entries(saved):
+    """只读取一次 RNA，返回 [_EntrySnapshot, ...]"""
+    out = []
+    for e in saved:
+        try:
+            out.append(_EntrySnapshot(e))
+        except Exception as ex:
+            print("PSD 条目快照失败", getattr(e, "name", "<unknown>"), ex)
+    return out
+
+
+def psd_invalidate_entry_cache(arm_obj=None):
+    """清空条目 SoA 缓存：不传参数清空全部，否则只清空该骨架"""
+    psd_invalidate_bone_filter(arm_obj)
+    if arm_obj is None:
+        _psd_entry_cache.clear()
         return
-    if bone_name is None:
-        _psd_bone_state_cache.pop(arm_name, None)
-    else:
-        arm_cache.pop(bone_name, None)
+    _psd_entry_cache.pop(_arm_key_for_obj(arm_obj), None)
+
 
-def _psd_make_sample_from_maps(rot_map, loc_map, sca_map, bn, round_ndigits=6):
+def psd_saved_entry_index(arm, bone_name, entry_name):
     """
-    从 bone_to_cur_rot / bone_to_cur_loc / bone_to_cur_sca 生成一个可比较的 sample。
-    rot_map/loc_map/sca_map 是字典，bn 是骨骼名。
-    返回 (loc_tuple, rot_tuple, sca_tuple)，其中每个子项要么是 tuple 要么是 None。
+    返回 arm.psd_saved_poses 中 (bone_name, entry_name) 条目的索引，不存在时返回 -1。
+    索引表取自条目 SoA 缓存（条目增删/改名/导入时随 SoA 一起重建），不再逐条目跨越 RNA 读取名字；缓存不可用时回退到遍历。
     """
-    def _to_tuple(v):
-        if v is None:
-            return None
-        # v 可能是 mathutils.Vector 或 tuple/list
+    saved = getattr(arm, 'psd_saved_poses', None)
+    if not saved:
+        return -1
+    try:
+        soa = _get_entry_soa(_arm_key_for_obj(arm), saved)
+        index = soa.get("entry_index")
+        if index is None:
+            # 重名时保留第一个，与遍历查找的结果一致
+            index = {}
+            for i, k in enumerate(zip(soa["bone_names"], soa["entry_names"])):
+                index.setdefault(k, i)
+            soa["entry_index"] = index
+        return index.get((bone_name, entry_name), -1)
+    except Exception:
+        for i, e in enumerate(saved):
+            if e.bone_name == bone_name and e.name == entry_name:
+                return i
+        return -1
+
+
+def psd_saved_entry_exists(arm, bone_name, entry_name):
+    """arm 是否已有 (bone_name, entry_name) 条目（录制/保存条目前查重用）"""
+    return psd_saved_entry_index(arm, bone_name, entry_name) >= 0
+
+
+def psd_saved_entry_bone_names(arm):
+    """按 psd_saved_poses 顺序返回各条目的骨骼名（取自条目 SoA 缓存，供 UI 过滤使用）；不可用时返回 None"""
+    saved = getattr(arm, 'psd_saved_poses', None)
+    if saved is None:
+        return None
+    try:
+        return _get_entry_soa(_arm_key_for_obj(arm), saved)["bone_names"]
+    except Exception:
+        return None
+
+
+def psd_invalidate_bone_filter(arm_obj=None):
+    """清空骨骼过滤集合缓存（骨骼对名字被修改时调用）"""
+    if arm_obj is None:
+        _psd_bone_filter_cache.clear()
+        return
+    _psd_bone_filter_cache.pop(_arm_key_for_obj(arm_obj), None)
+
+
+def _get_bone_filter(arm, arm_key, soa):
+    """
+    返回 (bone_filter 集合, 排序后的骨骼名元组)。
+    骨骼对数量或条目 SoA 变化时重建；骨骼对改名通过 psd_invalidate_bone_filter 失效。
+    """
+    try:
+        n_pairs = len(arm.psd_bone_pairs)
+    except Exception:
+        n_pairs = 0
+    cached = _psd_bone_filter_cache.get(arm_key)
+    if cached is not None and cached[0] == n_pairs and cached[1] is soa:
+        return cached[2], cached[3]
+
+    bone_filter = None
+    if n_pairs > 0:
         try:
-            return tuple(round(float(x), round_ndigits) for x in v)
+            bone_filter = frozenset(p.bone_name for p in arm.psd_bone_pairs if p.bone_name)
         except Exception:
-            try:
-                return tuple(round(float(x), round_ndigits) for x in tuple(v))
-            except Exception:
-                return None
+            bone_filter = None
+    if bone_filter is None:
+        bone_filter = frozenset(e.bone_name for e in soa["entries"] if e.bone_name)
+    bone_names = tuple(sorted(bone_filter))
+    _psd_bone_filter_cache[arm_key] = (n_pairs, soa, bone_filter, bone_names)
+    return bone_filter, bone_names
+
+
+def _get_entry_soa(arm_key, saved):
+    """
+    返回 arm 的条目 SoA 缓存（必要时重建）。
+    entries 为 _EntrySnapshot 列表，其余为与之一一对应的 NumPy 数组 / 名称列表。
+    """
+    stamp = len(saved)
+    soa = _psd_entry_cache.get(arm_key)
+    if soa is not None and soa["stamp"] == stamp:
+        return soa
+
+    entries = _snapshot_entries(saved)
+    n = len(entries)
+    # 条目变化（录制/删除/导入）后，未移动的骨骼也必须重算一次，否则新条目会被跳过
+    _psd_bone_state_cache.pop(arm_key, None)
+    pose_rot = np.array([e.pose_rot for e in entries], dtype=np.float64).reshape(n, 3)
+    rest_rot = np.array([e.rest_rot for e in entries], dtype=np.float64).reshape(n, 3)
+    pose_dir = pose_rot - rest_rot
+    rest_sca = np.array([e.rest_sca for e in entries], dtype=np.float64).reshape(n, 3)
+    sca_dir = np.array([e.pose_sca for e in entries], dtype=np.float64).reshape(n, 3) - rest_sca
+    flags = np.zeros(n, dtype=np.uint8)
+    for i, e in enumerate(entries):
+        f = 0
+        if e.has_rot:
+            f |= ENTRY_F_HAS_ROT
+        if e.cone_enabled:
+            f |= ENTRY_F_CONE
+        if e.has_loc:
+            f |= ENTRY_F_HAS_LOC
+        if e.loc_enabled:
+            f |= ENTRY_F_LOC_ENABLED
+        if e.is_direct_channel:
+            f |= ENTRY_F_DIRECT
+        if e.has_sca:
+            f |= ENTRY_F_HAS_SCA
+        flags[i] = f
+
+    soa = {
+        "stamp": stamp,
+        "entries": entries,
+        "pose_rot": pose_rot,
+        "rest_rot": rest_rot,
+        "pose_dir": pose_dir,
+        "pose_denom": np.einsum('ij,ij->i', pose_dir, pose_dir),
+        "q_center": _euler_deg_to_quat_batch(pose_rot) if n else np.empty((0, 4)),
+        "rest_loc": np.array([e.rest_loc for e in entries], dtype=np.float64).reshape(n, 3),
+        "pose_loc": np.array([e.pose_loc for e in entries], dtype=np.float64).reshape(n, 3),
+        "loc_radius": np.array([e.loc_radius for e in entries], dtype=np.float64),
+        "loc_enabled": np.array([e.loc_enabled for e in entries], dtype=bool),
+        "cone_angle": np.array([e.cone_angle for e in entries], dtype=np.float64),
+        "cone_cos2_half": np.array([e.cone_cos2_half for e in entries], dtype=np.float64),
+        "cone_axis_idx": np.array([_AXIS_IDX.get(e.cone_axis, 2) for e in entries], dtype=np.intp),
+        "rest_sca": rest_sca,
+        "sca_dir": sca_dir,
+        "sca_len2": np.einsum('ij,ij->i', sca_dir, sca_dir),
+        "flags": flags,
+        "bone_names": [e.bone_name for e in entries],
+        "entry_names": [e.name for e in entries],
+    }
+    _psd_entry_cache[arm_key] = soa
+    return soa
+
+
+def _psd_gather_arm_samples(arm, bone_filter, depsgraph=None, bone_names=None):
+    """
+    采集阶段：返回 (bone_to_cur_rot, bone_to_cur_loc, bone_to_cur_sca, samples)。bone_names 为排好序的 bone_filter。
+    samples 为与 bone_names 逐行对应的 (N,9) 数组（loc, rot, sca），未采样到的骨骼为 NaN，供 _psd_detect_skip_bones 整批比较。
+    """
+    # 预采样：当前旋转/位移/缩放（避免重复捕捉）
+    bone_to_cur_rot = {}
+    bone_to_cur_loc = {}
+    bone_to_cur_sca = {}
+
+    # 批量采样：一次 foreach_get 取出全部 pose 矩阵/缩放，失败时回退逐骨骼采样
+    batch = None
+    if bone_names is None:
+        bone_names = tuple(sorted(bone_filter))
+    try:
+        batch = _capture_bones_local_batch(arm, bone_names, depsgraph=depsgraph)
+    except Exception:
+        batch = None
+    samples = np.full((len(bone_names), 9), np.nan)
+    if batch is not None:
+        # 直接存 [x, y, z] 列表：批量计算按行收集成数组，逐条目回退路径也只按下标取分量，不需要 Vector
+        b_names, b_rot, b_loc, b_sca = batch
+        bone_to_cur_rot.update(zip(b_names, b_rot.tolist()))
+        bone_to_cur_loc.update(zip(b_names, b_loc.tolist()))
+        bone_to_cur_sca.update(zip(b_names, b_sca.tolist()))
+        packed = np.hstack((b_loc, b_rot, b_sca))
+        if len(b_names) == len(bone_names):
+            # 全部骨骼都存在时 b_names 与 bone_names 顺序一致
+            samples = packed
+        elif b_names:
+            row_of = {bn: i for i, bn in enumerate(bone_names)}
+            samples[[row_of[bn] for bn in b_names]] = packed
+
+    if batch is None:
+        # 逐骨骼回退才需要求值对象（批量路径在 _capture_bones_local_batch 内部自行 evaluated_get）
+        source_obj = arm
+        try:
+            if depsgraph is not None:
+                eval_obj = arm.evaluated_get(depsgraph)
+                if eval_obj:
+                    source_obj = eval_obj
+        except Exception:
+            source_obj = arm
+        pose_bones = source_obj.pose.bones
+    for bn in (() if batch is not None else bone_filter):
+        # 逐骨骼回退：只取一次 pose bone，旋转/位移共用同一个 delta 矩阵
+        try:
+            pb = pose_bones.get(bn)
+        except Exception:
+            pb = None
+        if pb is None:
+            continue
+        try:
+            cur_deg, cur_loc = _capture_bone_local_rot_loc(arm, bn, source_obj, pb=pb)
+            bone_to_cur_rot[bn] = Vector(cur_deg)
+            bone_to_cur_loc[bn] = cur_loc
+        except Exception:
+            bone_to_cur_loc[bn] = Vector((0.0, 0.0, 0.0))
+        # copy() 保证接下来的比较不会被外部修改影响
+        bone_to_cur_sca[bn] = pb.scale.copy()
 
-    rot_t = _to_tuple(rot_map.get(bn))
-    loc_t = _to_tuple(loc_map.get(bn))
-    sca_t = _to_tuple(sca_map.get(bn))
-    return (loc_t, rot_t, sca_t)
+    if batch is None:
+        for i, bn in enumerate(bone_names):
+            loc = bone_to_cur_loc.get(bn)
+            rot = bone_to_cur_rot.get(bn)
+            sca = bone_to_cur_sca.get(bn)
+            if loc is not None and rot is not None and sca is not None:
+                samples[i] = (*loc, *rot, *sca)
 
+    return bone_to_cur_rot, bone_to_cur_loc, bone_to_cur_sca, samples
 
-def _psd_samples_equal(s1, s2, eps=1e-5):
+
+def _psd_detect_skip_bones(arm, arm_key, bone_names, samples, debug=False):
     """
-    比较两个 sample（三元组）。
-    若任一子项为 None 则视为不可比较（返回 False）。
-    eps 是每分量允许的最大差值。
+    返回本帧未变化、可跳过计算的骨骼集合（同时刷新骨骼状态缓存）。
+    samples 为 _psd_gather_arm_samples 返回的 (N,9) 数组，与上次计算时的采样整批比较，每个分量允许 1e-5 的误差。
     """
-    if s1 is None or s2 is None:
-        return False
-    # s1, s2 都应为 (loc_t, rot_t, sca_t)
-    for a, b in zip(s1, s2):
-        if a is None or b is None:
-            return False
-        if len(a) != len(b):
-            return False
-        for va, vb in zip(a, b):
-            if abs(va - vb) > eps:
-                return False
-    return True
+    # ----------------- 检测哪些骨骼在本帧没有变化，后面跳过这些骨骼 -----------------
+    _PSD_EPS = 1e-5
+    arm_cache = _psd_bone_state_cache.get(arm_key)
+    if (not isinstance(arm_cache, dict) or arm_cache.get("names") != bone_names
+            or arm_cache["samples"].shape != samples.shape):
+        # 首次计算或骨骼集合变化：全部重算
+        _psd_bone_state_cache[arm_key] = {"names": bone_names, "samples": samples.copy()}
+        skip_bones = set()
+    else:
+        last = arm_cache["samples"]
+        # NaN（未采样 / 已失效）比较结果为 False，自然计为已变化
+        unchanged = (np.abs(samples - last) <= _PSD_EPS).all(axis=1)
+        changed = ~unchanged
+        # 只更新变化的行：缓慢移动累计超过误差后仍会被检测到
+        if changed.any():
+            last[changed] = samples[changed]
+        skip_bones = {bone_names[i] for i in np.flatnonzero(unchanged).tolist()}
+
+    if debug:
+        print(f"[PSD CACHE] arm.name={arm.name} arm_key={arm_key} skip {len(skip_bones)} bones; cached={len(bone_names)}")
+
+    # ------------------------------------------------------------------------------------
+
+    # ----------------- 修复：排除触发器引用的骨骼，不对它们做跳过优化 -----------------
+    try:
+        trigger_bones = set()
+        # 一定要用原始 arm（不要用 eval_obj）去访问自定义 collection
+        for trig in getattr(arm, "psd_triggers", ()):
+            # trig.bone_name 是触发器位置来源，trig.target_bone 是被写回结果的目标骨骼
+            if getattr(trig, "bone_name", None):
+                trigger_bones.add(trig.bone_name)
+            if getattr(trig, "target_bone", None):
+                trigger_bones.add(trig.target_bone)
+        # 从 skip_bones 中去掉触发器相关骨骼（如果它们存在）
+        if trigger_bones:
+            skip_bones.difference_update(trigger_bones)
+    except Exception:
+        # 忽略任何访问异常，保证稳健性
+        pass
+    # -----------------------------------------------------------------------------
+
+    return skip_bones
+
+
+def _psd_compute_arm_entries(arm, soa, bone_filter, skip_bones,
+                             bone_to_cur_rot, bone_to_cur_loc, bone_to_cur_sca,
+                             arm_stats=None, history_len=10):
+    """计算阶段：遍历条目计算权重，结果只写入内存缓存。arm_stats 非 None 时记录 perf。"""
+    # 有骨骼名/条目名且骨骼在 bone_filter 中的 (row, entry)，只随 SoA / bone_filter 重建，不再逐帧逐条目判断
+    cached = soa.get("active_rows")
+    if cached is not None and cached[0] is bone_filter:
+        active_rows = cached[1]
+    else:
+        active_rows = tuple(
+            (row, e) for row, e in enumerate(soa["entries"])
+            if e.bone_name and e.name and e.bone_name in bone_filter
+        )
+        soa["active_rows"] = (bone_filter, active_rows)
+    perf_enabled = arm_stats is not None
+    # Direct Channel、旋转（锥形 / 投影）、位移与缩放条目收集后在循环结束时一次性批量计算
+    direct_batch = []
+    cone_batch = []
+    rot_batch = []
+    loc_batch = []
+    sca_batch = []
+
+    # 热循环中反复用到的方法/函数先绑定为局部变量
+    direct_append = direct_batch.append
+    cone_append = cone_batch.append
+    rot_append = rot_batch.append
+    loc_append = loc_batch.append
+    sca_append = sca_batch.append
+    perf_counter = time.perf_counter
+
+    # 遍历有效条目（按条目计算），但跳过 skip_bones
+    for row, entry in active_rows:
+        bn = entry.bone_name
+        # 未采样到该骨骼（骨骼不存在）则跳过，不记录 perf
+        if bn not in bone_to_cur_rot and bn not in bone_to_cur_loc:
+            continue
+
+        # 在通过基本有效性检查后开始计时（保证我们不会为无效条目统计）
+        t_entry_start = perf_counter() if perf_enabled else None
+
+        # 快照条目只有普通属性，读取不会抛异常，这里不再逐条目 try/except；
+        # 跳过的骨骼（skip 优化）不做后续重运算，但仍记录 perf
+        if bn not in skip_bones:
+            # ---------------- Direct channel ----------------
+            if entry.is_direct_channel:
+                direct_append((entry, bn, row))
+            # ---------------- Rotation channel ----------------
+            if entry.has_rot:
+                if entry.cone_enabled:
+                    cone_append((entry, bn, row))
+                else:
+                    rot_append((entry, bn, row))
+            # ---------------- Location channel ----------------
+            if entry.has_loc:
+                loc_append((entry, bn, row))
+            # ---------------- Scale channel ----------------
+            if entry.has_sca:
+                sca_append((entry, bn, row))
+
+        if perf_enabled:
+            # 用于 perf 记录的 rep_key（即使跳过，也有 key 用于记录），快照时已选好
+            rep_key = entry.perf_key
+            dt_ms = max(0.0, (perf_counter() - t_entry_start) * 1000.0)
+
+            ent_stats = arm_stats["entries"].get(rep_key)
+            if ent_stats is None:
+                ent_stats = {"hist": deque(maxlen=history_len), "last_ms": 0.0, "avg_ms": 0.0, "sum_ms": 0.0}
+                arm_stats["entries"][rep_key] = ent_stats
+            ent_stats["last_ms"] = dt_ms
+            hist = ent_stats["hist"]
+            if hist.maxlen != history_len:
+                # 历史长度被修改：按新长度重建并重新求和
+                hist = deque(hist, maxlen=history_len)
+                ent_stats["hist"] = hist
+                ent_stats["sum_ms"] = sum(hist)
+            # 环形缓冲 + 滚动求和：满时先减去将被挤出的最旧值
+            old_ms = hist[0] if len(hist) == history_len else 0.0
+            hist.append(dt_ms)
+            ent_stats["sum_ms"] += dt_ms - old_ms
+            ent_stats["avg_ms"] = ent_stats["sum_ms"] / len(hist)
+
+    # end for entries
+
+    # ---------------- Direct channel（批量） ----------------
+    if direct_batch:
+        compute_direct_channel_weights_batch(
+            direct_batch, bone_to_cur_rot, arm,
+            psd_set_result_cache_only, PREFIX_RESULT, _safe_name
+        )
+
+    # ---------------- Rotation channel（投影，批量） ----------------
+    if rot_batch:
+        compute_rotation_weights_batch(
+            rot_batch, bone_to_cur_rot, arm,
+            psd_set_result_cache_only, PREFIX_RESULT, _safe_name,
+            soa=soa
+        )
+
+    # ---------------- Rotation channel（锥形，批量） ----------------
+    if cone_batch:
+        compute_cone_weights_batch(
+            cone_batch, bone_to_cur_rot, arm,
+            psd_set_result_cache_only, PREFIX_RESULT, _safe_name,
+            soa=soa
+        )
+
+    # ---------------- Location channel（批量） ----------------
+    if loc_batch:
+        compute_location_weights_batch(
+            loc_batch, bone_to_cur_loc, arm,
+            psd_set_result_cache_only, PREFIX_RESULT_LOC, _safe_name,
+            soa=soa
+        )
+
+    # ---------------- Scale channel（批量） ----------------
+    if sca_batch:
+        compute_scale_weights_batch(
+            sca_batch, bone_to_cur_sca, arm,
+            psd_set_result_cache_only, PREFIX_RESULT_SCA, _safe_name,
+            soa=soa
+        )
+
+
+def _psd_write_arm_results(arm):
+    """写回阶段：把内存缓存 flush 到 Empty / 驱动器。已写入 Empty 时返回 True。"""
+    # === 批量 flush 内存缓存到持久存储 ===
+    arm_key = _arm_key_for_obj(arm)  # utils 中已定义
+    mem_cache = _psd_results_cache.get(arm_key, {})
+
+    if mem_cache:
+
+        scene = _get_arm_scene(arm)
+        mode = getattr(arm, "psd_output_mode", "STORE_TO_EMPTY")
+
+        flushed = False
+
+        if mode == 'STORE_TO_EMPTY':
+            try:
+                # 原有 flush 到 Empty 逻辑（假设 utils 中函数返回 bool 或 None）
+                result = psd_flush_mem_to_registered_empty(arm)
+                flushed = bool(result) if result is not None else True
+                if flushed:
+                    # print(f"[PSD] 已将原始结果存储到注册的 Empty（骨架: {arm.name}）")
+                    return True
+            except Exception as e:
+                print(f"[PSD] Empty 存储失败: {e}")
+                flushed = False
+
+            # ================
+
+        elif mode == 'APPLY_DRIVERS':
+            flushed = True
+            # ==================== Shape Driver ====================
+            expressions = _shape_expressions_cache.get(arm_key)
+            if expressions is None:
+                expressions = load_shape_drivers(arm)
+                _shape_expressions_cache[arm_key] = expressions
+            if expressions:
+                ShapeDriver(expressions).process(arm_key, mem_cache)
+
+            # ==================== Pose Driver ====================
+            drivers = _pose_drivers_cache.get(arm_key)
+            if drivers is None:
+                drivers = load_pose_drivers(arm)
+                _pose_drivers_cache[arm_key] = drivers
+            if drivers:
+                PoseDriver(drivers).process(arm, arm_key, mem_cache)
+
+    # ================================================
+        # 如果没有注册 Empty 或 flush 失败，回退批量写到 armature datablock
+        #if not flushed:
+        #    try:
+        #        arm_db = bpy.data.armatures.get(arm.data.name)
+        #        if arm_db:
+        #            wrote_any = False
+        #            for k, v in mem_cache.items():
+        #                prev = arm_db.get(k, None)
+        #                if prev is None or abs(prev - float(v)) > 1e-6:
+        #                    arm_db[k] = float(v)
+        #                    wrote_any = True
+        #            if wrote_any:
+        #                # 可选：只在有变化时 tag（减少 depsgraph 触发）
+        #                try:
+        #                    arm_db.update_tag()
+        #                except Exception:
+        #                    pass
+        #    except Exception as e:
+        #        print("[PSD] fallback datablock 批量写入失败:", e)
+
+        # 可选：计算完后可选择清空该 arm 的内存缓存（节省内存，但下次 minor change 时仍需重写）
+        # _psd_results_cache.pop(arm_key, None)
+    return False
+
 
 def _psd_compute_all(arm=None, depsgraph=None, scene=None):
     """
     计算所有 armature 的 PSD 结果（修正版，包含稳健的骨骼变换检测缓存）。
     保持权重计算逻辑不变，改变点仅在缓存/跳过未变化骨骼和触发器访问上。
     """
-    global last_compute_time, _psd_perf_stats, _psd_bone_state_cache
+    global last_compute_time, _psd_perf_stats, _psd_bone_state_cache, _psd_last_tick_frame
     current_time = time.time()
 
     # # 如果未传入 scene，尝试安全获取
@@ -284,7 +859,7 @@ def _psd_compute_all(arm=None, depsgraph=None, scene=None):
     #     else:
     #         scene = list(bpy.data.scenes)[0] if bpy.data.scenes else None
     
-    # if not scene or not getattr(scene, 'psd_running', False):
+    # if not scene or not getattr(scene.psd, 'running', False):
     #     return
     
     # # === 输出模式和 JSON 文件列表现在从 scene 获取（全局）===
@@ -304,43 +879,35 @@ def _psd_compute_all(arm=None, depsgraph=None, scene=None):
     #     _pose_drivers_cache[arm_key] = drivers
 
 
-    # 计算最小间隔：播放时不节流 -> min_interval = 0.0；空闲时读取场景属性 psd_idle_hz
-    try:
-        sc = bpy.context.scene if (bpy.context and getattr(bpy.context, "scene", None)) else None
-        if _is_animation_playing():
-            min_interval = 0.0
-        else:
-            hz = int(getattr(sc, "psd_idle_hz", 10) or 10)
-            if hz < 1:
-                hz = 1
-            elif hz > 240:
-                hz = 240
-            min_interval = 1.0 / float(hz)
-    except Exception:
-        min_interval = 0.05
-
+    # 节流：_current_min_interval 由回调维护（播放时为 0.0）
+    min_interval = _current_min_interval
     if min_interval > 0.0:
         if current_time - last_compute_time < min_interval:
             return
     last_compute_time = current_time
 
-    # perf flag
-    perf_enabled = False
-    try:
-        sc = bpy.context.scene if bpy.context and bpy.context.scene else None
-        perf_enabled = bool(sc and getattr(sc, 'psd_perf_enabled', False))
-        history_len = int(getattr(sc, 'psd_perf_history_len', 10) or 10)
-    except Exception:
-        perf_enabled = False
-        history_len = 10
+    sc = bpy.context.scene if (bpy.context and getattr(bpy.context, "scene", None)) else None
+
+    # 播放中（不节流）同一帧只算一次；暂停时同一帧内用户仍可能在摆姿势，不做此判断
+    if min_interval == 0.0 and sc is not None:
+        frame = sc.frame_current
+        if frame == _psd_last_tick_frame:
+            return
+        _psd_last_tick_frame = frame
+
+    # perf flag（由 psd_update_perf_settings 维护）
+    perf_enabled = _psd_perf_enabled
+    history_len = _psd_perf_history_len
 
     t_start_total = time.perf_counter() if perf_enabled else None
 
-    # Debug：临时打开以验证缓存行为（不要长期开启）
-    DEBUG_CACHE = False
+    # Debug：缓存行为 / 性能统计的控制台输出统一由 caches._PSD_DEBUG 控制（不要长期开启）
+    debug = caches._PSD_DEBUG
 
     for arm in [o for o in bpy.data.objects if o.type == 'ARMATURE']:
         # 每个 arm 的处理放在 try/finally 里以保证 arm perf 写回
+        arm_stats = None
+        t_start_arm = None
         try:
             # 可靠的缓存 key（优先 as_pointer()，否则 id(arm)）
             try:
@@ -362,88 +929,27 @@ def _psd_compute_all(arm=None, depsgraph=None, scene=None):
             except Exception:
                 continue
 
-            # bone_filter（和你原来逻辑一致）
-            bone_filter = None
-            try:
-                if getattr(arm, "psd_bone_pairs", None) and len(arm.psd_bone_pairs) > 0:
-                    bone_filter = set([p.bone_name for p in arm.psd_bone_pairs if p.bone_name])
-            except Exception:
-                bone_filter = None
-            if bone_filter is None:
-                bone_filter = set(e.bone_name for e in saved if e.bone_name)
-
-            # 预采样：当前旋转/位移/缩放（避免重复捕捉）
-            bone_to_cur_rot = {}
-            bone_to_cur_loc = {}
-            bone_to_cur_sca = {}
-            source_obj = arm
-            try:
-                if depsgraph is not None:
-                    eval_obj = arm.evaluated_get(depsgraph)
-                    if eval_obj:
-                        source_obj = eval_obj
-            except Exception:
-                source_obj = arm
-
-            for bn in bone_filter:
-                # 旋转（使用你原有的采样函数）
-                try:
-                    cur_deg = _capture_bone_local_rotation_deg(arm, bn, depsgraph=depsgraph)
-                    if cur_deg is not None:
-                        bone_to_cur_rot[bn] = Vector(cur_deg)
-                except Exception:
-                    pass
-                # 位移 / 缩放（从评估对象的 pose.bones 取，或原始 arm 的 pose.bones）
-                try:
-                    pb = source_obj.pose.bones.get(bn)
-                    if pb:
-                        # copy() 保证接下来的比较不会被外部修改影响
-                        try:
-                            cur_loc = _capture_bone_local_translation_effective(arm, bn, depsgraph=depsgraph)
-                            bone_to_cur_loc[bn] = cur_loc.copy()
-                        except Exception:
-                            bone_to_cur_loc[bn] = Vector((0.0, 0.0, 0.0))
-                        bone_to_cur_sca[bn] = pb.scale.copy()
-                except Exception:
-                    pass
+            # 条目快照（持久 SoA 缓存）：后续热循环只读取纯 Python 属性 / NumPy 数组
+            soa = _get_entry_soa(arm_key, saved)
+            saved = soa["entries"]
 
-            # ----------------- 增加：检测哪些骨骼在本帧没有变化，后面跳过这些骨骼 -----------------
-            arm_cache = _psd_bone_state_cache.setdefault(arm_key, {})
-            skip_bones = set()
-            _PSD_EPS = 1e-5
-            for bn_check in bone_filter:
-                sample = _psd_make_sample_from_maps(bone_to_cur_rot, bone_to_cur_loc, bone_to_cur_sca, bn_check)
-                last_sample = arm_cache.get(bn_check)
-                if sample is not None and last_sample is not None and _psd_samples_equal(sample, last_sample, eps=_PSD_EPS):
-                    skip_bones.add(bn_check)
-                else:
-                    # 仅在可采样时写入缓存，避免写入 None
-                    if sample is not None:
-                        arm_cache[bn_check] = sample
+            # bone_filter（和你原来逻辑一致：有骨骼对时用骨骼对，否则用条目引用的骨骼），按骨架缓存
+            bone_filter, bone_names = _get_bone_filter(arm, arm_key, soa)
 
-            if DEBUG_CACHE:
-                print(f"[PSD CACHE] arm.name={arm.name} arm_key={arm_key} skip {len(skip_bones)} bones; cached={len(arm_cache)}")
+            # 采集阶段：预采样当前旋转/位移/缩放（避免重复捕捉）
+            bone_to_cur_rot, bone_to_cur_loc, bone_to_cur_sca, samples = _psd_gather_arm_samples(
+                arm, bone_filter, depsgraph, bone_names=bone_names
+            )
 
-            # ------------------------------------------------------------------------------------
-
-            # ----------------- 修复：排除触发器引用的骨骼，不对它们做跳过优化 -----------------
-            try:
-                trigger_bones = set()
-                # 一定要用原始 arm（不要用 eval_obj）去访问自定义 collection
-                for trig in getattr(arm, "psd_triggers", ()):
-                    # trig.bone_name 是触发器位置来源，trig.target_bone 是被写回结果的目标骨骼
-                    if getattr(trig, "bone_name", None):
-                        trigger_bones.add(trig.bone_name)
-                    if getattr(trig, "target_bone", None):
-                        trigger_bones.add(trig.target_bone)
-                # 从 skip_bones 中去掉触发器相关骨骼（如果它们存在）
-                if trigger_bones:
-                    skip_bones.difference_update(trigger_bones)
-            except Exception:
-                # 忽略任何访问异常，保证稳健性
-                pass
-            # -----------------------------------------------------------------------------
+            # 检测哪些骨骼在本帧没有变化，后面跳过这些骨骼（触发器相关骨骼除外）
+            skip_bones = _psd_detect_skip_bones(arm, arm_key, bone_names, samples, debug=debug)
 
+            # 整个骨架本帧无变化（所有采样骨骼都可跳过、且没有触发器）：条目结果与上次完全相同，跳过计算阶段
+            # 只与实际采样到的骨骼比较：引用了不存在骨骼的行为 NaN，永远不会计为未变化
+            if skip_bones and not getattr(arm, "psd_triggers", None):
+                sampled = len(bone_names) - int(np.isnan(samples).any(axis=1).sum())
+                if len(skip_bones) == sampled:
+                    continue
 
             # perf container（只有在处理 entries 前才创建）
             arm_stats = None
@@ -463,164 +969,20 @@ def _psd_compute_all(arm=None, depsgraph=None, scene=None):
             #--------------------------------------------------------
 
 
-            # 遍历 saved entries（按条目计算），但跳过 skip_bones
-            for entry in saved:
-                bn = entry.bone_name
-                en = entry.name
-                # 过滤掉没有骨骼名/条目名的条目（这些不是有效样本，不记录 perf）
-                if not bn or not en:
-                    continue
-                if bn not in bone_filter:
-                    continue
-                # 如果未采样到该骨骼的任何通道则跳过（但仍做 perf 记录）
-                if bn not in bone_to_cur_rot and bn not in bone_to_cur_loc:
-                    continue
-
-                # 在通过基本有效性检查后开始计时（保证我们不会为无效条目统计）
-                t_entry_start = time.perf_counter() if perf_enabled else None
-
-                # 标记是否跳过计算（skip 优化）——但不要直接 continue，使用 flag
-                entry_was_skipped = False
-                if bn in skip_bones:
-                    entry_was_skipped = True
-
-                rep_key = None
-                # 用于兜底的 rep_key（即使跳过，也有 key 用于记录）
-                try:
-                    if getattr(entry, 'has_rot', False):
-                        rep_key = f"{PREFIX_RESULT}{_safe_name(bn)}_{_safe_name(en)}"
-                    elif getattr(entry, 'has_loc', False):
-                        rep_key = f"{PREFIX_RESULT_LOC}{_safe_name(bn)}_{_safe_name(en)}"
-                    elif getattr(entry, 'has_sca', False):
-                        rep_key = f"{PREFIX_RESULT_SCA}{_safe_name(bn)}_{_safe_name(en)}"
-                    else:
-                        rep_key = f"{PREFIX_RESULT}{_safe_name(bn)}_{_safe_name(en)}"
-                except Exception:
-                    rep_key = f"{PREFIX_RESULT}unknown_{_safe_name(str(en) or 'entry')}"
-
-                try:
-                    # 如果跳过，则不做后续重运算；否则按原有逻辑处理 channels
-                    if not entry_was_skipped:
-
-                        # ---------------- Direct channel ----------------
-                        if getattr(entry, 'is_direct_channel', False):
-                            compute_direct_channel_weight(
-                                entry, bone_to_cur_rot, arm, bn,
-                                psd_set_result_cache_only, PREFIX_RESULT, _safe_name
-                            )
-                        # ---------------- Rotation channel ----------------
-                        if getattr(entry, 'has_rot', False):
-                            compute_rotation_weight(
-                                entry, bone_to_cur_rot, bn, arm,
-                                psd_set_result_cache_only, PREFIX_RESULT, _safe_name
-                            )
-                        # ---------------- Location channel ----------------
-                        if getattr(entry, 'has_loc', False):
-                            compute_location_weight(
-                                entry, bone_to_cur_loc, bn, arm,
-                                psd_set_result_cache_only, PREFIX_RESULT_LOC, _safe_name
-                            )
-                        # ---------------- Scale channel ----------------
-                        if getattr(entry, 'has_sca', False):
-                            compute_scale_weight(
-                                entry, bone_to_cur_sca, bn, arm,
-                                psd_set_result_cache_only, PREFIX_RESULT_SCA, _safe_name
-                            )
-                        # ---------------- end ----------------
-                    else:
-                        # 如果 entry_was_skipped：什么也不做（只是跳过 heavy 计算）
-                        pass
-
-                except Exception as e_entry:
-                    # 记录 entry 层异常（但不阻止 perf 写回）
-                    print("PSD entry 计算出错", getattr(entry, "name", "<unknown>"), e_entry)
-
-                finally:
-                    # 无论成功/跳过/异常，都尝试记录 entry 时间（如果启用 perf）
-                    if perf_enabled and arm_stats is not None:
-                        t_entry_end = time.perf_counter()
-                        dt_ms = max(0.0, (t_entry_end - t_entry_start) * 1000.0) if t_entry_start else 0.0
-
-                        ent_stats = arm_stats["entries"].setdefault(rep_key, {"hist": [], "last_ms": 0.0, "avg_ms": 0.0})
-                        ent_stats["last_ms"] = dt_ms
-                        hist = ent_stats["hist"]
-                        hist.append(dt_ms)
-                        if len(hist) > history_len:
-                            hist.pop(0)
-                        ent_stats["avg_ms"] = (sum(hist) / len(hist)) if hist else 0.0
-
-            # end for entries
+            # 计算阶段：结果只写入内存缓存，不触碰 ID 属性
+            _psd_compute_arm_entries(
+                arm, soa, bone_filter, skip_bones,
+                bone_to_cur_rot, bone_to_cur_loc, bone_to_cur_sca,
+                arm_stats=arm_stats, history_len=history_len
+            )
 
         except Exception as e:
             # 捕获 arm 级别异常（处理过程中可能发生）
             print('PSD计算骨架时出错', getattr(arm, "name", "<unknown>"), e)
         finally:
-            # === 批量 flush 内存缓存到持久存储 ===
-            arm_key = _arm_key_for_obj(arm)  # utils 中已定义
-            mem_cache = _psd_results_cache.get(arm_key, {})
-
-            if mem_cache:
-                
-                scene = _get_arm_scene(arm)
-                mode = getattr(arm, "psd_output_mode", "STORE_TO_EMPTY")
-
-                flushed = False
-
-                if mode == 'STORE_TO_EMPTY':
-                    try:
-                        # 原有 flush 到 Empty 逻辑（假设 utils 中函数返回 bool 或 None）
-                        result = psd_flush_mem_to_registered_empty(arm)
-                        flushed = bool(result) if result is not None else True
-                        if flushed:
-                            # print(f"[PSD] 已将原始结果存储到注册的 Empty（骨架: {arm.name}）")
-                            continue
-                    except Exception as e:
-                        print(f"[PSD] Empty 存储失败: {e}")
-                        flushed = False
-
-                    # ================
-
-                elif mode == 'APPLY_DRIVERS':
-                    flushed = True
-                    # ==================== Shape Driver ====================
-                    expressions = _shape_expressions_cache.get(arm_key)
-                    if expressions is None:
-                        expressions = load_shape_drivers(arm)
-                        _shape_expressions_cache[arm_key] = expressions
-                    if expressions:
-                        ShapeDriver(expressions).process(arm_key, mem_cache)
-
-                    # ==================== Pose Driver ====================
-                    drivers = _pose_drivers_cache.get(arm_key)
-                    if drivers is None:
-                        drivers = load_pose_drivers(arm)
-                        _pose_drivers_cache[arm_key] = drivers
-                    if drivers:
-                        PoseDriver(drivers).process(arm, arm_key, mem_cache)
-
-            # ================================================
-                # 如果没有注册 Empty 或 flush 失败，回退批量写到 armature datablock
-                #if not flushed:
-                #    try:
-                #        arm_db = bpy.data.armatures.get(arm.data.name)
-                #        if arm_db:
-                #            wrote_any = False
-                #            for k, v in mem_cache.items():
-                #                prev = arm_db.get(k, None)
-                #                if prev is None or abs(prev - float(v)) > 1e-6:
-                #                    arm_db[k] = float(v)
-                #                    wrote_any = True
-                #            if wrote_any:
-                #                # 可选：只在有变化时 tag（减少 depsgraph 触发）
-                #                try:
-                #                    arm_db.update_tag()
-                #                except Exception:
-                #                    pass
-                #    except Exception as e:
-                #        print("[PSD] fallback datablock 批量写入失败:", e)
-
-                # 可选：计算完后可选择清空该 arm 的内存缓存（节省内存，但下次 minor change 时仍需重写）
-                # _psd_results_cache.pop(arm_key, None)
+            # 写回阶段：批量 flush 内存缓存到持久存储（已写入 Empty 时沿用原逻辑直接进入下一个 arm）
+            if _psd_write_arm_results(arm):
+                continue
             # arm perf 必须写回（无论 try 是否抛异常）
             if perf_enabled:
                 try:
@@ -642,7 +1004,8 @@ def _psd_compute_all(arm=None, depsgraph=None, scene=None):
         except Exception:
             pass
 
-        # === 打印性能统计到控制台（调试用）===
+    # === 打印性能统计到控制台（调试用；面板统计不受影响）===
+    if perf_enabled and debug:
         print("\n=== PSD Performance Stats ===")
         global_stats = _psd_perf_stats.get("__global__", {})
         print(f"Global total: {global_stats.get('last_total_ms', 0.0):.3f} ms")
@@ -1,11 +1,16 @@
 import bpy
 import bpy.app.handlers as handlers
-from .core import _psd_compute_all, last_compute_time  # 导入核心
-from .utils import _is_animation_playing
+from .core import _psd_compute_all, last_compute_time, psd_invalidate_entry_cache, psd_invalidate_bone_cache, psd_update_min_interval, psd_update_perf_settings, psd_throttle_remaining  # 导入核心
+from .utils import _is_animation_playing, psd_invalidate_rest_cache, psd_mark_results_dirty, psd_clear_name_caches
+from .math_utils import psd_invalidate_trigger_cache
 # 全局处理器标志
 _psd_timer_registered = False
 _msgbus_subscribed = False
 _msgbus_owner = object()
+# 节流间隔的播放状态订阅（与 PSD 模式无关，始终订阅）
+_interval_msgbus_owner = object()
+# 节流窗口内到达的 depsgraph 更新合并为一次延迟计算（已安排时不重复注册）
+_psd_deferred_scheduled = False
 
 #
 def _get_scene_for_timer():
@@ -20,20 +25,20 @@ def _psd_timer_func():
     _psd_timer_registered = True
     try:
         sc = _get_scene_for_timer()
-        if not sc or not getattr(sc, 'psd_running', False):
+        if not sc or not getattr(sc.psd, 'running', False):
             _psd_timer_registered = False
             return None
-        if getattr(sc, 'psd_mode', 'AUTO') == 'FORCE_PLAY':
+        if getattr(sc.psd, 'mode', 'AUTO') == 'FORCE_PLAY':
             _psd_timer_registered = False
             return None
-        if getattr(sc, 'psd_mode', 'AUTO') == 'AUTO' and _is_animation_playing():
+        if getattr(sc.psd, 'mode', 'AUTO') == 'AUTO' and _is_animation_playing():
             _psd_timer_registered = False
             return None
         try:
             _psd_compute_all(depsgraph=None)
         except Exception as e:
             print("PSD计时器计算错误:", e)
-        hz = int(getattr(sc, 'psd_idle_hz', 10) or 10)
+        hz = int(getattr(sc.psd, 'idle_hz', 10) or 10)
         if hz < 1:
             hz = 1
         return 1.0 / float(hz)
@@ -46,9 +51,9 @@ def _on_play_changed():
     global _psd_timer_registered
     try:
         sc = bpy.context.scene if bpy.context and bpy.context.scene else None
-        if not sc or not getattr(sc, 'psd_running', False):
+        if not sc or not getattr(sc.psd, 'running', False):
             return
-        mode = getattr(sc, 'psd_mode', 'AUTO')
+        mode = getattr(sc.psd, 'mode', 'AUTO')
         if mode == 'FORCE_PLAY':
             _psd_timer_registered = False
             return
@@ -87,6 +92,21 @@ def _subscribe_msgbus_for_play_change():
         print("PSD消息总线订阅失败:", e)
         _msgbus_subscribed = False
 
+def _on_play_changed_interval():
+    psd_update_min_interval()
+
+def _subscribe_msgbus_for_interval():
+    # msgbus 订阅会在加载文件时被清空，load_post 中需要重新订阅
+    try:
+        bpy.msgbus.clear_by_owner(_interval_msgbus_owner)
+        bpy.msgbus.subscribe_rna(
+            key=(bpy.types.Screen, "is_animation_playing"),
+            owner=_interval_msgbus_owner,
+            notify=_on_play_changed_interval,
+        )
+    except Exception as e:
+        print("PSD消息总线订阅失败:", e)
+
 def _unsubscribe_msgbus():
     global _msgbus_subscribed
     try:
@@ -117,12 +137,47 @@ def _remove_handlers_with_name(list_ref, target_name):
                 pass
     return removed
 
+# 本插件的包名（安装目录名可能不是 psd_corrector）
+_PSD_PACKAGE = __name__.rpartition('.')[0] or __name__
+
+def _remove_psd_handlers(list_ref, fn):
+    """移除 list_ref 中本插件旧模块实例留下的同名处理器（重载插件后旧函数对象仍挂在列表里）"""
+    target_name = fn.__name__
+    for h in list(list_ref):
+        if h is fn or _handler_name_matches(h, target_name) or (
+                getattr(h, "__module__", "").startswith(_PSD_PACKAGE)
+                and getattr(h, "__name__", None) == target_name):
+            try:
+                list_ref.remove(h)
+            except Exception:
+                pass
+
+def _psd_deferred_compute():
+    global _psd_deferred_scheduled
+    _psd_deferred_scheduled = False
+    try:
+        _psd_compute_all(depsgraph=None)
+    except Exception as e:
+        print("PSD延迟计算错误:", e)
+    return None
+
+def _schedule_deferred_compute(delay):
+    """节流窗口结束时补算一次：连续拖动骨骼时合并中间的更新，同时保证最后一个姿态一定会被计算"""
+    global _psd_deferred_scheduled
+    if _psd_deferred_scheduled:
+        return
+    try:
+        bpy.app.timers.register(_psd_deferred_compute, first_interval=delay)
+        _psd_deferred_scheduled = True
+    except Exception:
+        pass
+
 @handlers.persistent
 def psd_frame_handler(scene):
     try:
-        if scene and getattr(scene, 'psd_mode', 'AUTO') == 'FORCE_TIMER':
+        if scene and getattr(scene.psd, 'mode', 'AUTO') == 'FORCE_TIMER':
             return
-        if _is_animation_playing() or (scene and getattr(scene, 'psd_mode', 'FORCE_PLAY')):
+        if _is_animation_playing() or (scene and getattr(scene.psd, 'mode', 'FORCE_PLAY')):
             deps = bpy.context.evaluated_depsgraph_get()
             _psd_compute_all(depsgraph=deps)
         else:
@@ -131,19 +186,77 @@ def psd_frame_handler(scene):
         print("PSD帧变化处理器错误:", e)
 
 
+def _scan_depsgraph_updates(depsgraph):
+    """
+    遍历 depsgraph.updates：骨架数据（编辑骨骼等）有几何更新时清空对应的静止姿态缓存；
+    返回本次更新是否涉及骨架物体（材质、无关物体等更新不影响骨骼姿态，无需重新计算）
+    """
+    armature_updated = False
+    try:
+        for upd in depsgraph.updates:
+            id_data = upd.id
+            if isinstance(id_data, bpy.types.Armature):
+                armature_updated = True
+                if upd.is_updated_geometry:
+                    psd_invalidate_rest_cache(id_data.name)
+            elif isinstance(id_data, bpy.types.Object) and id_data.type == 'ARMATURE':
+                armature_updated = True
+    except Exception:
+        return True
+    return armature_updated
+
 @handlers.persistent
 def psd_depsgraph_handler(scene,depsgraph):
     try:
+        if depsgraph is not None and not _scan_depsgraph_updates(depsgraph):
+            return
         sc = bpy.context.scene if bpy.context and bpy.context.scene else None
-        if sc and getattr(sc, 'psd_mode', 'AUTO') == 'FORCE_TIMER':
+        if sc and getattr(sc.psd, 'mode', 'AUTO') == 'FORCE_TIMER':
             return
-        if not _is_animation_playing() and (not sc or getattr(sc, 'psd_mode', 'AUTO') != 'FORCE_PLAY'):
+        if not _is_animation_playing() and (not sc or getattr(sc.psd, 'mode', 'AUTO') != 'FORCE_PLAY'):
+            return
+        # 空闲时按 scene.psd.idle_hz 节流：窗口内的更新不直接丢弃，而是合并到窗口结束时的一次计算
+        remaining = psd_throttle_remaining()
+        if remaining > 0.0:
+            _schedule_deferred_compute(remaining)
             return
         _psd_compute_all(depsgraph=depsgraph)
     except Exception as e:
         print("PSD depsgraph处理器错误:", e)
 
 
+@handlers.persistent
+def psd_load_post_handler(*args):
+    from .props import psd_migrate_legacy_scene_props  # 延迟导入避免循环
+    for sc in bpy.data.scenes:
+        try:
+            psd_migrate_legacy_scene_props(sc)
+        except Exception as e:
+            print("[PSD] 场景设置迁移失败:", e)
+    psd_invalidate_rest_cache()
+    psd_invalidate_entry_cache()
+    psd_invalidate_bone_cache()
+    psd_invalidate_trigger_cache()
+    psd_clear_name_caches()
+    # 新文件中 Empty 上的结果可能与内存缓存不一致，下次 flush 全量比较
+    psd_mark_results_dirty()
+    _subscribe_msgbus_for_interval()
+    psd_update_min_interval()
+    psd_update_perf_settings()
+
+
+@handlers.persistent
+def psd_undo_post_handler(*args):
+    psd_invalidate_rest_cache()
+    psd_invalidate_entry_cache()
+    # 撤销后姿态可能回到与缓存采样相同的值，但结果已被回退，强制重算
+    psd_invalidate_bone_cache()
+    # 撤销会回退 Empty 上的结果属性，下次 flush 全量比较
+    psd_mark_results_dirty()
+    # 撤销也可能回退性能调试设置
+    psd_update_perf_settings()
+
+
 class PSDStartOperator(bpy.types.Operator):
     bl_idname = "object.psd_start"
     bl_label = "启动PSD校正器"
@@ -151,30 +264,19 @@ class PSDStartOperator(bpy.types.Operator):
     def execute(self, context):
         global _msgbus_subscribed, _psd_timer_registered
         sc = context.scene
-        if not sc.psd_running:
-            try:
-                _remove_handlers_with_name(handlers.depsgraph_update_post, psd_depsgraph_handler.__name__)
-            except Exception:
-                pass
-            try:
-                _remove_handlers_with_name(handlers.frame_change_post, psd_frame_handler.__name__)
-            except Exception:
-                pass
-
-            try:
-                if not any(_handler_name_matches(h, psd_depsgraph_handler.__name__) for h in handlers.depsgraph_update_post):
-                    handlers.depsgraph_update_post.append(psd_depsgraph_handler)
-            except Exception:
-                pass
-            try:
-                if not any(_handler_name_matches(h, psd_frame_handler.__name__) for h in handlers.frame_change_post):
-                    handlers.frame_change_post.append(psd_frame_handler)
-            except Exception:
-                pass
+        if not sc.psd.running:
+            for list_ref, fn in ((handlers.depsgraph_update_post, psd_depsgraph_handler),
+                                 (handlers.frame_change_post, psd_frame_handler)):
+                try:
+                    _remove_psd_handlers(list_ref, fn)
+                    list_ref.append(fn)
+                except Exception:
+                    pass
 
-            sc.psd_running = True
+            sc.psd.running = True
+            psd_update_min_interval(sc)
 
-            mode = getattr(sc, 'psd_mode', 'AUTO')
+            mode = getattr(sc.psd, 'mode', 'AUTO')
 
             if mode == 'AUTO':
                 _subscribe_msgbus_for_play_change()
@@ -224,7 +326,7 @@ class PSDStopOperator(bpy.types.Operator):
             pass
 
         try:
-            context.scene.psd_running = False
+            context.scene.psd.running = False
         except Exception:
             pass
 
@@ -236,18 +338,45 @@ class PSDStopOperator(bpy.types.Operator):
 
 
 def register_handlers():
-    # 添加处理器
-    bpy.app.handlers.depsgraph_update_post.append(psd_depsgraph_handler)
-    bpy.app.handlers.frame_change_post.append(psd_frame_handler)
+    # 添加处理器：先移除旧实例，保证重载后每个列表只有一个本插件处理器
+    # 缓存失效（文件加载 / 撤销）
+    for list_ref, fn in ((handlers.depsgraph_update_post, psd_depsgraph_handler),
+                         (handlers.frame_change_post, psd_frame_handler),
+                         (handlers.load_post, psd_load_post_handler),
+                         (handlers.undo_post, psd_undo_post_handler)):
+        _remove_psd_handlers(list_ref, fn)
+        list_ref.append(fn)
+    _subscribe_msgbus_for_interval()
+    psd_update_min_interval()
+    psd_update_perf_settings()
     # 计时器注册（如果有）
     # ...
 
 def unregister_handlers():
+    global _psd_deferred_scheduled
     try:
         _remove_handlers_with_name(handlers.depsgraph_update_post, psd_depsgraph_handler.__name__)
     except Exception:
         pass
+    try:
+        if bpy.app.timers.is_registered(_psd_deferred_compute):
+            bpy.app.timers.unregister(_psd_deferred_compute)
+    except Exception:
+        pass
+    _psd_deferred_scheduled = False
     try:
         _remove_handlers_with_name(handlers.frame_change_post, psd_frame_handler.__name__)
     except Exception:
-        pass
\ No newline at end of file
+        pass
+    try:
+        _remove_handlers_with_name(handlers.load_post, psd_load_post_handler.__name__)
+        _remove_handlers_with_name(handlers.undo_post, psd_undo_post_handler.__name__)
+    except Exception:
+        pass
+    try:
+        bpy.msgbus.clear_by_owner(_interval_msgbus_owner)
+    except Exception:
+        pass
+    psd_invalidate_rest_cache()
+    psd_invalidate_trigger_cache()
+    psd_clear_name_caches()
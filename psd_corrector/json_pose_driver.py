@@ -1,6 +1,7 @@
 import bpy
 import math
 import json
+from . import caches
 from .caches import _psd_math_cache, _psd_math_dep_cache
 
 class PoseDriver:
@@ -116,5 +117,5 @@ class PoseDriver:
                         except Exception as e:
                             print(f"[Pose Driver] 设置错误 {bone_name}.{constraint_name}.{prop_name}: {e}")
 
-            if applied_pose > 0 or recalculated_pose > 0:
+            if caches._PSD_DEBUG and (applied_pose > 0 or recalculated_pose > 0):
                 print(f"[Pose Driver] 重算 {recalculated_pose} 条，应用 {applied_pose} 个骨骼约束属性\n")
\ No newline at end of file
@@ -1,7 +1,8 @@
 import json
 import bpy
 import math
-from .caches import _psd_math_cache, _psd_math_dep_cache
+from . import caches
+from .caches import _psd_math_cache, _psd_math_dep_cache, psd_log
 
 class ShapeDriver:
     """
@@ -88,7 +89,7 @@ class ShapeDriver:
             for mesh_name, post_keys in mesh_groups.items():
                 obj = bpy.data.objects.get(mesh_name)
                 if not obj or obj.type != 'MESH' or not obj.data.shape_keys:
-                    print(f"[Shape Driver] 警告：找不到有效 Mesh '{mesh_name}'")
+                    psd_log.debug("[Shape Driver] 找不到有效 Mesh '%s'", mesh_name)
                     continue
 
                 key_blocks = obj.data.shape_keys.key_blocks
@@ -138,7 +139,9 @@ class ShapeDriver:
                             kb.value = max(kb.slider_min, min(kb.slider_max, w_raw))
 
                 if updated_count > 0:
-                    print(f"[Shape Driver] → Mesh '{mesh_name}' 批量更新 {updated_count}/{len(post_keys)} 个 Shape Key (foreach_set)")
+                    if caches._PSD_DEBUG:
+                        print(f"[Shape Driver] → Mesh '{mesh_name}' 批量更新 {updated_count}/{len(post_keys)} 个 Shape Key (foreach_set)")
                     applied_total += updated_count
 
-            print(f"[Shape Driver] 应用 {applied_total} 个 Shape Key (总驱动 {len(math_cache)} 条)\n")
\ No newline at end of file
+            if caches._PSD_DEBUG:
+                print(f"[Shape Driver] 应用 {applied_total} 个 Shape Key (总驱动 {len(math_cache)} 条)\n")
\ No newline at end of file
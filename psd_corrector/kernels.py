@@ -0,0 +1,110 @@
+import numpy as np
+
+# 可选依赖：安装了 numba 时把批量权重的数值核心编译为机器码，否则 math_utils 使用 NumPy 路径
+# 不开启 fastmath：保留 NaN/inf，由调用方统一经 math_utils._clip01 记为 0
+try:
+    from numba import njit as _njit
+    _HAVE_NUMBA = True
+except Exception:
+    _njit = None
+    _HAVE_NUMBA = False
+
+
+def _jit(fn):
+    if not _HAVE_NUMBA:
+        return fn
+    try:
+        return _njit(cache=True)(fn)
+    except Exception:
+        # 插件目录不可写等情况下不写磁盘缓存
+        return _njit(fn)
+
+
+@_jit
+def rot_projection_weights(rest_rot, pose_dir, denom, cur_rot, has_cur):
+    """投影模式旋转权重：与 math_utils.compute_rotation_weights_batch 的 NumPy 路径一致"""
+    n = cur_rot.shape[0]
+    out = np.zeros(n)
+    for i in range(n):
+        if not has_cur[i]:
+            continue
+        rx = cur_rot[i, 0] - rest_rot[i, 0]
+        ry = cur_rot[i, 1] - rest_rot[i, 1]
+        rz = cur_rot[i, 2] - rest_rot[i, 2]
+        d = denom[i]
+        if d < 1e-6:
+            w = 1.0 if (rx * rx + ry * ry + rz * rz) < 1e-6 else 0.0
+        else:
+            t = (rx * pose_dir[i, 0] + ry * pose_dir[i, 1] + rz * pose_dir[i, 2]) / d
+            w = 1.0 - abs(t - 1.0)
+        out[i] = w
+    return out
+
+
+@_jit
+def loc_weights(rest_loc, pose_loc, radius, enabled, cur_loc, has_cur):
+    """位移权重（半径模式 / 投影模式）：与 math_utils.compute_location_weights_batch 的 NumPy 路径一致"""
+    n = cur_loc.shape[0]
+    out = np.zeros(n)
+    for i in range(n):
+        if not has_cur[i]:
+            continue
+        if enabled[i]:
+            dx = cur_loc[i, 0] - pose_loc[i, 0]
+            dy = cur_loc[i, 1] - pose_loc[i, 1]
+            dz = cur_loc[i, 2] - pose_loc[i, 2]
+            r = radius[i]
+            if r <= 0.0:
+                w = 1.0 if (dx * dx + dy * dy + dz * dz) < 1e-12 else 0.0
+            else:
+                inv_r = 1.0 / r
+                w = max(0.0, 1.0 - abs(dx) * inv_r) * max(0.0, 1.0 - abs(dy) * inv_r) * max(0.0, 1.0 - abs(dz) * inv_r)
+        else:
+            ax = pose_loc[i, 0] - rest_loc[i, 0]
+            ay = pose_loc[i, 1] - rest_loc[i, 1]
+            az = pose_loc[i, 2] - rest_loc[i, 2]
+            rx = cur_loc[i, 0] - rest_loc[i, 0]
+            ry = cur_loc[i, 1] - rest_loc[i, 1]
+            rz = cur_loc[i, 2] - rest_loc[i, 2]
+            len2 = ax * ax + ay * ay + az * az
+            if len2 < 1e-12:
+                w = 1.0 if (rx * rx + ry * ry + rz * rz) < 1e-12 else 0.0
+            else:
+                w = 1.0 - abs((rx * ax + ry * ay + rz * az) / len2 - 1.0)
+        out[i] = w
+    return out
+
+
+@_jit
+def sca_projection_weights(rest_sca, sca_dir, sca_len2, cur_sca, has_cur):
+    """缩放权重（投影 + 三角折返）：与 math_utils.compute_scale_weights_batch 的 NumPy 路径一致"""
+    n = cur_sca.shape[0]
+    out = np.zeros(n)
+    for i in range(n):
+        if not has_cur[i]:
+            continue
+        rx = cur_sca[i, 0] - rest_sca[i, 0]
+        ry = cur_sca[i, 1] - rest_sca[i, 1]
+        rz = cur_sca[i, 2] - rest_sca[i, 2]
+        len2 = sca_len2[i]
+        if len2 < 1e-12:
+            w = 1.0 if (rx * rx + ry * ry + rz * rz) < 1e-12 else 0.0
+        else:
+            w = 1.0 - abs((rx * sca_dir[i, 0] + ry * sca_dir[i, 1] + rz * sca_dir[i, 2]) / len2 - 1.0)
+        out[i] = w
+    return out
+
+
+def warmup():
+    """注册插件时用 1 个元素的假数据触发一次编译，避免首帧卡顿"""
+    if not _HAVE_NUMBA:
+        return
+    try:
+        z3 = np.zeros((1, 3))
+        z1 = np.zeros(1)
+        b1 = np.ones(1, dtype=np.bool_)
+        rot_projection_weights(z3, z3, z1, z3, b1)
+        loc_weights(z3, z3, z1, b1, z3, b1)
+        sca_projection_weights(z3, z3, z1, z3, b1)
+    except Exception as e:
+        print("[PSD] numba 预编译失败:", e)
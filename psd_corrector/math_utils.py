@@ -1,5 +1,23 @@
 import math
+import numpy as np
 from mathutils import Vector, Euler, Quaternion
+from . import kernels
+
+_AXIS_IDX = {'X': 0, 'Y': 1, 'Z': 2}
+# 触发器衰减类型编码
+_FALLOFF_LINEAR = 0
+_FALLOFF_SMOOTH = 1
+_FALLOFF_CODE = {'LINEAR': _FALLOFF_LINEAR, 'SMOOTH': _FALLOFF_SMOOTH}
+# Direct Channel 摇摆+扭转模式 → 扭转轴编号（1/2/3 = X/Y/Z，0 = 不分解）
+_DIRECT_TWIST_IDX = {
+    'record_rot_SWING_X_TWIST': 1,
+    'record_rot_SWING_Y_TWIST': 2,
+    'record_rot_SWING_Z_TWIST': 3,
+}
+
+# 条目派生量缓存：{ entry_ptr -> (pose_rot_tuple, q_center) }
+# pose_rot 只在重新录制/导入时变化，读取时比对 pose_rot，录制/导入/删除操作器中整体清空
+_entry_derived = {}
 
 def _euler_deg_to_dir(rot_deg, axis='Z'):
     
@@ -17,6 +35,58 @@ def _euler_deg_to_dir(rot_deg, axis='Z'):
         return Vector((0.0, 0.0, 1.0))
     return dir_vec.normalized()
 
+def _euler_deg_to_quat_batch(rot_deg):
+    """
+    _euler_deg_to_quat 的批量版本。
+    rot_deg: (N,3) 欧拉角（度，XYZ），返回 (N,4) 四元数 (w,x,y,z)。
+    """
+    h = np.radians(rot_deg) * 0.5
+    sx, sy, sz = np.sin(h).T
+    cx, cy, cz = np.cos(h).T
+    return np.stack((
+        cx * cy * cz + sx * sy * sz,
+        sx * cy * cz - cx * sy * sz,
+        cx * sy * cz + sx * cy * sz,
+        cx * cy * sz - sx * sy * cz,
+    ), axis=1)
+
+def _get_entry_q_center(entry):
+    """返回条目 pose_rot 对应的四元数（按条目缓存）"""
+    pose_rot = tuple(entry.pose_rot)
+    try:
+        key = entry.as_pointer()
+    except Exception:
+        key = id(entry)
+    cached = _entry_derived.get(key)
+    if cached is not None and cached[0] == pose_rot:
+        return cached[1]
+    q_center = _euler_deg_to_quat(pose_rot)
+    _entry_derived[key] = (pose_rot, q_center)
+    return q_center
+
+def psd_invalidate_entry_derived():
+    """清空条目派生量缓存（pose_rot 被写入后调用）"""
+    _entry_derived.clear()
+
+def psd_invalidate_trigger_cache():
+    """清空触发器结果键缓存（加载文件、注销插件时调用）"""
+    _trigger_key_cache.clear()
+
+def _cone_swing_sq(q_center, q_cur, axis_idx):
+    """
+    q_center 与 q_cur 在 cone 轴方向上夹角一半的余弦平方 cos²(angle/2)。
+    等价于比较两个旋转下轴向量的 acos(dot)，但直接由相对旋转的 swing 分量求得：
+    q_rel = q_center⁻¹ @ q_cur，swing 的 w² = w² + p²，p 为 q_rel 在该轴上的分量。
+    夹角 = 2 * acos(sqrt(返回值))。
+    """
+    q_rel = q_center.rotation_difference(q_cur)
+    p = q_rel[axis_idx + 1]
+    return min(1.0, q_rel.w * q_rel.w + p * p)
+
+def _cone_cos2_half(cone_angle):
+    """锥角阈值的 cos²(cone_angle/2)：swing_sq 小于它即在锥外，无需 acos"""
+    return math.cos(math.radians(cone_angle) * 0.5) ** 2
+
 def _euler_deg_to_quat(rot_deg):
     
     ex, ey, ez = rot_deg
@@ -30,13 +100,85 @@ def _swing_twist_decompose(q: Quaternion, twist_axis: Vector):
     q_vec = Vector((q.x, q.y, q.z))
     proj = axis * q_vec.dot(axis)
     twist = Quaternion((q.w, proj.x, proj.y, proj.z))
-    try:
-        twist.normalize()
-    except Exception:
+    # 零长度 twist（纯 180° swing）无法归一化，取单位四元数
+    if twist.magnitude < 1e-12:
         twist = Quaternion((1.0, 0.0, 0.0, 0.0))
-    swing = q @ twist.inverted()
+    else:
+        twist.normalize()
+    # 单位四元数的逆即共轭，省去除以模长平方
+    swing = q @ Quaternion((twist.w, -twist.x, -twist.y, -twist.z))
     return swing, twist
 
+# ---- 基轴（X/Y/Z）的闭式 swing-twist 分解 ----
+# 返回 (sw_w, sw_x, sw_y, sw_z, tw_w, tw_x, tw_y, tw_z)，与 _swing_twist_decompose 结果一致，
+# 但不创建任何 Vector/Quaternion 对象。n≈0（绕该轴转 180° 的纯 swing）时 twist 取单位四元数。
+def _swing_twist_x(q):
+    w, x, y, z = q
+    n = math.sqrt(w * w + x * x)
+    if n < 1e-12:
+        return (w, x, y, z, 1.0, 0.0, 0.0, 0.0)
+    tw = w / n
+    tx = x / n
+    return (n, 0.0, y * tw - z * tx, y * tx + z * tw, tw, tx, 0.0, 0.0)
+
+def _swing_twist_y(q):
+    w, x, y, z = q
+    n = math.sqrt(w * w + y * y)
+    if n < 1e-12:
+        return (w, x, y, z, 1.0, 0.0, 0.0, 0.0)
+    tw = w / n
+    ty = y / n
+    return (n, x * tw + z * ty, 0.0, z * tw - x * ty, tw, 0.0, ty, 0.0)
+
+def _swing_twist_z(q):
+    w, x, y, z = q
+    n = math.sqrt(w * w + z * z)
+    if n < 1e-12:
+        return (w, x, y, z, 1.0, 0.0, 0.0, 0.0)
+    tw = w / n
+    tz = z / n
+    return (n, x * tw - y * tz, x * tz + y * tw, 0.0, tw, 0.0, 0.0, tz)
+
+def _signed_twist_angle_deg(tw_w, tw_axis):
+    """twist 四元数 (tw_w, 轴分量 tw_axis) 的有符号角度（度），同 _signed_angle_from_quat"""
+    if tw_w < 0.0:
+        tw_w = -tw_w
+        tw_axis = -tw_axis
+    theta = 2.0 * math.acos(min(1.0, tw_w))
+    return math.degrees(theta) if tw_axis >= 0.0 else -math.degrees(theta)
+
+def _euler_deg_to_quat_tuple(ex, ey, ez):
+    """_euler_deg_to_quat 的纯 float 版本，返回 (w,x,y,z)，不创建 mathutils 对象"""
+    hx = math.radians(ex) * 0.5
+    hy = math.radians(ey) * 0.5
+    hz = math.radians(ez) * 0.5
+    cx, sx = math.cos(hx), math.sin(hx)
+    cy, sy = math.cos(hy), math.sin(hy)
+    cz, sz = math.cos(hz), math.sin(hz)
+    return (
+        cx * cy * cz + sx * sy * sz,
+        sx * cy * cz - cx * sy * sz,
+        cx * sy * cz + sx * cy * sz,
+        cx * cy * sz - sx * sy * cz,
+    )
+
+_SWING_TWIST_FNS = (None, _swing_twist_x, _swing_twist_y, _swing_twist_z)
+
+def _direct_channel_twist_deg(qw, qx, qy, qz, twist_idx, ch_idx):
+    """
+    Direct Channel 摇摆+扭转分解的标量核心：twist_idx 1/2/3 = X/Y/Z 扭转轴，ch_idx 0/1/2 = X/Y/Z 通道。
+    X/Z 通道取 swing 分量的角度，Y 通道取 twist 的有符号角度（度）。
+    """
+    st = _SWING_TWIST_FNS[twist_idx]((qw, qx, qy, qz))
+    if ch_idx == 1:
+        return _signed_twist_angle_deg(st[4], st[4 + twist_idx])
+    v = st[1] if ch_idx == 0 else st[3]
+    if v > 1.0:
+        v = 1.0
+    elif v < -1.0:
+        v = -1.0
+    return math.degrees(2.0 * math.asin(v))
+
 def _signed_angle_from_quat(q: Quaternion, axis: Vector):
     
     q = q.copy()
@@ -47,68 +189,68 @@ def _signed_angle_from_quat(q: Quaternion, axis: Vector):
     sign = 1.0 if vec.dot(axis.normalized()) >= 0 else -1.0
     return sign * math.degrees(theta)
 
+def _tri_fold(t):
+    """三角折返：[0,1] 上升、[1,2] 下降，区间外为 0（NaN 也得 0）。等价于 0/t/2-t 的分支链。"""
+    return max(0.0, 1.0 - abs(t - 1.0))
+
+def _clamp01(w):
+    """逐条目权重的收尾：NaN（w != w）记为 0，再夹到 [0, 1]；批量路径见 _clip01"""
+    return 0.0 if (w != w or w < 0.0) else (1.0 if w > 1.0 else w)
+
 def _triangular_ratio(cur, target):
     
     if target is None:
         return 0.0
     if abs(target) < 1e-6:
         return 1.0 if abs(cur) < 1e-3 else 0.0
-    r = float(cur) / float(target)
-    if r < 0.0:
-        return 0.0
-    if r > 2.0:
-        return 0.0
-    if r > 1.0:
-        return 2.0 - r
-    return r
+    return _tri_fold(float(cur) / float(target))
 
 #==========权重算法================================
+# 触发器结果键缓存：{ (target_bone, trigger_name) -> key }
+# 反复改名会留下旧键，超过上限时整体清空（与 utils.psd_result_key 的上限一致）
+_TRIGGER_KEY_CACHE_MAX = 4096
+_trigger_key_cache = {}
+
+def _entry_result_key(entry, attr, prefix, bn, _safe_name):
+    """条目结果键：快照条目上已预先算好（rot_key / loc_key / sca_key），RNA 条目则现场拼接"""
+    key = getattr(entry, attr, None)
+    if key is None:
+        key = f"{prefix}{_safe_name(bn)}_{_safe_name(entry.name)}"
+    return key
+
+def _write_batch_results(arm, batch_entries, w, attr, prefix, _safe_name, psd_set_result_cache_only):
+    """批量权重写入内存缓存：循环内用到的函数先绑定为局部变量"""
+    key_of = _entry_result_key
+    set_cache = psd_set_result_cache_only
+    for (entry, bn, row), wi in zip(batch_entries, w.tolist()):
+        set_cache(arm, key_of(entry, attr, prefix, bn, _safe_name), wi, verbose=False)
+
 def compute_direct_channel_weight(
     entry, bone_to_cur_rot, arm, bn,
     psd_set_result_cache_only, PREFIX_RESULT, _safe_name
 ):
     """计算 Direct Channel 权重并写入缓存"""
     try:
-        key_rot = f"{PREFIX_RESULT}{_safe_name(bn)}_{_safe_name(entry.name)}"
+        key_rot = _entry_result_key(entry, 'rot_key', PREFIX_RESULT, bn, _safe_name)
         cur_rot = bone_to_cur_rot.get(bn)
 
         if cur_rot is None:
             psd_set_result_cache_only(arm, key_rot, 0.0, verbose=False)
             return
 
-        mode = getattr(entry, 'record_rot_channel_mode', 'NONE')
-        ch_axis = getattr(entry, 'channel_axis', 'X')
-        axis_idx_map = {'X': 0, 'Y': 1, 'Z': 2}
-        axis_idx = axis_idx_map.get(ch_axis, 0)
-        cur_rot_value = float(cur_rot[axis_idx])
-        q_cur = _euler_deg_to_quat(tuple(cur_rot))
-
-        w_deg = cur_rot_value
-
-        if mode in ('record_rot_SWING_X_TWIST', 'record_rot_SWING_Y_TWIST', 'record_rot_SWING_Z_TWIST'):
-            if mode == 'record_rot_SWING_X_TWIST':
-                twist_axis = Vector((1.0, 0.0, 0.0))
-            elif mode == 'record_rot_SWING_Y_TWIST':
-                twist_axis = Vector((0.0, 1.0, 0.0))
-            else:
-                twist_axis = Vector((0.0, 0.0, 1.0))
-
-            swing_q, twist_q = _swing_twist_decompose(q_cur, twist_axis)
-
-            def _clamp1(v):
-                if v is None:
-                    return 0.0
-                v = float(v)
-                return max(-1.0, min(1.0, v))
-
-            if ch_axis == 'X':
-                sx = _clamp1(swing_q.x)
-                w_deg = math.degrees(2.0 * math.asin(sx))
-            elif ch_axis == 'Y':
-                w_deg = _signed_angle_from_quat(twist_q, twist_axis)
-            elif ch_axis == 'Z':
-                sz = _clamp1(swing_q.z)
-                w_deg = math.degrees(2.0 * math.asin(sz))
+        # 快照条目已预先编码模式/通道（见 core._EntrySnapshot），RNA 条目则现场查表
+        twist_idx = getattr(entry, 'direct_twist_idx', None)
+        if twist_idx is None:
+            twist_idx = _DIRECT_TWIST_IDX.get(getattr(entry, 'record_rot_channel_mode', 'NONE'), 0)
+        axis_idx = getattr(entry, 'direct_ch_idx', None)
+        if axis_idx is None:
+            axis_idx = _AXIS_IDX.get(getattr(entry, 'channel_axis', 'X'), 0)
+        # 不分解时直接取通道值；四元数只在摇摆+扭转模式下才需要
+        if twist_idx:
+            q_cur = _euler_deg_to_quat_tuple(cur_rot[0], cur_rot[1], cur_rot[2])
+            w_deg = _direct_channel_twist_deg(q_cur[0], q_cur[1], q_cur[2], q_cur[3], twist_idx, axis_idx)
+        else:
+            w_deg = float(cur_rot[axis_idx])
 
         w = math.radians(w_deg)
         if math.isnan(w):
@@ -117,10 +259,97 @@ def compute_direct_channel_weight(
 
     except Exception as e:
         print(f"[Direct Channel] 计算出错 {entry.name}: {e}")
-        key_rot = f"{PREFIX_RESULT}{_safe_name(bn)}_{_safe_name(entry.name)}"
+        key_rot = _entry_result_key(entry, 'rot_key', PREFIX_RESULT, bn, _safe_name)
         psd_set_result_cache_only(arm, key_rot, 0.0, verbose=False)
 
 
+def _direct_channel_deg_np(cur_rot, twist_idx, ch_idx):
+    """
+    _direct_channel_twist_deg 的批量版本（同时覆盖不分解的条目）。
+    cur_rot: (N,3) 欧拉角（度），twist_idx: (N,) 0 = 不分解 / 1,2,3 = X/Y/Z 扭转轴，ch_idx: (N,) 通道 0/1/2。
+    返回 (N,) 角度（度）。
+    """
+    n = cur_rot.shape[0]
+    rows = np.arange(n)
+    w_deg = cur_rot[rows, ch_idx]
+    twist = twist_idx > 0
+    if not twist.any():
+        return w_deg
+
+    tr = rows[twist]
+    q = _euler_deg_to_quat_batch(cur_rot[twist])
+    qw, qv = q[:, 0], q[:, 1:]
+    ax = twist_idx[twist] - 1
+    k = np.arange(len(tr))
+    qa = qv[k, ax]
+    # twist = (w, 轴分量) 归一化；n≈0（绕该轴 180° 的纯 swing）时 twist 取单位四元数
+    norm = np.sqrt(qw * qw + qa * qa)
+    degenerate = norm < 1e-12
+    safe = np.where(degenerate, 1.0, norm)
+    tw = np.where(degenerate, 1.0, qw / safe)
+    ta = np.where(degenerate, 0.0, qa / safe)
+    tv = np.zeros_like(qv)
+    tv[k, ax] = ta
+    # swing = q @ conj(twist)，只需要向量部分
+    sw_v = tw[:, None] * qv - qw[:, None] * tv - np.cross(qv, tv)
+
+    ch = ch_idx[twist]
+    # Y 通道：twist 的有符号角度（先把 w 转到非负半球）
+    flip = tw < 0.0
+    tw_pos = np.where(flip, -tw, tw)
+    ta_pos = np.where(flip, -ta, ta)
+    theta = np.degrees(2.0 * np.arccos(np.minimum(1.0, tw_pos)))
+    twist_deg = np.where(ta_pos >= 0.0, theta, -theta)
+    # X/Z 通道：swing 在该轴上的分量对应的角度
+    v = np.clip(sw_v[k, ch], -1.0, 1.0)
+    swing_deg = np.degrees(2.0 * np.arcsin(v))
+
+    w_deg = w_deg.copy()
+    w_deg[tr] = np.where(ch == 1, twist_deg, swing_deg)
+    return w_deg
+
+
+def compute_direct_channel_weights_batch(
+    direct_entries, bone_to_cur_rot, arm,
+    psd_set_result_cache_only, PREFIX_RESULT, _safe_name
+):
+    """
+    批量计算 Direct Channel 权重并写入缓存。
+    direct_entries: [(entry, bn, row), ...]。与 compute_direct_channel_weight 结果一致：
+    欧拉→四元数与 swing-twist 分解整批用 NumPy 完成，结果为弧度且不夹取（仅 NaN 记为 0）。
+    """
+    if not direct_entries:
+        return
+    try:
+        n = len(direct_entries)
+        cur_rot, has_cur = _gather_bone_rows(direct_entries, bone_to_cur_rot)
+        twist_idx = np.empty(n, dtype=np.intp)
+        ch_idx = np.empty(n, dtype=np.intp)
+        for i, (entry, bn, row) in enumerate(direct_entries):
+            t = getattr(entry, 'direct_twist_idx', None)
+            if t is None:
+                t = _DIRECT_TWIST_IDX.get(getattr(entry, 'record_rot_channel_mode', 'NONE'), 0)
+            c = getattr(entry, 'direct_ch_idx', None)
+            if c is None:
+                c = _AXIS_IDX.get(getattr(entry, 'channel_axis', 'X'), 0)
+            twist_idx[i] = t
+            ch_idx[i] = c
+
+        w = np.radians(_direct_channel_deg_np(cur_rot, twist_idx, ch_idx))
+        w = np.where(has_cur & ~np.isnan(w), w, 0.0)
+    except Exception as e:
+        print(f"[Direct Channel] 批量计算出错: {e}")
+        # 回退到逐条目计算
+        for entry, bn, row in direct_entries:
+            compute_direct_channel_weight(
+                entry, bone_to_cur_rot, arm, bn,
+                psd_set_result_cache_only, PREFIX_RESULT, _safe_name
+            )
+        return
+
+    _write_batch_results(arm, direct_entries, w, 'rot_key', PREFIX_RESULT, _safe_name, psd_set_result_cache_only)
+
+
 def compute_rotation_weight(
     entry, bone_to_cur_rot, bn, arm,
     psd_set_result_cache_only, PREFIX_RESULT, _safe_name
@@ -130,15 +359,23 @@ def compute_rotation_weight(
         cur_rot = bone_to_cur_rot.get(bn)
         if cur_rot is not None:
             if getattr(entry, 'cone_enabled', False):
-                dir_center = _euler_deg_to_dir(entry.pose_rot, entry.cone_axis)
-                dir_cur = _euler_deg_to_dir(tuple(cur_rot), entry.cone_axis)
-                dot = max(-1.0, min(1.0, dir_center.dot(dir_cur)))
-                angle_rad = math.acos(dot)
-                angle_deg = math.degrees(angle_rad)
-                if angle_deg <= entry.cone_angle:
-                    w = 1.0 - (angle_deg / entry.cone_angle) if entry.cone_angle > 0.0 else 1.0
-                else:
+                swing_sq = _cone_swing_sq(
+                    _get_entry_q_center(entry),
+                    _euler_deg_to_quat(tuple(cur_rot)),
+                    _AXIS_IDX.get(entry.cone_axis, 2)
+                )
+                cos2_half = getattr(entry, 'cone_cos2_half', None)
+                if cos2_half is None:
+                    cos2_half = _cone_cos2_half(entry.cone_angle)
+                if swing_sq < cos2_half:
+                    # 在锥外：跳过 acos
                     w = 0.0
+                else:
+                    angle_deg = math.degrees(2.0 * math.acos(math.sqrt(swing_sq)))
+                    if angle_deg <= entry.cone_angle:
+                        w = 1.0 - (angle_deg / entry.cone_angle) if entry.cone_angle > 0.0 else 1.0
+                    else:
+                        w = 0.0
             #不要开启这个，基本没什么用。:P
             # elif getattr(entry, 'rot_channel_mode', 'NONE') != 'NONE':
             #     axis_idx_map = {'SWING_X_TWIST': 0, 'SWING_Y_TWIST': 1, 'SWING_Z_TWIST': 2}
@@ -148,32 +385,192 @@ def compute_rotation_weight(
             #     w_twist = _triangular_ratio(cur_twist_angle, target_twist_angle)
             #     w = float(max(0.0, min(1.0, w_twist)))
             else:
-                pose_dir = Vector(entry.pose_rot) - Vector(entry.rest_rot)
-                cur_rel = Vector(cur_rot) - Vector(entry.rest_rot)
-                denom = pose_dir.dot(pose_dir)
+                # 逐分量标量运算，不为每个条目创建 Vector
+                rx, ry, rz = entry.rest_rot
+                px, py, pz = entry.pose_rot
+                dx, dy, dz = px - rx, py - ry, pz - rz
+                cx, cy, cz = cur_rot[0] - rx, cur_rot[1] - ry, cur_rot[2] - rz
+                denom = dx * dx + dy * dy + dz * dz
                 if denom < 1e-6:
-                    w = 1.0 if cur_rel.length < 1e-3 else 0.0
+                    w = 1.0 if (cx * cx + cy * cy + cz * cz) < 1e-6 else 0.0
                 else:
-                    w = cur_rel.dot(pose_dir) / denom
-                    if w < 0.0:
-                        w = 0.0
-                    elif w > 2.0:
-                        w = 0.0
-                    elif w > 1.0:
-                        w = 2.0 - w
-            if math.isnan(w):
-                w = 0.0
-            w = max(0.0, min(1.0, w))
+                    w = _tri_fold((cx * dx + cy * dy + cz * dz) / denom)
+            w = _clamp01(w)
         else:
             w = 0.0
 
-        key_rot = f"{PREFIX_RESULT}{_safe_name(bn)}_{_safe_name(entry.name)}"
+        key_rot = _entry_result_key(entry, 'rot_key', PREFIX_RESULT, bn, _safe_name)
         psd_set_result_cache_only(arm, key_rot, w, verbose=False)
 
     except Exception as e:
         print(f"[Rotation Channel] 计算出错 {entry.name}: {e}")
 
 
+def _clip01(w):
+    """批量权重的统一收尾：NaN/±inf 记为 0，再夹到 [0, 1]（整批一次，不在逐条目循环里判断）"""
+    return np.clip(np.nan_to_num(w, nan=0.0, posinf=0.0, neginf=0.0), 0.0, 1.0)
+
+
+def _gather_bone_rows(batch_entries, bone_map):
+    """
+    把 [(entry, bn, row), ...] 对应骨骼的当前值收集为 (N,3) 数组。
+    返回 (values, has_value)，缺失骨骼的行为 0 且 has_value 为 False。
+    """
+    n = len(batch_entries)
+    values = np.zeros((n, 3), dtype=np.float64)
+    has_value = np.zeros(n, dtype=bool)
+    for i, (entry, bn, row) in enumerate(batch_entries):
+        cur = bone_map.get(bn)
+        if cur is not None:
+            values[i] = cur
+            has_value[i] = True
+    return values, has_value
+
+
+def _rot_projection_weights_np(rest_rot, pose_dir, denom, cur_rot, has_cur):
+    """投影模式旋转权重的 NumPy 实现（未安装 numba 时使用，见 kernels.rot_projection_weights），未夹取"""
+    cur_rel = cur_rot - rest_rot
+    degenerate = denom < 1e-6
+    t = np.einsum('ij,ij->i', cur_rel, pose_dir) / np.where(degenerate, 1.0, denom)
+    # 三角映射：[0,1] 上升，(1,2] 下降，其余为 0（与 _tri_fold 相同）
+    w = np.maximum(0.0, 1.0 - np.abs(t - 1.0))
+    # pose 与 rest 重合：仅在当前也接近 rest 时为 1
+    near_rest = np.einsum('ij,ij->i', cur_rel, cur_rel) < 1e-6
+    w = np.where(degenerate, near_rest.astype(np.float64), w)
+    return np.where(has_cur, w, 0.0)
+
+
+def _loc_weights_np(rest_loc, pose_loc, radius, enabled, cur_loc, has_cur):
+    """位移权重的 NumPy 实现（未安装 numba 时使用，见 kernels.loc_weights），未夹取"""
+    # 半径模式：以 pose_loc 为中心，三轴线性衰减的乘积
+    d = cur_loc - pose_loc
+    has_radius = radius > 0.0
+    inv_r = 1.0 / np.where(has_radius, radius, 1.0)
+    w_axes = np.maximum(0.0, 1.0 - np.abs(d) * inv_r[:, None])
+    at_center = np.einsum('ij,ij->i', d, d) < 1e-12
+    w_radius = np.where(has_radius, w_axes.prod(axis=1), at_center.astype(np.float64))
+
+    # 投影模式：沿 rest→pose 方向投影后三角折返
+    direction = pose_loc - rest_loc
+    rel = cur_loc - rest_loc
+    len2 = np.einsum('ij,ij->i', direction, direction)
+    degenerate = len2 < 1e-12
+    t = np.einsum('ij,ij->i', rel, direction) / np.where(degenerate, 1.0, len2)
+    at_rest = np.einsum('ij,ij->i', rel, rel) < 1e-12
+    w_proj = np.where(degenerate, at_rest.astype(np.float64), np.maximum(0.0, 1.0 - np.abs(t - 1.0)))
+
+    w = np.where(enabled, w_radius, w_proj)
+    return np.where(has_cur, w, 0.0)
+
+
+def compute_rotation_weights_batch(
+    rot_entries, bone_to_cur_rot, arm,
+    psd_set_result_cache_only, PREFIX_RESULT, _safe_name, soa=None
+):
+    """
+    批量计算投影模式（非锥形）的 Rotation Channel 权重并写入缓存。
+    rot_entries: [(entry, bn, row), ...]，均为 has_rot 且未启用锥形的条目。
+    soa 提供 rest_rot / pose_dir / pose_denom 数组时直接切片使用，否则从条目读取。
+    与 compute_rotation_weight 的投影分支结果一致。
+    """
+    if not rot_entries:
+        return
+    try:
+        n = len(rot_entries)
+        cur_rot, has_cur = _gather_bone_rows(rot_entries, bone_to_cur_rot)
+
+        if soa is not None:
+            rows = np.fromiter((c[2] for c in rot_entries), dtype=np.intp, count=n)
+            rest_rot = soa["rest_rot"][rows]
+            pose_dir = soa["pose_dir"][rows]
+            denom = soa["pose_denom"][rows]
+        else:
+            rest_rot = np.array([tuple(c[0].rest_rot) for c in rot_entries], dtype=np.float64).reshape(n, 3)
+            pose_rot = np.array([tuple(c[0].pose_rot) for c in rot_entries], dtype=np.float64).reshape(n, 3)
+            pose_dir = pose_rot - rest_rot
+            denom = np.einsum('ij,ij->i', pose_dir, pose_dir)
+
+        if kernels._HAVE_NUMBA:
+            w = kernels.rot_projection_weights(rest_rot, pose_dir, denom, cur_rot, has_cur)
+        else:
+            w = _rot_projection_weights_np(rest_rot, pose_dir, denom, cur_rot, has_cur)
+        w = _clip01(w)
+    except Exception as e:
+        print(f"[Rotation Channel] 投影批量计算出错: {e}")
+        # 回退到逐条目计算
+        for entry, bn, row in rot_entries:
+            compute_rotation_weight(
+                entry, bone_to_cur_rot, bn, arm,
+                psd_set_result_cache_only, PREFIX_RESULT, _safe_name
+            )
+        return
+
+    _write_batch_results(arm, rot_entries, w, 'rot_key', PREFIX_RESULT, _safe_name, psd_set_result_cache_only)
+
+
+def compute_cone_weights_batch(
+    cone_entries, bone_to_cur_rot, arm,
+    psd_set_result_cache_only, PREFIX_RESULT, _safe_name, soa=None
+):
+    """
+    批量计算锥形衰减的 Rotation Channel 权重并写入缓存。
+    cone_entries: [(entry, bn, row), ...]，均为 has_rot 且 cone_enabled 的条目，row 为其在 soa 中的行号。
+    soa 提供 q_center / cone_axis_idx / cone_angle 数组时直接切片使用，否则从条目读取。
+    与 compute_rotation_weight 的锥形分支结果一致，只是一次性用 NumPy 完成。
+    """
+    if not cone_entries:
+        return
+    try:
+        n = len(cone_entries)
+        cur_rot, has_cur = _gather_bone_rows(cone_entries, bone_to_cur_rot)
+
+        if soa is not None:
+            rows = np.fromiter((c[2] for c in cone_entries), dtype=np.intp, count=n)
+            qc = soa["q_center"][rows]
+            axis_idx = soa["cone_axis_idx"][rows]
+            cone_angle = soa["cone_angle"][rows]
+            cos2_half = soa["cone_cos2_half"][rows]
+        else:
+            qc = np.empty((n, 4), dtype=np.float64)
+            axis_idx = np.empty(n, dtype=np.intp)
+            cone_angle = np.empty(n, dtype=np.float64)
+            for i, (entry, bn, row) in enumerate(cone_entries):
+                qc[i] = _get_entry_q_center(entry)
+                axis_idx[i] = _AXIS_IDX.get(entry.cone_axis, 2)
+                cone_angle[i] = entry.cone_angle
+            cos2_half = np.cos(np.radians(cone_angle) * 0.5) ** 2
+
+        # 相对旋转 q_rel = conj(q_center) @ q_cur，只需要 w 和 cone 轴分量
+        qu = _euler_deg_to_quat_batch(cur_rot)
+        # q_rel 的 w 分量就是两个四元数的逐行点积
+        rel_w = np.einsum('ij,ij->i', qc, qu)
+        cw, cv = qc[:, 0], qc[:, 1:]
+        uw, uv = qu[:, 0], qu[:, 1:]
+        rel_v = cw[:, None] * uv - uw[:, None] * cv - np.cross(cv, uv)
+        p = rel_v[np.arange(n), axis_idx]
+        swing_sq = np.minimum(1.0, rel_w * rel_w + p * p)
+        # 锥外（swing_sq < cos²(cone/2)）的条目不需要 arccos，直接记为 0
+        inside = (swing_sq >= cos2_half) & has_cur
+        angle_deg = np.full(n, np.inf)
+        if inside.any():
+            angle_deg[inside] = np.degrees(2.0 * np.arccos(np.sqrt(swing_sq[inside])))
+        safe_angle = np.where(cone_angle > 0.0, cone_angle, 1.0)
+        w = np.where(cone_angle > 0.0, 1.0 - angle_deg / safe_angle, 1.0)
+        w = np.where((angle_deg <= cone_angle) & inside, w, 0.0)
+        w = _clip01(w)
+    except Exception as e:
+        print(f"[Rotation Channel] 锥形批量计算出错: {e}")
+        # 回退到逐条目计算
+        for entry, bn, row in cone_entries:
+            compute_rotation_weight(
+                entry, bone_to_cur_rot, bn, arm,
+                psd_set_result_cache_only, PREFIX_RESULT, _safe_name
+            )
+        return
+
+    _write_batch_results(arm, cone_entries, w, 'rot_key', PREFIX_RESULT, _safe_name, psd_set_result_cache_only)
+
+
 def compute_location_weight(
     entry, bone_to_cur_loc, bn, arm,
     psd_set_result_cache_only, PREFIX_RESULT_LOC, _safe_name
@@ -182,49 +579,82 @@ def compute_location_weight(
     try:
         cur_loc = bone_to_cur_loc.get(bn)
         if cur_loc is not None:
-            center = Vector(entry.pose_loc)
+            px, py, pz = entry.pose_loc
             radius = float(getattr(entry, 'loc_radius', 0.0) or 0.0)
             if getattr(entry, 'loc_enabled', False):
+                dx, dy, dz = cur_loc[0] - px, cur_loc[1] - py, cur_loc[2] - pz
                 if radius <= 0.0:
-                    w_loc = 1.0 if (cur_loc - center).length < 1e-6 else 0.0
+                    w_loc = 1.0 if (dx * dx + dy * dy + dz * dz) < 1e-12 else 0.0
                 else:
-                    d = cur_loc - center
-                    wx = max(0.0, 1.0 - abs(d.x) / radius)
-                    wy = max(0.0, 1.0 - abs(d.y) / radius)
-                    wz = max(0.0, 1.0 - abs(d.z) / radius)
+                    wx = max(0.0, 1.0 - abs(dx) / radius)
+                    wy = max(0.0, 1.0 - abs(dy) / radius)
+                    wz = max(0.0, 1.0 - abs(dz) / radius)
                     w_loc = wx * wy * wz
             else:
-                w_loc = 1.0
-                rest_vec = Vector(getattr(entry, 'rest_loc', (0.0, 0.0, 0.0)))
-                pose_vec = Vector(entry.pose_loc)
-                direction = pose_vec - rest_vec
-                len2 = direction.length_squared
+                rx, ry, rz = getattr(entry, 'rest_loc', (0.0, 0.0, 0.0))
+                ax, ay, az = px - rx, py - ry, pz - rz
+                cx, cy, cz = cur_loc[0] - rx, cur_loc[1] - ry, cur_loc[2] - rz
+                len2 = ax * ax + ay * ay + az * az
                 if len2 < 1e-12:
-                    w_loc = 1.0 if (cur_loc - rest_vec).length < 1e-6 else 0.0
+                    w_loc = 1.0 if (cx * cx + cy * cy + cz * cz) < 1e-12 else 0.0
                 else:
-                    t = (cur_loc - rest_vec).dot(direction) / len2
-                    if math.isnan(t):
-                        t = 0.0
-                    if t < 0.0 or t > 2.0:
-                        w_loc = 0.0
-                    elif t > 1.0:
-                        w_loc = 2.0 - t
-                    else:
-                        w_loc = t
-                    w_loc = max(0.0, min(1.0, w_loc))
-            if math.isnan(w_loc):
-                w_loc = 0.0
-            w_loc = max(0.0, min(1.0, w_loc))
+                    w_loc = _tri_fold((cx * ax + cy * ay + cz * az) / len2)
+            w_loc = _clamp01(w_loc)
         else:
             w_loc = 0.0
 
-        key_loc = f"{PREFIX_RESULT_LOC}{_safe_name(bn)}_{_safe_name(entry.name)}"
+        key_loc = _entry_result_key(entry, 'loc_key', PREFIX_RESULT_LOC, bn, _safe_name)
         psd_set_result_cache_only(arm, key_loc, w_loc, verbose=False)
 
     except Exception as e:
         print(f"[Location Channel] 计算出错 {entry.name}: {e}")
 
 
+def compute_location_weights_batch(
+    loc_entries, bone_to_cur_loc, arm,
+    psd_set_result_cache_only, PREFIX_RESULT_LOC, _safe_name, soa=None
+):
+    """
+    批量计算 Location Channel 权重并写入缓存。
+    loc_entries: [(entry, bn, row), ...]，均为 has_loc 的条目。
+    半径模式三轴衰减取乘积、投影模式三角折返，均一次性用 NumPy 完成；与 compute_location_weight 结果一致。
+    """
+    if not loc_entries:
+        return
+    try:
+        n = len(loc_entries)
+        cur_loc, has_cur = _gather_bone_rows(loc_entries, bone_to_cur_loc)
+
+        if soa is not None:
+            rows = np.fromiter((c[2] for c in loc_entries), dtype=np.intp, count=n)
+            rest_loc = soa["rest_loc"][rows]
+            pose_loc = soa["pose_loc"][rows]
+            radius = soa["loc_radius"][rows]
+            enabled = soa["loc_enabled"][rows]
+        else:
+            rest_loc = np.array([tuple(getattr(c[0], 'rest_loc', (0.0, 0.0, 0.0))) for c in loc_entries], dtype=np.float64).reshape(n, 3)
+            pose_loc = np.array([tuple(c[0].pose_loc) for c in loc_entries], dtype=np.float64).reshape(n, 3)
+            radius = np.array([float(getattr(c[0], 'loc_radius', 0.0) or 0.0) for c in loc_entries], dtype=np.float64)
+            enabled = np.array([bool(getattr(c[0], 'loc_enabled', False)) for c in loc_entries], dtype=bool)
+
+        if kernels._HAVE_NUMBA:
+            w = kernels.loc_weights(rest_loc, pose_loc, radius, enabled, cur_loc, has_cur)
+        else:
+            w = _loc_weights_np(rest_loc, pose_loc, radius, enabled, cur_loc, has_cur)
+        w = _clip01(w)
+    except Exception as e:
+        print(f"[Location Channel] 批量计算出错: {e}")
+        # 回退到逐条目计算
+        for entry, bn, row in loc_entries:
+            compute_location_weight(
+                entry, bone_to_cur_loc, bn, arm,
+                psd_set_result_cache_only, PREFIX_RESULT_LOC, _safe_name
+            )
+        return
+
+    _write_batch_results(arm, loc_entries, w, 'loc_key', PREFIX_RESULT_LOC, _safe_name, psd_set_result_cache_only)
+
+
 def compute_scale_weight(
     entry, bone_to_cur_sca, bn, arm,
     psd_set_result_cache_only, PREFIX_RESULT_SCA, _safe_name
@@ -233,35 +663,97 @@ def compute_scale_weight(
     try:
         cur_sca = bone_to_cur_sca.get(bn)
         if cur_sca is not None:
-            rest_vec = Vector(getattr(entry, 'rest_sca', (1.0, 1.0, 1.0)))
-            pose_vec = Vector(entry.pose_sca)
-            direction = pose_vec - rest_vec
-            len2 = direction.length_squared
+            rx, ry, rz = getattr(entry, 'rest_sca', (1.0, 1.0, 1.0))
+            px, py, pz = entry.pose_sca
+            ax, ay, az = px - rx, py - ry, pz - rz
+            cx, cy, cz = cur_sca[0] - rx, cur_sca[1] - ry, cur_sca[2] - rz
+            len2 = ax * ax + ay * ay + az * az
             if len2 < 1e-12:
-                w_sca = 1.0 if (cur_sca - rest_vec).length < 1e-6 else 0.0
+                w_sca = 1.0 if (cx * cx + cy * cy + cz * cz) < 1e-12 else 0.0
             else:
-                t = (cur_sca - rest_vec).dot(direction) / len2
-                if math.isnan(t):
-                    t = 0.0
-                if t < 0.0 or t > 2.0:
-                    w_sca = 0.0
-                elif t > 1.0:
-                    w_sca = 2.0 - t
-                else:
-                    w_sca = t
-                w_sca = max(0.0, min(1.0, w_sca))
-            if math.isnan(w_sca):
-                w_sca = 0.0
+                w_sca = _tri_fold((cx * ax + cy * ay + cz * az) / len2)
+            w_sca = _clamp01(w_sca)
         else:
             w_sca = 0.0
 
-        key_sca = f"{PREFIX_RESULT_SCA}{_safe_name(bn)}_{_safe_name(entry.name)}"
+        key_sca = _entry_result_key(entry, 'sca_key', PREFIX_RESULT_SCA, bn, _safe_name)
         psd_set_result_cache_only(arm, key_sca, w_sca, verbose=False)
 
     except Exception as e:
         print(f"[Scale Channel] 计算出错 {entry.name}: {e}")
 
 
+def _sca_projection_weights_np(rest_sca, sca_dir, sca_len2, cur_sca, has_cur):
+    """缩放权重（沿 rest→pose 方向投影后三角折返）的 NumPy 实现（未安装 numba 时使用，见 kernels.sca_projection_weights），未夹取"""
+    rel = cur_sca - rest_sca
+    degenerate = sca_len2 < 1e-12
+    t = np.einsum('ij,ij->i', rel, sca_dir) / np.where(degenerate, 1.0, sca_len2)
+    # pose 与 rest 重合：仅在当前也接近 rest 时为 1（|rel| < 1e-6）
+    at_rest = np.einsum('ij,ij->i', rel, rel) < 1e-12
+    w = np.where(degenerate, at_rest.astype(np.float64), np.maximum(0.0, 1.0 - np.abs(t - 1.0)))
+    return np.where(has_cur, w, 0.0)
+
+
+def compute_scale_weights_batch(
+    sca_entries, bone_to_cur_sca, arm,
+    psd_set_result_cache_only, PREFIX_RESULT_SCA, _safe_name, soa=None
+):
+    """
+    批量计算 Scale Channel 权重并写入缓存。
+    sca_entries: [(entry, bn, row), ...]，均为 has_sca 的条目。与 compute_scale_weight 结果一致。
+    """
+    if not sca_entries:
+        return
+    try:
+        n = len(sca_entries)
+        cur_sca, has_cur = _gather_bone_rows(sca_entries, bone_to_cur_sca)
+
+        if soa is not None:
+            rows = np.fromiter((c[2] for c in sca_entries), dtype=np.intp, count=n)
+            rest_sca = soa["rest_sca"][rows]
+            sca_dir = soa["sca_dir"][rows]
+            sca_len2 = soa["sca_len2"][rows]
+        else:
+            rest_sca = np.array([tuple(getattr(c[0], 'rest_sca', (1.0, 1.0, 1.0))) for c in sca_entries], dtype=np.float64).reshape(n, 3)
+            sca_dir = np.array([tuple(c[0].pose_sca) for c in sca_entries], dtype=np.float64).reshape(n, 3) - rest_sca
+            sca_len2 = np.einsum('ij,ij->i', sca_dir, sca_dir)
+
+        if kernels._HAVE_NUMBA:
+            w = kernels.sca_projection_weights(rest_sca, sca_dir, sca_len2, cur_sca, has_cur)
+        else:
+            w = _sca_projection_weights_np(rest_sca, sca_dir, sca_len2, cur_sca, has_cur)
+        w = _clip01(w)
+    except Exception as e:
+        print(f"[Scale Channel] 批量计算出错: {e}")
+        # 回退到逐条目计算
+        for entry, bn, row in sca_entries:
+            compute_scale_weight(
+                entry, bone_to_cur_sca, bn, arm,
+                psd_set_result_cache_only, PREFIX_RESULT_SCA, _safe_name
+            )
+        return
+
+    _write_batch_results(arm, sca_entries, w, 'sca_key', PREFIX_RESULT_SCA, _safe_name, psd_set_result_cache_only)
+
+
+def _trigger_head_local(heads_local, bone_name, pb):
+    """返回骨骼头部的骨架空间坐标 (x, y, z)，按骨骼名缓存在 heads_local 中（单次 compute_triggers 内有效）"""
+    head = heads_local.get(bone_name)
+    if head is None:
+        try:
+            head = tuple(pb.head)
+        except Exception:
+            head = tuple(pb.bone.head_local)
+        heads_local[bone_name] = head
+    return head
+
+
+def _set_trigger_last_weight(trig, w):
+    """仅在数值变化时写 last_weight（每次 RNA 写入都会触发 UI 重绘）"""
+    if abs(trig.last_weight - w) > 1e-6:
+        trig.last_weight = w
+
+
 def compute_triggers(
     orig_arm,
     psd_set_result_cache_only, PREFIX_RESULT_LOC, _safe_name
@@ -270,28 +762,52 @@ def compute_triggers(
     if not getattr(orig_arm, "psd_triggers", None):
         return
 
+    # 每帧按名字解析 PoseBone：姿态重建（退出编辑模式、删除后重建同名骨骼）会释放底层 pchan，不能跨帧持有
+    pose_bones = orig_arm.pose.bones
+    # 同一骨骼的头部只读取一次
+    heads_local = {}
+
+    # 收集阶段：解析骨骼并取骨架空间头部，变换到世界空间、距离/衰减随后一次性用 NumPy 计算
+    active = []
+    trigger_heads = []
+    target_heads = []
+    radii = []
+    falloff = []
     for trig in orig_arm.psd_triggers:
         if not trig.enabled:
             continue
-        trig.last_weight = 0.0
-        pb_trigger = orig_arm.pose.bones.get(trig.bone_name)
-        pb_target = orig_arm.pose.bones.get(trig.target_bone)
+        bone_name = trig.bone_name
+        target_bone = trig.target_bone
+        pb_trigger = pose_bones.get(bone_name)
+        pb_target = pose_bones.get(target_bone)
         if not pb_trigger or not pb_target:
+            _set_trigger_last_weight(trig, 0.0)
             continue
-        try:
-            head_trigger_world = orig_arm.matrix_world @ pb_trigger.head
-            head_target_world = orig_arm.matrix_world @ pb_target.head
-        except Exception:
-            head_trigger_world = orig_arm.matrix_world @ pb_trigger.bone.head_local
-            head_target_world = orig_arm.matrix_world @ pb_target.bone.head_local
-
-        d = (head_target_world - head_trigger_world).length
-        r = max(1e-6, float(trig.radius))
-        if trig.falloff == 'SMOOTH':
-            t = min(max(d / r, 0.0), 1.0)
-            w = 1.0 - (3.0 * t * t - 2.0 * t * t * t)
-        else:
-            w = max(0.0, min(1.0, 1.0 - d / r))
-        trig.last_weight = w
-        key_base = f"{PREFIX_RESULT_LOC}{_safe_name(trig.target_bone)}_{_safe_name(trig.name)}"
-        psd_set_result_cache_only(orig_arm, f"{key_base}_w", float(w), verbose=False)
\ No newline at end of file
+        active.append((trig, target_bone))
+        trigger_heads.append(_trigger_head_local(heads_local, bone_name, pb_trigger))
+        target_heads.append(_trigger_head_local(heads_local, target_bone, pb_target))
+        radii.append(trig.radius)
+        falloff.append(_FALLOFF_CODE.get(trig.falloff, _FALLOFF_LINEAR))
+
+    if not active:
+        return
+
+    # 世界空间差值 = (target - trigger) @ R^T，平移部分相减后抵消，matrix_world 只取一次 3x3
+    rot_scale = np.array(orig_arm.matrix_world, dtype=np.float64)[:3, :3]
+    delta = (np.array(target_heads, dtype=np.float64) - np.array(trigger_heads, dtype=np.float64)) @ rot_scale.T
+    d = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+    inv_r = 1.0 / np.maximum(1e-6, np.array(radii, dtype=np.float64))
+    t = np.clip(d * inv_r, 0.0, 1.0)
+    # SMOOTH: 1 - smoothstep(t) = 1 - t²(3 - 2t)；LINEAR: 1 - t
+    w = _clip01(np.where(np.array(falloff, dtype=np.int8) == _FALLOFF_SMOOTH, 1.0 - t * t * (3.0 - 2.0 * t), 1.0 - t))
+
+    for (trig, target_bone), wi in zip(active, w.tolist()):
+        _set_trigger_last_weight(trig, wi)
+        trig_name = trig.name
+        key_w = _trigger_key_cache.get((target_bone, trig_name))
+        if key_w is None:
+            key_w = f"{PREFIX_RESULT_LOC}{_safe_name(target_bone)}_{_safe_name(trig_name)}_w"
+            if len(_trigger_key_cache) >= _TRIGGER_KEY_CACHE_MAX:
+                _trigger_key_cache.clear()
+            _trigger_key_cache[(target_bone, trig_name)] = key_w
+        psd_set_result_cache_only(orig_arm, key_w, wi, verbose=False)
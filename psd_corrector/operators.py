@@ -4,8 +4,105 @@ import os
 import math
 from bpy_extras.io_utils import ImportHelper, ExportHelper
 from .utils import _safe_name, _get_selected_pair_bone, _capture_bone_local_rotation_deg, _capture_bone_local_translation, _capture_bone_local_scale, psd_register_cache_empty, psd_unregister_cache_empty  # 导入依赖
-from .core import psd_invalidate_bone_cache  # 导入核心函数
-from .utils import PREFIX_RESULT, PREFIX_RESULT_LOC, PREFIX_RESULT_SCA
+from .core import psd_invalidate_bone_cache, psd_invalidate_entry_cache, psd_saved_entry_exists  # 导入核心函数
+from .math_utils import psd_invalidate_entry_derived
+from .utils import PREFIX_RESULT, PREFIX_RESULT_LOC, PREFIX_RESULT_SCA, psd_result_key
+from . import caches
+
+# 可选依赖：安装了 orjson 时用它读写配置（更快），否则回退到标准库 json
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+def _json_dumps_bytes(data, compact=False):
+    if _orjson is not None:
+        if compact:
+            return _orjson.dumps(data)
+        return _orjson.dumps(data, option=_orjson.OPT_INDENT_2)
+    if compact:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+def _json_loads_bytes(raw):
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+def _coerce_vec3(v):
+    if len(v) >= 3:
+        return (float(v[0]), float(v[1]), float(v[2]))
+    return None
+
+# 导入 schema：(属性名, JSON 键, 转换函数, 默认值)；转换结果为 None 时跳过该属性
+# 默认值需与 PSDSavedPose 的属性默认值保持一致（稀疏导出时缺省的键按此还原）
+_PSD_IMPORT_SCHEMA = (
+    ("name", "name", str, "entry"),
+    ("bone_name", "bone_name", str, ""),
+    ("rest_rot", "rest_rot", _coerce_vec3, (0.0, 0.0, 0.0)),
+    ("pose_rot", "pose_rot", _coerce_vec3, (0.0, 0.0, 0.0)),
+    ("has_rot", "has_rot", bool, False),
+    ("rot_channel_mode", "rot_channel_mode", str, "NONE"),
+    ("cone_enabled", "cone_enabled", bool, False),
+    ("cone_angle", "cone_angle", float, 60.0),
+    ("cone_axis", "cone_axis", str, "Z"),
+    ("rest_loc", "rest_loc", _coerce_vec3, (0.0, 0.0, 0.0)),
+    ("pose_loc", "pose_loc", _coerce_vec3, (0.0, 0.0, 0.0)),
+    ("has_loc", "has_loc", bool, False),
+    ("loc_enabled", "loc_enabled", bool, False),
+    ("loc_radius", "loc_radius", float, 0.1),
+    ("rest_sca", "rest_sca", _coerce_vec3, (1.0, 1.0, 1.0)),
+    ("pose_sca", "pose_sca", _coerce_vec3, (1.0, 1.0, 1.0)),
+    ("has_sca", "has_sca", bool, False),
+    ("group_name", "group_name", str, ""),
+)
+_PSD_IMPORT_HANDLED_KEYS = frozenset(
+    {"sca_enabled", "sca_radius"} | {key for _, key, _, _ in _PSD_IMPORT_SCHEMA}
+)
+
+# 导出时与默认值相同的字段不写入（稀疏导出）
+_PSD_EXPORT_DEFAULTS = {key: default for _, key, _, default in _PSD_IMPORT_SCHEMA}
+
+def _export_entry_sparse(item):
+    """去掉与默认值相同的字段（name / bone_name 始终保留）"""
+    out = {}
+    for k, v in item.items():
+        d = _PSD_EXPORT_DEFAULTS.get(k, None)
+        if d is not None and k not in ("name", "bone_name"):
+            if isinstance(d, tuple):
+                if tuple(v) == d:
+                    continue
+            elif isinstance(d, float):
+                # FloatProperty 为单精度，按容差比较
+                if abs(float(v) - d) < 1e-6:
+                    continue
+            elif v == d:
+                continue
+        out[k] = v
+    return out
+
+def _apply_import_field(new, ent, attr, key, coerce, default):
+    if not hasattr(new, attr):
+        return
+    v = ent.get(key, default)
+    if v is None or v == "":
+        v = default
+    v = coerce(v)
+    if v is not None:
+        setattr(new, attr, v)
+
+def _apply_import_schema(new, ent):
+    """按 _PSD_IMPORT_SCHEMA 给新条目赋值（整条目一个 try，出错时回退为逐项赋值）"""
+    try:
+        for attr, key, coerce, default in _PSD_IMPORT_SCHEMA:
+            _apply_import_field(new, ent, attr, key, coerce, default)
+    except Exception:
+        # 回退：单个字段失败不影响其他字段
+        for attr, key, coerce, default in _PSD_IMPORT_SCHEMA:
+            try:
+                _apply_import_field(new, ent, attr, key, coerce, default)
+            except Exception:
+                pass
 
 class PSDExportConfig(bpy.types.Operator, ExportHelper):
     """导出当前骨架的 PSD 配置（包含每个 bone_pair 对应的所有条目）"""
@@ -51,6 +148,7 @@ class PSDExportConfig(bpy.types.Operator, ExportHelper):
                     "pose_sca": list(e.pose_sca),
                     "has_sca": bool(e.has_sca)
                 }
+                item = _export_entry_sparse(item)
                 if e.bone_name in data["bone_pairs"]:
                     data["saved_by_bone"].setdefault(e.bone_name, []).append(item)
                 else:
@@ -60,8 +158,9 @@ class PSDExportConfig(bpy.types.Operator, ExportHelper):
 
         # 写文件
         try:
-            with open(self.filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            compact = bool(getattr(context.scene.psd, "compact_export", False))
+            with open(self.filepath, "wb") as f:
+                f.write(_json_dumps_bytes(data, compact=compact))
             self.report({'INFO'}, f"已导出到 {self.filepath}")
             return {'FINISHED'}
         except Exception as e:
@@ -88,8 +187,8 @@ class PSDImportConfig(bpy.types.Operator, ImportHelper):
             return {'CANCELLED'}
 
         try:
-            with open(self.filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(self.filepath, "rb") as f:
+                data = _json_loads_bytes(f.read())
         except Exception as e:
             self.report({'ERROR'}, f"读取配置文件失败: {e}")
             return {'CANCELLED'}
@@ -128,95 +227,11 @@ class PSDImportConfig(bpy.types.Operator, ImportHelper):
 
             # 新增条目
             new = arm.psd_saved_poses.add()
-            # 安全赋值（逐项赋值以避免类型错误）
-            try:
-                new.name = base_name
-            except Exception:
-                pass
-            try:
-                new.bone_name = bone_name
-            except Exception:
-                pass
 
-            try:
-                rr = ent.get("rest_rot", [0.0, 0.0, 0.0])
-                if len(rr) >= 3:
-                    new.rest_rot = (float(rr[0]), float(rr[1]), float(rr[2]))
-            except Exception:
-                pass
-            try:
-                pr = ent.get("pose_rot", [0.0, 0.0, 0.0])
-                if len(pr) >= 3:
-                    new.pose_rot = (float(pr[0]), float(pr[1]), float(pr[2]))
-            except Exception:
-                pass
-            try:
-                new.has_rot = bool(ent.get("has_rot", False))
-            except Exception:
-                pass
-            try:
-                if hasattr(new, "rot_channel_mode"):
-                    new.rot_channel_mode = str(ent.get("rot_channel_mode", getattr(new, "rot_channel_mode", "NONE") or "NONE"))
-            except Exception:
-                pass
-            try:
-                new.cone_enabled = bool(ent.get("cone_enabled", False))
-                new.cone_angle = float(ent.get("cone_angle", getattr(new, "cone_angle", 60.0)))
-                if hasattr(new, "cone_axis"):
-                    new.cone_axis = str(ent.get("cone_axis", getattr(new, "cone_axis", "Z") or "Z"))
-            except Exception:
-                pass
-
-            # 位置相关
-            try:
-                rl = ent.get("rest_loc", [0.0, 0.0, 0.0])
-                if len(rl) >= 3:
-                    new.rest_loc = (float(rl[0]), float(rl[1]), float(rl[2]))
-            except Exception:
-                pass
-            try:
-                pl = ent.get("pose_loc", [0.0, 0.0, 0.0])
-                if len(pl) >= 3:
-                    new.pose_loc = (float(pl[0]), float(pl[1]), float(pl[2]))
-            except Exception:
-                pass
-            try:
-                new.has_loc = bool(ent.get("has_loc", False))
-                new.loc_enabled = bool(ent.get("loc_enabled", False))
-                new.loc_radius = float(ent.get("loc_radius", getattr(new, "loc_radius", 0.1)))
-            except Exception:
-                pass
-            
-            #scale
-            try:
-                rs = ent.get("rest_sca", [1.0, 1.0, 1.0])
-                if len(rs) >= 3:
-                    new.rest_sca = (float(rs[0]), float(rs[1]), float(rs[2]))
-            except Exception:
-                pass
-            try:
-                ps = ent.get("pose_sca", [1.0, 1.0, 1.0])
-                if len(ps) >= 3:
-                    new.pose_sca = (float(ps[0]), float(ps[1]), float(ps[2]))
-            except Exception:
-                pass
-            try:
-                new.has_sca = bool(ent.get("has_sca", False))
-            except Exception:
-                pass
-
-            # group_name 或其他字符串字段
-            try:
-                if hasattr(new, "group_name"):
-                    new.group_name = str(ent.get("group_name", getattr(new, "group_name", "") or ""))
-            except Exception:
-                pass
-
-            # 额外字段：保守尝试写入（跳过已处理字段）
+            # 按 schema 赋值（含 name / bone_name）+ 额外字段
+            _apply_import_schema(new, ent)
             for k, v in ent.items():
-                if k in {"name","bone_name","rest_rot","pose_rot","has_rot","rot_channel_mode",
-                         "cone_enabled","cone_angle","cone_axis","rest_loc","pose_loc",
-                         "has_loc","loc_enabled","loc_radius","group_name","rest_sca","pose_sca","has_sca","sca_enabled","sca_radius"}:
+                if k in _PSD_IMPORT_HANDLED_KEYS:
                     continue
                 try:
                     if hasattr(new, k):
@@ -228,6 +243,10 @@ class PSDImportConfig(bpy.types.Operator, ImportHelper):
             existing_entries.add(key)
             added += 1
 
+        psd_invalidate_entry_derived()
+        psd_invalidate_entry_cache(arm)
+        caches._psd_results_view_version += 1
+
         # 可选：将索引指向最后一个新添加的条目
         if len(arm.psd_saved_poses) > 0:
             arm.psd_saved_pose_index = len(arm.psd_saved_poses) - 1
@@ -452,8 +471,8 @@ class PSDSaveCapturedRotationEntry(bpy.types.Operator):
             self.report({'ERROR'}, "请先选择一个骨架")
             return {'CANCELLED'}
 
-        bone_r = getattr(scene, 'psd_temp_rest_bone', '')
-        bone_p = getattr(scene, 'psd_temp_pose_bone', '')
+        bone_r = scene.psd_temp_rest_bone
+        bone_p = scene.psd_temp_pose_bone
 
         has_rot = bool(bone_p and bone_p != '<NONE>')
         if not has_rot:
@@ -464,16 +483,15 @@ class PSDSaveCapturedRotationEntry(bpy.types.Operator):
             self.report({'WARNING'}, "旋转的静止/姿态来自不同骨骼；如有需要，此条目的静止值将设为(0,0,0)")
             rest_vals_rot = (0.0,0.0,0.0)
         else:
-            rest_vals_rot = tuple(getattr(scene, 'psd_temp_rest', (0.0,0.0,0.0)))
+            rest_vals_rot = tuple(scene.psd_temp_rest)
 
-        pose_vals_rot = tuple(getattr(scene, 'psd_temp_pose', (0.0,0.0,0.0)))
-        bone_name_rot = getattr(scene, 'psd_temp_pose_bone', '')
+        pose_vals_rot = tuple(scene.psd_temp_pose)
+        bone_name_rot = bone_p  # 上面已读取过
 
         # 检查该骨骼是否已存在同名条目
-        for existing in arm.psd_saved_poses:
-            if existing.bone_name == bone_name_rot and existing.name == self.entry_name:
-                self.report({'ERROR'}, f"骨骼 {bone_name_rot} 的条目 '{self.entry_name}' 已存在")
-                return {'CANCELLED'}
+        if psd_saved_entry_exists(arm, bone_name_rot, self.entry_name):
+            self.report({'ERROR'}, f"骨骼 {bone_name_rot} 的条目 '{self.entry_name}' 已存在")
+            return {'CANCELLED'}
 
         # 创建条目 (仅旋转)
         new = arm.psd_saved_poses.add()
@@ -504,7 +522,7 @@ class PSDSaveCapturedRotationEntry(bpy.types.Operator):
         scene.psd_temp_pose_bone = ''
 
         # 创建并初始化旋转结果的键
-        entry_key_rot = f"{PREFIX_RESULT}{_safe_name(new.bone_name)}_{_safe_name(new.name)}"
+        entry_key_rot = psd_result_key(PREFIX_RESULT, new.bone_name, new.name)
         try:
             arm.data[entry_key_rot] = 0.0
         except Exception:
@@ -529,8 +547,8 @@ class PSDSaveCapturedLocationEntry(bpy.types.Operator):
             self.report({'ERROR'}, "请先选择一个骨架")
             return {'CANCELLED'}
 
-        bone_loc_r = getattr(scene, 'psd_temp_loc_rest_bone', '')
-        bone_loc_p = getattr(scene, 'psd_temp_loc_bone', '')
+        bone_loc_r = scene.psd_temp_loc_rest_bone
+        bone_loc_p = scene.psd_temp_loc_bone
 
         has_loc  = bool(bone_loc_p and bone_loc_p != '<NONE>')
         if not has_loc:
@@ -541,16 +559,15 @@ class PSDSaveCapturedLocationEntry(bpy.types.Operator):
             self.report({'WARNING'}, "位置的静止/姿态来自不同骨骼；如有需要，此条目的静止值将设为(0,0,0)")
             rest_vals_loc = (0.0,0.0,0.0)
         else:
-            rest_vals_loc = tuple(getattr(scene, 'psd_temp_loc_rest', (0.0,0.0,0.0)))
+            rest_vals_loc = tuple(scene.psd_temp_loc_rest)
 
-        pose_vals_loc = tuple(getattr(scene, 'psd_temp_loc', (0.0,0.0,0.0)))
-        bone_name_loc = getattr(scene, 'psd_temp_loc_bone', '')
+        pose_vals_loc = tuple(scene.psd_temp_loc)
+        bone_name_loc = bone_loc_p  # 上面已读取过
 
         # 检查该骨骼是否已存在同名条目
-        for existing in arm.psd_saved_poses:
-            if existing.bone_name == bone_name_loc and existing.name == self.entry_name:
-                self.report({'ERROR'}, f"骨骼 {bone_name_loc} 的条目 '{self.entry_name}' 已存在")
-                return {'CANCELLED'}
+        if psd_saved_entry_exists(arm, bone_name_loc, self.entry_name):
+            self.report({'ERROR'}, f"骨骼 {bone_name_loc} 的条目 '{self.entry_name}' 已存在")
+            return {'CANCELLED'}
 
         # 创建条目 (仅位移)
         new = arm.psd_saved_poses.add()
@@ -582,7 +599,7 @@ class PSDSaveCapturedLocationEntry(bpy.types.Operator):
         scene.psd_temp_loc_bone = ''
 
         # 创建并初始化位移结果的键
-        entry_key_loc = f"{PREFIX_RESULT_LOC}{_safe_name(new.bone_name)}_{_safe_name(new.name)}"
+        entry_key_loc = psd_result_key(PREFIX_RESULT_LOC, new.bone_name, new.name)
         try:
             arm.data[entry_key_loc] = 0.0
         except Exception:
@@ -607,8 +624,8 @@ class PSDSaveCapturedScaleEntry(bpy.types.Operator):
             self.report({'ERROR'}, "请先选择一个骨架")
             return {'CANCELLED'}
 
-        bone_sca_r = getattr(scene, 'psd_temp_sca_rest_bone', '')
-        bone_sca_p = getattr(scene, 'psd_temp_sca_bone', '')
+        bone_sca_r = scene.psd_temp_sca_rest_bone
+        bone_sca_p = scene.psd_temp_sca_bone
 
         has_sca = bool(bone_sca_p and bone_sca_p != '<NONE>')
         if not has_sca:
@@ -619,16 +636,15 @@ class PSDSaveCapturedScaleEntry(bpy.types.Operator):
             self.report({'WARNING'}, "缩放的静止/姿态来自不同骨骼；如有需要，此条目的静止值将设为(1,1,1)")
             rest_vals_sca = (1.0,1.0,1.0)
         else:
-            rest_vals_sca = tuple(getattr(scene, 'psd_temp_sca_rest', (1.0,1.0,1.0)))
+            rest_vals_sca = tuple(scene.psd_temp_sca_rest)
 
-        pose_vals_sca = tuple(getattr(scene, 'psd_temp_sca', (1.0,1.0,1.0)))
-        bone_name_sca = getattr(scene, 'psd_temp_sca_bone', '')
+        pose_vals_sca = tuple(scene.psd_temp_sca)
+        bone_name_sca = bone_sca_p  # 上面已读取过
 
         # 检查该骨骼是否已存在同名条目
-        for existing in arm.psd_saved_poses:
-            if existing.bone_name == bone_name_sca and existing.name == self.entry_name:
-                self.report({'ERROR'}, f"骨骼 {bone_name_sca} 的条目 '{self.entry_name}' 已存在")
-                return {'CANCELLED'}
+        if psd_saved_entry_exists(arm, bone_name_sca, self.entry_name):
+            self.report({'ERROR'}, f"骨骼 {bone_name_sca} 的条目 '{self.entry_name}' 已存在")
+            return {'CANCELLED'}
 
         # 创建条目 (仅缩放)
         new = arm.psd_saved_poses.add()
@@ -656,7 +672,7 @@ class PSDSaveCapturedScaleEntry(bpy.types.Operator):
         scene.psd_temp_sca_bone = ''
 
         # 创建并初始化缩放结果的键
-        entry_key_sca = f"{PREFIX_RESULT_SCA}{_safe_name(new.bone_name)}_{_safe_name(new.name)}"
+        entry_key_sca = psd_result_key(PREFIX_RESULT_SCA, new.bone_name, new.name)
         try:
             arm.data[entry_key_sca] = 0.0
         except Exception:
@@ -683,30 +699,30 @@ class PSDRemoveSavedEntry(bpy.types.Operator):
         try:
             # 获取要删除的条目
             entry = arm.psd_saved_poses[idx]
-            entry_key_rot = f"{PREFIX_RESULT}{_safe_name(entry.bone_name)}_{_safe_name(entry.name)}"
-            entry_key_loc = f"{PREFIX_RESULT_LOC}{_safe_name(entry.bone_name)}_{_safe_name(entry.name)}"
-            entry_key_sca = f"{PREFIX_RESULT_SCA}{_safe_name(entry.bone_name)}_{_safe_name(entry.name)}"
+            # 名字只读一次，结果键走 psd_result_key 的缓存（与每帧计算使用的键一致）
+            bn, en = entry.bone_name, entry.name
+            entry_key_rot = psd_result_key(PREFIX_RESULT, bn, en)
+            entry_key_loc = psd_result_key(PREFIX_RESULT_LOC, bn, en)
+            entry_key_sca = psd_result_key(PREFIX_RESULT_SCA, bn, en)
             
-            # 改进1: 显式获取 Armature Datablock，与写入函数保持一致
-            arm_db = bpy.data.armatures.get(arm.data.name)
-
-            if arm_db:
-                # 从数据块中安全地删除自定义属性
-                if entry_key_rot in arm_db:
-                    del arm_db[entry_key_rot]
-                if entry_key_loc in arm_db:
-                    del arm_db[entry_key_loc]
-                if entry_key_sca in arm_db:
-                    del arm_db[entry_key_sca]
+            # 改进1: 直接使用 arm.data（即骨架数据块），与写入函数保持一致；上面已确认是骨架对象，无需再判空
+            arm_db = arm.data
+            # 从数据块中安全地删除自定义属性：每个键一次 pop，不存在时忽略（省去先 in 再 del 的两次查找）
+            for k in (entry_key_rot, entry_key_loc, entry_key_sca):
+                arm_db.pop(k, None)
             
             # 从UI列表对应的集合中移除该条目
             arm.psd_saved_poses.remove(idx)
+            psd_invalidate_entry_derived()
+            psd_invalidate_entry_cache(arm)
+            caches._psd_results_view_version += 1
             
             # 更新UI列表的选中索引
             new_len = len(arm.psd_saved_poses)
             arm.psd_saved_pose_index = min(max(0, idx - 1), new_len - 1) if new_len > 0 else -1
             
-            self.report({'INFO'}, f"已移除条目 '{entry.name}'")
+            # entry 在 remove() 之后已失效，使用事先读取的名字
+            self.report({'INFO'}, f"已移除条目 '{en}'")
 
         except Exception as e:
             # 改进2: 捕获所有潜在错误并报告，防止静默失败
@@ -748,11 +764,10 @@ class PSD_OT_RemoveTrigger(bpy.types.Operator):
         try:
             key = arm.psd_triggers[idx]
             key_base = f"{PREFIX_RESULT_LOC}{_safe_name(key.target_bone)}_{_safe_name(key.name)}_w"
-            arm_db = bpy.data.armatures.get(arm.data.name)
-            if arm_db:
-                if key_base in arm_db:
-                    print("success del " + key_base)
-                    del arm_db[key_base]
+            arm_db = arm.data
+            if key_base in arm_db:
+                print("success del " + key_base)
+                del arm_db[key_base]
             arm.psd_triggers.remove(idx)
             arm.psd_trigger_index = min(max(0, idx-1), len(arm.psd_triggers)-1)
         except Exception as e:
@@ -782,49 +797,10 @@ class PSD_OT_SelectTriggerBone(bpy.types.Operator):
             arm.psd_triggers[idx].target_bone = pb.name
         return {'FINISHED'}
 
-class PSDRecordChannelX(bpy.types.Operator):
-    bl_idname = "psd.record_channel_x"
-    bl_label = "Record X Channel"
-
-    def execute(self, context):
-        arm = context.object
-        if not arm or arm.type != 'ARMATURE':
-            self.report({'ERROR'}, "请先选择一个骨架")
-            return {'CANCELLED'}
-        selected_bone = _get_selected_pair_bone(context)
-        if selected_bone == '<NONE>':
-            self.report({'ERROR'}, "骨骼过滤器中未选择骨骼。请先在骨骼过滤器列表中添加/选择一个骨骼。")
-            return {'CANCELLED'}
-        name = "record_X"
-        # Check if exists
-        for existing in arm.psd_saved_poses:
-            if existing.bone_name == selected_bone and existing.name == name:
-                self.report({'ERROR'}, f"骨骼 {selected_bone} 的条目 '{name}' 已存在")
-                return {'CANCELLED'}
-        try:
-            new = arm.psd_saved_poses.add()
-            new.name = name
-            new.bone_name = selected_bone
-            new.is_direct_channel = True
-            new.channel_axis = 'X'
-            new.has_rot = False
-            new.has_loc = False
-            arm.psd_saved_pose_index = len(arm.psd_saved_poses) - 1
-            # Initialize result key
-            key = f"{PREFIX_RESULT}{_safe_name(selected_bone)}_{_safe_name(name)}"
-            try:
-                arm.data[key] = 0.0
-            except Exception:
-                pass
-            self.report({'INFO'}, f"Added {name} for {selected_bone}")
-            return {'FINISHED'}
-        except Exception as ex:
-            self.report({'ERROR'}, f"记录失败: {ex}")
-            return {'CANCELLED'}
-
-class PSDRecordChannelY(bpy.types.Operator):
-    bl_idname = "psd.record_channel_y"
-    bl_label = "Record Y Channel"
+class PSDRecordChannel(bpy.types.Operator):
+    bl_idname = "psd.record_channel"
+    bl_label = "Record Channel"
+    axis: bpy.props.EnumProperty(items=[('X','X',''), ('Y','Y',''), ('Z','Z','')], default='X')
 
     def execute(self, context):
         arm = context.object
@@ -835,63 +811,22 @@ class PSDRecordChannelY(bpy.types.Operator):
         if selected_bone == '<NONE>':
             self.report({'ERROR'}, "骨骼过滤器中未选择骨骼。请先在骨骼过滤器列表中添加/选择一个骨骼。")
             return {'CANCELLED'}
-        name = "record_Y"
+        name = f"record_{self.axis}"
         # Check if exists
-        for existing in arm.psd_saved_poses:
-            if existing.bone_name == selected_bone and existing.name == name:
-                self.report({'ERROR'}, f"骨骼 {selected_bone} 的条目 '{name}' 已存在")
-                return {'CANCELLED'}
-        try:
-            new = arm.psd_saved_poses.add()
-            new.name = name
-            new.bone_name = selected_bone
-            new.is_direct_channel = True
-            new.channel_axis = 'Y'
-            new.has_rot = False
-            new.has_loc = False
-            arm.psd_saved_pose_index = len(arm.psd_saved_poses) - 1
-            # Initialize result key
-            key = f"{PREFIX_RESULT}{_safe_name(selected_bone)}_{_safe_name(name)}"
-            try:
-                arm.data[key] = 0.0
-            except Exception:
-                pass
-            self.report({'INFO'}, f"Added {name} for {selected_bone}")
-            return {'FINISHED'}
-        except Exception as ex:
-            self.report({'ERROR'}, f"记录失败: {ex}")
-            return {'CANCELLED'}
-
-class PSDRecordChannelZ(bpy.types.Operator):
-    bl_idname = "psd.record_channel_z"
-    bl_label = "Record Z Channel"
-
-    def execute(self, context):
-        arm = context.object
-        if not arm or arm.type != 'ARMATURE':
-            self.report({'ERROR'}, "请先选择一个骨架")
+        if psd_saved_entry_exists(arm, selected_bone, name):
+            self.report({'ERROR'}, f"骨骼 {selected_bone} 的条目 '{name}' 已存在")
             return {'CANCELLED'}
-        selected_bone = _get_selected_pair_bone(context)
-        if selected_bone == '<NONE>':
-            self.report({'ERROR'}, "骨骼过滤器中未选择骨骼。请先在骨骼过滤器列表中添加/选择一个骨骼。")
-            return {'CANCELLED'}
-        name = "record_Z"
-        # Check if exists
-        for existing in arm.psd_saved_poses:
-            if existing.bone_name == selected_bone and existing.name == name:
-                self.report({'ERROR'}, f"骨骼 {selected_bone} 的条目 '{name}' 已存在")
-                return {'CANCELLED'}
         try:
             new = arm.psd_saved_poses.add()
             new.name = name
             new.bone_name = selected_bone
             new.is_direct_channel = True
-            new.channel_axis = 'Z'
+            new.channel_axis = self.axis
             new.has_rot = False
             new.has_loc = False
             arm.psd_saved_pose_index = len(arm.psd_saved_poses) - 1
             # Initialize result key
-            key = f"{PREFIX_RESULT}{_safe_name(selected_bone)}_{_safe_name(name)}"
+            key = psd_result_key(PREFIX_RESULT, selected_bone, name)
             try:
                 arm.data[key] = 0.0
             except Exception:
@@ -1,13 +1,49 @@
 import bpy
 import bpy.app.handlers as handlers
+from bpy.props import (
+    BoolProperty, CollectionProperty, EnumProperty, FloatProperty,
+    FloatVectorProperty, IntProperty, PointerProperty, StringProperty,
+)
 from .handlers import _unsubscribe_msgbus, _remove_handlers_with_name, psd_depsgraph_handler, psd_frame_handler
+from .core import psd_invalidate_entry_cache, psd_invalidate_bone_filter, psd_update_min_interval, psd_update_perf_settings
+from . import caches
+
+
+def _on_saved_pose_update(self, context):
+    # 条目任一字段被修改时，让计算循环重建条目缓存
+    psd_invalidate_entry_cache(self.id_data)
+
+
+def _on_saved_pose_name_update(self, context):
+    # 改名会改变结果键的短名，键数量不变时结果面板的签名也需要失效
+    psd_invalidate_entry_cache(self.id_data)
+    caches._psd_results_view_version += 1
+
+
+def _on_bone_pair_update(self, context):
+    psd_invalidate_bone_filter(self.id_data)
+
+
+def _on_idle_hz_update(self, context):
+    psd_update_min_interval(self.id_data)
+
+def _on_perf_settings_update(self, context):
+    psd_update_perf_settings(self.id_data)
+
+def _on_results_view_update(self, context):
+    # 面板开关 / 搜索词 / 排序方式与方向变化时在这里重建（或释放）结果面板缓存，面板 draw() 只读取缓存
+    try:
+        from .ui import psd_refresh_results_view  # 延迟导入避免循环
+        psd_refresh_results_view(context)
+    except Exception:
+        pass
 
 
 class PSDSavedPose(bpy.types.PropertyGroup):
-    name: bpy.props.StringProperty(name="条目名称", default="default")
-    bone_name: bpy.props.StringProperty(name="骨骼")
+    name: StringProperty(name="条目名称", default="default", update=_on_saved_pose_name_update)
+    bone_name: StringProperty(name="骨骼", update=_on_saved_pose_name_update)
     # 旋转通道
-    record_rot_channel_mode: bpy.props.EnumProperty(
+    record_rot_channel_mode: EnumProperty(
     name="旋转通道模式",
     description="使用摇摆+扭转分解来计算权重（若非 'NONE' 且未启用锥形衰减时生效）",
     items=[
@@ -16,13 +52,14 @@ class PSDSavedPose(bpy.types.PropertyGroup):
         ('record_rot_SWING_Y_TWIST', "摆动和 Y 扭转", "将 Y 轴作为扭转轴"),
         ('record_rot_SWING_Z_TWIST', "摆动和 Z 扭转", "将 Z 轴作为扭转轴"),
     ],
-    default='NONE'
+    default='NONE',
+    update=_on_saved_pose_update
     )
-    rest_rot: bpy.props.FloatVectorProperty(name="静止旋转 (度)", size=3, default=(0.0,0.0,0.0))
-    pose_rot: bpy.props.FloatVectorProperty(name="姿态旋转 (度)", size=3, default=(0.0,0.0,0.0))
-    has_rot: bpy.props.BoolProperty(name="包含旋转", default=False)
+    rest_rot: FloatVectorProperty(name="静止旋转 (度)", size=3, default=(0.0,0.0,0.0), update=_on_saved_pose_update)
+    pose_rot: FloatVectorProperty(name="姿态旋转 (度)", size=3, default=(0.0,0.0,0.0), update=_on_saved_pose_update)
+    has_rot: BoolProperty(name="包含旋转", default=False, update=_on_saved_pose_update)
     # 没什么用
-    # rot_channel_mode: bpy.props.EnumProperty(
+    # rot_channel_mode: EnumProperty(
     #     name="旋转通道模式",
     #     description="使用摇摆+扭转分解来计算权重（若非 'NONE' 且未启用锥形衰减时生效）",
     #     items=[
@@ -35,46 +72,48 @@ class PSDSavedPose(bpy.types.PropertyGroup):
     # )
 
     # 旋转的锥形衰减 (现有行为)
-    cone_enabled: bpy.props.BoolProperty(name="锥形衰减", default=False)
-    cone_angle: bpy.props.FloatProperty(name="锥角 (度)", default=60.0, min=0.0, max=180.0)
-    cone_axis: bpy.props.EnumProperty(
+    cone_enabled: BoolProperty(name="锥形衰减", default=False, update=_on_saved_pose_update)
+    cone_angle: FloatProperty(name="锥角 (度)", default=60.0, min=0.0, max=180.0, update=_on_saved_pose_update)
+    cone_axis: EnumProperty(
         name="锥体轴向",
         description="用作锥体中心方向的局部轴",
         items=[('X','X',''), ('Y','Y',''), ('Z','Z','')],
-        default='Z'
+        default='Z',
+        update=_on_saved_pose_update
     )
 
     # 位移通道
-    rest_loc: bpy.props.FloatVectorProperty(name="静止位置", size=3, default=(0.0,0.0,0.0))
-    pose_loc: bpy.props.FloatVectorProperty(name="姿态位置", size=3, default=(0.0,0.0,0.0))
-    has_loc: bpy.props.BoolProperty(name="包含位移", default=False)
-    loc_enabled: bpy.props.BoolProperty(name="启用位移衰减", default=False)
-    loc_radius: bpy.props.FloatProperty(name="位移半径", default=0.1, min=0.0, soft_max=10.0)
+    rest_loc: FloatVectorProperty(name="静止位置", size=3, default=(0.0,0.0,0.0), update=_on_saved_pose_update)
+    pose_loc: FloatVectorProperty(name="姿态位置", size=3, default=(0.0,0.0,0.0), update=_on_saved_pose_update)
+    has_loc: BoolProperty(name="包含位移", default=False, update=_on_saved_pose_update)
+    loc_enabled: BoolProperty(name="启用位移衰减", default=False, update=_on_saved_pose_update)
+    loc_radius: FloatProperty(name="位移半径", default=0.1, min=0.0, soft_max=10.0, update=_on_saved_pose_update)
 
     # 缩放通道
-    rest_sca: bpy.props.FloatVectorProperty(name="静止缩放", size=3, default=(1.0,1.0,1.0))
-    pose_sca: bpy.props.FloatVectorProperty(name="姿态缩放", size=3, default=(1.0,1.0,1.0))
-    has_sca: bpy.props.BoolProperty(name="包含缩放", default=False)
+    rest_sca: FloatVectorProperty(name="静止缩放", size=3, default=(1.0,1.0,1.0), update=_on_saved_pose_update)
+    pose_sca: FloatVectorProperty(name="姿态缩放", size=3, default=(1.0,1.0,1.0), update=_on_saved_pose_update)
+    has_sca: BoolProperty(name="包含缩放", default=False, update=_on_saved_pose_update)
 
-    is_direct_channel: bpy.props.BoolProperty(name="Direct Channel Record", default=False)
-    channel_axis: bpy.props.EnumProperty(
+    is_direct_channel: BoolProperty(name="Direct Channel Record", default=False, update=_on_saved_pose_update)
+    channel_axis: EnumProperty(
         name="Channel Axis",
         items=[('X', "X", ""), ('Y', "Y", ""), ('Z', "Z", "")],
-        default='X'
+        default='X',
+        update=_on_saved_pose_update
     )
 
 class PSDBonePair(bpy.types.PropertyGroup):
-    bone_name: bpy.props.StringProperty(name="骨骼", default="")
+    bone_name: StringProperty(name="骨骼", default="", update=_on_bone_pair_update)
 
 class PSDBoneTrigger(bpy.types.PropertyGroup):
     """单个触发器条目：放在触发骨骼头周围一个半径（球形），当目标骨骼头进入范围时产生权重"""
-    name: bpy.props.StringProperty(name="Name", default="Trigger")
-    bone_name: bpy.props.StringProperty(name="Trigger Bone", default="")     # 触发器骨骼（创建时默认活动骨骼）
-    target_bone: bpy.props.StringProperty(name="Target Bone", default="")    # 被检测的目标骨骼
-    enabled: bpy.props.BoolProperty(name="Enabled", default=True)
-    radius: bpy.props.FloatProperty(name="Radius", default=0.2, min=0.0, description="Trigger radius (world units)")
+    name: StringProperty(name="Name", default="Trigger")
+    bone_name: StringProperty(name="Trigger Bone", default="")     # 触发器骨骼（创建时默认活动骨骼）
+    target_bone: StringProperty(name="Target Bone", default="")    # 被检测的目标骨骼
+    enabled: BoolProperty(name="Enabled", default=True)
+    radius: FloatProperty(name="Radius", default=0.2, min=0.0, description="Trigger radius (world units)")
     # 可选：是否线性/平滑衰减（enum），当前仅用线性
-    falloff: bpy.props.EnumProperty(
+    falloff: EnumProperty(
         name="Falloff",
         items=[
             ('LINEAR', "Linear", "Linear falloff (1 - d / r)"),
@@ -83,58 +122,26 @@ class PSDBoneTrigger(bpy.types.PropertyGroup):
         default='LINEAR'
     )
     # 运行时结果（只读供 UI 显示），不会被序列化为复杂对象，但会保存为小数
-    last_weight: bpy.props.FloatProperty(name="Last Weight", default=0.0)
+    last_weight: FloatProperty(name="Last Weight", default=0.0)
 
 class PSDShapeDriverFile(bpy.types.PropertyGroup):
-    filepath: bpy.props.StringProperty(
+    filepath: StringProperty(
         name="JSON File",
         subtype='FILE_PATH',
         description="Shape Driver JSON 文件路径"
     )
 
 class PSDPoseDriverFile(bpy.types.PropertyGroup):
-    filepath: bpy.props.StringProperty(
+    filepath: StringProperty(
         name="JSON File",
         subtype='FILE_PATH',
         description="Pose Driver JSON 文件路径"
     )
 
-def register_props():
-    # 注册属性到 bpy.types.Object 和 bpy.types.Scene
-    bpy.types.Object.psd_saved_poses = bpy.props.CollectionProperty(type=PSDSavedPose)
-    bpy.types.Object.psd_saved_pose_index = bpy.props.IntProperty(default=-1)
-    bpy.types.Object.psd_bone_pairs = bpy.props.CollectionProperty(type=PSDBonePair)
-    bpy.types.Object.psd_bone_pairs_index = bpy.props.IntProperty(default=0)
-    bpy.types.Object.psd_triggers = bpy.props.CollectionProperty(type=PSDBoneTrigger)
-    bpy.types.Object.psd_trigger_index = bpy.props.IntProperty(default=-1)
-    
-    # 场景属性（临时存储等）
-    # 场景临时存储 (旋转)
-    bpy.types.Scene.psd_temp_rest = bpy.props.FloatVectorProperty(size=3, default=(0.0,0.0,0.0))
-    bpy.types.Scene.psd_temp_pose = bpy.props.FloatVectorProperty(size=3, default=(0.0,0.0,0.0))
-    bpy.types.Scene.psd_temp_rest_bone = bpy.props.StringProperty(default='')
-    bpy.types.Scene.psd_temp_pose_bone = bpy.props.StringProperty(default='')
-
-    # 场景临时存储 (位移)
-    bpy.types.Scene.psd_temp_loc_rest = bpy.props.FloatVectorProperty(size=3, default=(0.0,0.0,0.0))
-    bpy.types.Scene.psd_temp_loc = bpy.props.FloatVectorProperty(size=3, default=(0.0,0.0,0.0))
-    bpy.types.Scene.psd_temp_loc_rest_bone = bpy.props.StringProperty(default='')
-    bpy.types.Scene.psd_temp_loc_bone = bpy.props.StringProperty(default='')
-
-    #
-    bpy.types.Scene.psd_temp_sca_rest = bpy.props.FloatVectorProperty(size=3, default=(1.0,1.0,1.0))
-    bpy.types.Scene.psd_temp_sca = bpy.props.FloatVectorProperty(size=3, default=(1.0,1.0,1.0))
-    bpy.types.Scene.psd_temp_sca_rest_bone = bpy.props.StringProperty(default='')
-    bpy.types.Scene.psd_temp_sca_bone = bpy.props.StringProperty(default='')
+class PSDSceneProps(bpy.types.PropertyGroup):
+    running: BoolProperty(name="运行中", default=False)
 
-    #UI
-    bpy.types.Scene.psd_show_captures = bpy.props.BoolProperty(name="显示捕捉数据", default=True)
-    bpy.types.Scene.psd_show_triggers = bpy.props.BoolProperty(name="显示触发器", default=True)
-    bpy.types.Scene.psd_show_saved_poses = bpy.props.BoolProperty(name="显示已保存姿态", default=True)
-
-    bpy.types.Scene.psd_running = bpy.props.BoolProperty(default=False)
-
-    bpy.types.Scene.psd_mode = bpy.props.EnumProperty(
+    mode: EnumProperty(
         name="PSD 模式",
         description="AUTO(无实用价值(beta)): 根据播放状态自动切换; FORCE_PLAY(按动画播放器速率): 始终视为播放状态; FORCE_TIMER(推荐): 始终使用计时器采样",
         items=[
@@ -145,62 +152,111 @@ def register_props():
         default='AUTO'
     )
 
-    bpy.types.Scene.psd_idle_hz = bpy.props.IntProperty(
+    idle_hz: IntProperty(
         name="空闲频率(Hz)",
         description="非播放状态下计时器更新的频率(Hz) (1..240)",
         default=10,
         min=1,
-        max=240
+        max=240,
+        update=_on_idle_hz_update
     )
 
     # 性能调试属性
-    bpy.types.Scene.psd_perf_enabled = bpy.props.BoolProperty(
+    perf_enabled: BoolProperty(
         name="启用性能调试",
         description="显示运行时性能指标 (调试用)",
-        default=False
+        default=False,
+        update=_on_perf_settings_update
     )
-    bpy.types.Scene.psd_perf_history_len = bpy.props.IntProperty(
+    perf_history_len: IntProperty(
         name="性能历史",
         description="用于计算每个结果平均延迟的近期样本数",
         default=10,
         min=1,
-        max=200
+        max=200,
+        update=_on_perf_settings_update
     )
-    
-    bpy.types.Scene.psd_show_results = bpy.props.BoolProperty(
+
+    compact_export: BoolProperty(
+        name="紧凑导出",
+        description="导出配置时不缩进（文件更小，写入更快，但不便于手工阅读）",
+        default=False
+    )
+
+    show_results: BoolProperty(
         name="显示 PSD 结果",
         description="在面板中显示存储在 armature.data 中的所有 PSD 结果（打开可能会影响 UI 性能）",
-        default=False
+        default=False,
+        update=_on_results_view_update
     )
-    
-        # 搜索 / 排序 / 显示上限（用于 PSD 结果面板）
-    bpy.types.Scene.psd_results_search = bpy.props.StringProperty(
+
+    # 搜索 / 排序 / 显示上限（用于 PSD 结果面板）
+    results_search: StringProperty(
         name="搜索 PSD 结果",
         description="按 key 或短名搜索 PSD 结果（大小写不敏感）",
-        default=""
+        default="",
+        update=_on_results_view_update
     )
-    bpy.types.Scene.psd_results_sort_by = bpy.props.EnumProperty(
+    results_sort_by: EnumProperty(
         name="排序方式",
         description="对 PSD 结果进行排序",
         items=[
             ('NAME', "名字", "按名字排序（短名）"),
         ],
-        default='NAME'
+        default='NAME',
+        update=_on_results_view_update
     )
-    bpy.types.Scene.psd_results_sort_reverse = bpy.props.BoolProperty(
+    results_sort_reverse: BoolProperty(
         name="倒序",
         description="倒序排序（开 -> 从大到小）",
-        default=False
+        default=False,
+        update=_on_results_view_update
     )
-    bpy.types.Scene.psd_results_limit = bpy.props.IntProperty(
+    results_limit: IntProperty(
         name="显示上限",
         description="一次最多显示多少条结果（避免 UI 过多）",
-        default=200,
+        default=50,
         min=1,
         max=5000
     )
 
-    bpy.types.Object.psd_output_mode = bpy.props.EnumProperty(
+def register_props():
+    # 注册属性到 bpy.types.Object 和 bpy.types.Scene
+    bpy.types.Object.psd_saved_poses = CollectionProperty(type=PSDSavedPose)
+    bpy.types.Object.psd_saved_pose_index = IntProperty(default=-1)
+    bpy.types.Object.psd_bone_pairs = CollectionProperty(type=PSDBonePair)
+    bpy.types.Object.psd_bone_pairs_index = IntProperty(default=0)
+    bpy.types.Object.psd_triggers = CollectionProperty(type=PSDBoneTrigger)
+    bpy.types.Object.psd_trigger_index = IntProperty(default=-1)
+    
+    # 场景属性（临时存储等）
+    # 场景临时存储 (旋转)
+    bpy.types.Scene.psd_temp_rest = FloatVectorProperty(size=3, default=(0.0,0.0,0.0))
+    bpy.types.Scene.psd_temp_pose = FloatVectorProperty(size=3, default=(0.0,0.0,0.0))
+    bpy.types.Scene.psd_temp_rest_bone = StringProperty(default='')
+    bpy.types.Scene.psd_temp_pose_bone = StringProperty(default='')
+
+    # 场景临时存储 (位移)
+    bpy.types.Scene.psd_temp_loc_rest = FloatVectorProperty(size=3, default=(0.0,0.0,0.0))
+    bpy.types.Scene.psd_temp_loc = FloatVectorProperty(size=3, default=(0.0,0.0,0.0))
+    bpy.types.Scene.psd_temp_loc_rest_bone = StringProperty(default='')
+    bpy.types.Scene.psd_temp_loc_bone = StringProperty(default='')
+
+    #
+    bpy.types.Scene.psd_temp_sca_rest = FloatVectorProperty(size=3, default=(1.0,1.0,1.0))
+    bpy.types.Scene.psd_temp_sca = FloatVectorProperty(size=3, default=(1.0,1.0,1.0))
+    bpy.types.Scene.psd_temp_sca_rest_bone = StringProperty(default='')
+    bpy.types.Scene.psd_temp_sca_bone = StringProperty(default='')
+
+    #UI
+    bpy.types.Scene.psd_show_captures = BoolProperty(name="显示捕捉数据", default=True)
+    bpy.types.Scene.psd_show_triggers = BoolProperty(name="显示触发器", default=True)
+    bpy.types.Scene.psd_show_saved_poses = BoolProperty(name="显示已保存姿态", default=True)
+
+    # 运行 / 调试 / 结果面板设置统一放在 scene.psd 下
+    bpy.types.Scene.psd = PointerProperty(type=PSDSceneProps)
+
+    bpy.types.Object.psd_output_mode = EnumProperty(
         name="PSD 输出模式",
         description="选择 PSD 计算结果的处理方式",
         items=[
@@ -211,18 +267,88 @@ def register_props():
     )
 
 # === 新增：全局（Scene）Shape Driver 和 Pose Driver JSON 文件列表 ===
-    bpy.types.Object.psd_shape_driver_files = bpy.props.CollectionProperty(type=PSDShapeDriverFile)
-    bpy.types.Object.psd_shape_driver_files_index = bpy.props.IntProperty(default=-1)
+    bpy.types.Object.psd_shape_driver_files = CollectionProperty(type=PSDShapeDriverFile)
+    bpy.types.Object.psd_shape_driver_files_index = IntProperty(default=-1)
 
-    bpy.types.Object.psd_pose_driver_files = bpy.props.CollectionProperty(type=PSDPoseDriverFile)
-    bpy.types.Object.psd_pose_driver_files_index = bpy.props.IntProperty(default=-1)
+    bpy.types.Object.psd_pose_driver_files = CollectionProperty(type=PSDPoseDriverFile)
+    bpy.types.Object.psd_pose_driver_files_index = IntProperty(default=-1)
 
-    bpy.types.Object.show_psd_settings = bpy.props.BoolProperty(
+    bpy.types.Object.show_psd_settings = BoolProperty(
         name="显示 PSD 输出设置",
         description="展开或折叠 PSD 输出详细设置",
         default=False
     )
 
+# 注销时需要删除的属性名（与 register_props 对应）
+_SCENE_PROPS = (
+    'psd_temp_rest', 'psd_temp_pose', 'psd_temp_rest_bone', 'psd_temp_pose_bone',
+    'psd_temp_loc_rest', 'psd_temp_loc', 'psd_temp_loc_rest_bone', 'psd_temp_loc_bone',
+    'psd_temp_sca_rest', 'psd_temp_sca', 'psd_temp_sca_rest_bone', 'psd_temp_sca_bone',
+    'psd_show_captures', 'psd_show_triggers', 'psd_show_saved_poses',
+    'psd',
+)
+_OBJECT_PROPS = (
+    'psd_saved_poses', 'psd_saved_pose_index',
+    'psd_bone_pairs', 'psd_bone_pairs_index',
+    'psd_triggers', 'psd_trigger_index',
+    'psd_output_mode',
+    'psd_shape_driver_files', 'psd_shape_driver_files_index',
+    'psd_pose_driver_files', 'psd_pose_driver_files_index',
+    'show_psd_settings',
+)
+
+# 旧版本直接挂在 Scene 上的设置 -> scene.psd 中的新属性名；旧 .blend 中仍以 ID 属性形式保存
+_LEGACY_SCENE_SETTINGS = (
+    ('psd_running', 'running'),
+    ('psd_mode', 'mode'),
+    ('psd_idle_hz', 'idle_hz'),
+    ('psd_perf_enabled', 'perf_enabled'),
+    ('psd_perf_history_len', 'perf_history_len'),
+    ('psd_compact_export', 'compact_export'),
+    ('psd_show_results', 'show_results'),
+    ('psd_results_search', 'results_search'),
+    ('psd_results_sort_by', 'results_sort_by'),
+    ('psd_results_sort_reverse', 'results_sort_reverse'),
+    ('psd_results_limit', 'results_limit'),
+)
+
+def psd_migrate_legacy_scene_props(scene):
+    """把旧版 scene.psd_* ID 属性迁移到 scene.psd 并删除旧值，返回迁移的属性数"""
+    settings = getattr(scene, "psd", None)
+    if settings is None:
+        return 0
+    migrated = 0
+    for old_key, new_attr in _LEGACY_SCENE_SETTINGS:
+        if old_key not in scene:
+            continue
+        try:
+            value = scene[old_key]
+            prop = settings.bl_rna.properties[new_attr]
+            if prop.type == 'ENUM' and isinstance(value, int):
+                # 枚举在 ID 属性中按序号保存
+                items = prop.enum_items
+                if not 0 <= value < len(items):
+                    raise ValueError(value)
+                value = items[value].identifier
+            setattr(settings, new_attr, value)
+            migrated += 1
+        except Exception as e:
+            print(f"[PSD] 迁移场景设置 {old_key} 失败:", e)
+        try:
+            del scene[old_key]
+        except Exception:
+            pass
+    return migrated
+
+def _safe_delattr(owner, name):
+    """属性存在时才删除，失败静默忽略"""
+    if not hasattr(owner, name):
+        return
+    try:
+        delattr(owner, name)
+    except Exception:
+        pass
+
 def unregister_props():
     # 删除属性（反向操作）
     try:
@@ -239,24 +365,7 @@ def unregister_props():
     _unsubscribe_msgbus()
 
 
-    for p in ('psd_temp_rest','psd_temp_pose','psd_temp_rest_bone','psd_temp_pose_bone',
-              'psd_temp_loc_rest','psd_temp_loc','psd_temp_loc_rest_bone','psd_temp_loc_bone',
-              'psd_running','psd_mode','psd_idle_hz','psd_perf_enabled','psd_perf_history_len','psd_show_results','psd_results_search','psd_results_sort_by','psd_results_sort_reverse','psd_results_limit',
-              'psd_temp_sca_rest','psd_temp_sca','psd_temp_sca_rest_bone','psd_temp_sca_bone','psd_show_captures','psd_show_triggers','psd_show_saved_poses','PSD_OT_invalidate_cache',
-              "psd_output_mode","psd_shape_driver_files","psd_shape_driver_files_index",
-              "psd_pose_driver_files","psd_pose_driver_files_index","show_psd_settings"):
-        try:
-            delattr(bpy.types.Scene, p)
-        except Exception:
-            pass
-
-    try:
-        delattr(bpy.types.Object, 'psd_saved_poses')
-        delattr(bpy.types.Object, 'psd_saved_pose_index')
-    except Exception:
-        pass
-    try:
-        delattr(bpy.types.Object, 'psd_bone_pairs')
-        delattr(bpy.types.Object, 'psd_bone_pairs_index')
-    except Exception:
-        pass
\ No newline at end of file
+    for p in _SCENE_PROPS:
+        _safe_delattr(bpy.types.Scene, p)
+    for p in _OBJECT_PROPS:
+        _safe_delattr(bpy.types.Object, p)
\ No newline at end of file
@@ -1,13 +1,112 @@
 import bpy
+from itertools import islice
+from operator import itemgetter
 from .utils import _get_selected_pair_bone  # 导入辅助
 from .operators import PREFIX_RESULT, PREFIX_RESULT_LOC, PREFIX_RESULT_SCA
+from . import caches
 from .core import (
     _psd_perf_stats,
     _shape_expressions_cache,
     _pose_drivers_cache,
-    _arm_key_for_obj
+    _arm_key_for_obj,
+    psd_saved_entry_bone_names
 )
 
+# 结果键前缀（用于结果面板的键筛选）
+_RESULT_PREFIXES = (PREFIX_RESULT, PREFIX_RESULT_LOC, PREFIX_RESULT_SCA)
+_LEN_RESULT = len(PREFIX_RESULT)
+_LEN_RESULT_LOC = len(PREFIX_RESULT_LOC)
+_LEN_RESULT_SCA = len(PREFIX_RESULT_SCA)
+
+# 只读的空字典（查找缺省值用，避免每次 .get(k, {}) 新建字典）
+_EMPTY_DICT = {}
+
+# PSD 结果面板缓存：{ arm_key -> (基础签名, 基础列表, 搜索词, 过滤结果) }
+# 基础签名包含数据块上的属性数量、排序方向、排序方式和 caches._psd_results_view_version；
+# 基础列表为排好序的 [(key, short, casefold 短名, casefold 匹配文本), ...]，只改搜索词时在其上过滤，不重新扫描/排序
+_results_view_cache = {}
+
+# results_sort_by 枚举值 -> 基础列表行的排序键（模块级绑定一次）
+_RESULT_SORTERS = {
+    'NAME': itemgetter(2),  # casefold 短名
+}
+
+def _get_results_view(arm, search, rev, sort_by='NAME'):
+    """返回过滤、排序后的 [(key, short), ...]（只含键名与显示名，数值在绘制时按需读取）"""
+    arm_db = arm.data
+    keys = arm_db.keys()
+    base_sig = (len(keys), rev, sort_by, caches._psd_results_view_version)
+    arm_key = _arm_key_for_obj(arm)
+    cached = _results_view_cache.get(arm_key)
+    if cached is not None and cached[0] == base_sig:
+        if cached[2] == search:
+            return cached[3]
+        base = cached[1]
+    else:
+        base = []
+        try:
+            for k in keys:
+                # 非结果键一次 startswith(元组) 即可排除
+                if not isinstance(k, str) or not k.startswith(_RESULT_PREFIXES):
+                    continue
+                # 计算短名与 display 标识
+                if k.startswith(PREFIX_RESULT):
+                    short = k[_LEN_RESULT:]
+                elif k.startswith(PREFIX_RESULT_LOC):
+                    short = k[_LEN_RESULT_LOC:] + " (位移)"
+                else:
+                    short = k[_LEN_RESULT_SCA:] + " (缩放)"
+                # 小写短名只算一次：既作排序键，也与 key 的小写拼成搜索文本（\0 保证不会跨两者匹配）
+                short_lc = short.casefold()
+                base.append((k, short, short_lc, k.casefold() + "\0" + short_lc))
+        except Exception:
+            base = []
+        base.sort(key=_RESULT_SORTERS.get(sort_by, _RESULT_SORTERS['NAME']), reverse=rev)
+
+    # 过滤（search 支持 key/short 的不区分大小写子串匹配）
+    if search:
+        view = [(k, short) for k, short, short_lc, text in base if search in text]
+    else:
+        view = [(k, short) for k, short, short_lc, text in base]
+    _results_view_cache[arm_key] = (base_sig, base, search, view)
+    return view
+
+
+# PSDSavedPoseUIList.filter_items 结果缓存：{ arm_key -> (bone_names 列表对象, 选中骨骼, 位标志, filtered, new_order) }
+# 选中骨骼不变且条目 SoA 未重建时直接复用，重绘不再逐条目比较
+_saved_pose_filter_cache = {}
+
+# 上一次的 (原始搜索词, 折叠大小写后的搜索词)：搜索词不变时重绘不再重复 strip/casefold
+_search_fold_cache = ("", "")
+
+def _results_view_args(scene):
+    """结果面板的 (折叠大小写的搜索词, 是否倒序, 排序方式)"""
+    global _search_fold_cache
+    settings = scene.psd
+    raw = settings.results_search or ""
+    cached_raw, folded = _search_fold_cache
+    if raw != cached_raw:
+        folded = raw.strip().casefold()
+        _search_fold_cache = (raw, folded)
+    return folded, bool(settings.results_sort_reverse), settings.results_sort_by
+
+def psd_refresh_results_view(context):
+    """
+    结果面板开关 / 搜索词 / 排序方向被修改时由属性 update 回调调用：
+    展开时立即重建当前骨架的结果缓存，之后的 draw() 直接命中；收起时释放全部结果缓存
+    """
+    scene = getattr(context, "scene", None)
+    if scene is None:
+        return
+    if not scene.psd.show_results:
+        _results_view_cache.clear()
+        return
+    arm = getattr(context, "object", None)
+    if arm is None or arm.type != 'ARMATURE':
+        return
+    _get_results_view(arm, *_results_view_args(scene))
+
+
 class PSDBonePairUIList(bpy.types.UIList):
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
         arm = context.object
@@ -51,10 +150,8 @@ class PSDSavedPoseUIList(bpy.types.UIList):
     def filter_items(self, context, data, propname):
         items = getattr(data, propname)
         ln = len(items)
-
-        # 默认：全部隐藏（位标志数组长度必须为 ln）
-        filtered = [0] * ln
-        new_order = list(range(ln))  # 默认新顺序为原始顺序
+        if ln == 0:
+            return [], []
 
         # 获取骨骼过滤器里选中的骨骼
         selected_bone = '<NONE>'
@@ -67,23 +164,39 @@ class PSDSavedPoseUIList(bpy.types.UIList):
             except Exception:
                 selected_bone = '<NONE>'
 
+        flag = self.bitflag_filter_item
         if selected_bone == '<NONE>':
             # 显示所有，保留原始顺序
-            filtered = [self.bitflag_filter_item] * ln
-            new_order = list(range(ln))
+            return [flag] * ln, list(range(ln))
+
+        # 条目骨骼名优先取条目 SoA 缓存（纯 Python 列表），避免每次重绘逐条目读取 RNA
+        bone_names = None
+        if propname == 'psd_saved_poses' and data == arm:
+            bone_names = psd_saved_entry_bone_names(arm)
+        if bone_names is None or len(bone_names) != ln:
+            bone_names = [item.bone_name for item in items]
+            cache_key = None
         else:
-            # 只显示匹配 bone_name 的条目，把匹配项排在前面，其余项按原顺序跟在后面
-            matching = []
-            for i, item in enumerate(items):
-                if item.bone_name == selected_bone:
-                    filtered[i] = self.bitflag_filter_item
-                    matching.append(i)
-                else:
-                    filtered[i] = 0
-            # new_order 必须是长度为 ln 的排列：先 matching，再剩下的
-            remaining = [i for i in range(ln) if i not in matching]
-            new_order = matching + remaining
+            # SoA 在条目增删/改名时整体重建，名称列表对象本身即可作为版本号
+            cache_key = _arm_key_for_obj(arm)
+            cached = _saved_pose_filter_cache.get(cache_key)
+            if cached is not None and cached[0] is bone_names and cached[1] == selected_bone and cached[2] == flag:
+                return cached[3], cached[4]
 
+        # 只显示匹配 bone_name 的条目，把匹配项排在前面，其余项按原顺序跟在后面（一次遍历）
+        filtered = [0] * ln
+        matching = []
+        remaining = []
+        for i, bn in enumerate(bone_names):
+            if bn == selected_bone:
+                filtered[i] = flag
+                matching.append(i)
+            else:
+                remaining.append(i)
+        # new_order 必须是长度为 ln 的排列：先 matching，再剩下的
+        new_order = matching + remaining
+        if cache_key is not None:
+            _saved_pose_filter_cache[cache_key] = (bone_names, selected_bone, flag, filtered, new_order)
         return filtered, new_order
 
 
@@ -133,6 +246,9 @@ class PSDPanel(bpy.types.Panel):
         layout = self.layout
         scene = context.scene
         arm = context.object
+        # 场景设置组只解析一次，多处用到的开关只读一次
+        settings = scene.psd
+        perf_enabled = settings.perf_enabled
 
         # 骨骼过滤器分组
         box = layout.box()
@@ -176,24 +292,26 @@ class PSDPanel(bpy.types.Panel):
         header = main_box.row(align=True)
 
         # 1. 展开/折叠切换器
-        icon = 'TRIA_DOWN' if arm.show_psd_settings else 'TRIA_RIGHT'
+        show_settings = arm.show_psd_settings
+        icon = 'TRIA_DOWN' if show_settings else 'TRIA_RIGHT'
         header.prop(arm, "show_psd_settings", text="", icon=icon, emboss=False)
         header.label(text="PSD 输出模式设置", icon='DRIVER')
 
         # 只有展开时才显示后续内容
-        if arm.show_psd_settings:
+        if show_settings:
             # 模式选择
             row = main_box.row()
             row.prop(arm, "psd_output_mode", text="当前模式")
             
             # 根据模式显示不同的子内容
             sub_box = main_box.box()
+            output_mode = arm.psd_output_mode
 
-            if arm.psd_output_mode == 'STORE_TO_EMPTY':
+            if output_mode == 'STORE_TO_EMPTY':
                 sub_box.label(text="存储到 Empty (应用 Shape/Pose Drivers)", icon='EMPTY_AXIS')
                 
                 row = sub_box.row(align=True)
-                row.prop(context.scene, "psd_cache_empty", text="")
+                row.prop(scene, "psd_cache_empty", text="")
                 
                 col = row.column(align=True)
                 col.operator("psd.register_cache_empty_ui", icon='CHECKMARK', text="注册")
@@ -202,14 +320,14 @@ class PSDPanel(bpy.types.Panel):
                 # 显示注册状态
                 registered_name = "<未设置>"
                 try:
-                    arm_db = bpy.data.armatures.get(arm.data.name)
+                    arm_db = arm.data
                     if arm_db:
                         registered_name = arm_db.get("_psd_cache_obj", "") or "<未设置>"
                 except: pass
                 
                 sub_box.label(text=f"当前注册: {registered_name}", icon='INFO')
 
-            elif arm.psd_output_mode == 'APPLY_DRIVERS':
+            elif output_mode == 'APPLY_DRIVERS':
                 sub_box.label(text="直接应用到 Shape Keys / 骨骼约束", icon='SHAPEKEY_DATA')
                 
                 # 统计信息
@@ -323,6 +441,7 @@ class PSDPanel(bpy.types.Panel):
         row = box.row(align=True)
         row.operator('psd.export_config', icon='EXPORT', text='导出')
         row.operator('psd.import_config', icon='IMPORT', text='导入')
+        row.prop(settings, "compact_export", text="", icon='ALIGN_JUSTIFY')
 
         # 显示已选骨骼
         selected_bone = _get_selected_pair_bone(context)
@@ -344,38 +463,48 @@ class PSDPanel(bpy.types.Panel):
         # 临时捕捉数据（collapsible）
         box = layout.box()
         row = box.row(align=True)
-        row.prop(scene, "psd_show_captures", icon='ZOOM_IN' if scene.psd_show_captures else 'ZOOM_OUT', text="捕捉数据")
-        if scene.psd_show_captures:
-            if scene.psd_temp_pose_bone:
+        show_captures = scene.psd_show_captures
+        row.prop(scene, "psd_show_captures", icon='ZOOM_IN' if show_captures else 'ZOOM_OUT', text="捕捉数据")
+        if show_captures:
+            # 每个 RNA 属性只读一次
+            label = box.label
+            pose_bone = scene.psd_temp_pose_bone
+            if pose_bone:
                 p = scene.psd_temp_pose
-                box.label(text=f"旋转 (姿态): {scene.psd_temp_pose_bone} (X={p[0]:.2f}°, Y={p[1]:.2f}°, Z={p[2]:.2f}°)")
+                label(text=f"旋转 (姿态): {pose_bone} (X={p[0]:.2f}°, Y={p[1]:.2f}°, Z={p[2]:.2f}°)")
             else:
-                box.label(text='无旋转捕捉')
-            if scene.psd_temp_rest_bone:
+                label(text='无旋转捕捉')
+            rest_bone = scene.psd_temp_rest_bone
+            if rest_bone:
                 r = scene.psd_temp_rest
-                box.label(text=f"旋转 (静止): {scene.psd_temp_rest_bone} (X={r[0]:.2f}°, Y={r[1]:.2f}°, Z={r[2]:.2f}°)")
-            if scene.psd_temp_loc_bone:
+                label(text=f"旋转 (静止): {rest_bone} (X={r[0]:.2f}°, Y={r[1]:.2f}°, Z={r[2]:.2f}°)")
+            loc_bone = scene.psd_temp_loc_bone
+            if loc_bone:
                 l = scene.psd_temp_loc
-                box.label(text=f"位置 (姿态): {scene.psd_temp_loc_bone} (X={l[0]:.4f}, Y={l[1]:.4f}, Z={l[2]:.4f})")
+                label(text=f"位置 (姿态): {loc_bone} (X={l[0]:.4f}, Y={l[1]:.4f}, Z={l[2]:.4f})")
             else:
-                box.label(text='无位置捕捉')
-            if scene.psd_temp_loc_rest_bone:
+                label(text='无位置捕捉')
+            loc_rest_bone = scene.psd_temp_loc_rest_bone
+            if loc_rest_bone:
                 lr = scene.psd_temp_loc_rest
-                box.label(text=f"位置 (静止): {scene.psd_temp_loc_rest_bone} (X={lr[0]:.4f}, Y={lr[1]:.4f}, Z={lr[2]:.4f})")
-            if scene.psd_temp_sca_bone:
+                label(text=f"位置 (静止): {loc_rest_bone} (X={lr[0]:.4f}, Y={lr[1]:.4f}, Z={lr[2]:.4f})")
+            sca_bone = scene.psd_temp_sca_bone
+            if sca_bone:
                 s = scene.psd_temp_sca
-                box.label(text=f"缩放 (姿态): {scene.psd_temp_sca_bone} (X={s[0]:.4f}, Y={s[1]:.4f}, Z={s[2]:.4f})")
+                label(text=f"缩放 (姿态): {sca_bone} (X={s[0]:.4f}, Y={s[1]:.4f}, Z={s[2]:.4f})")
             else:
-                box.label(text='无缩放捕捉')
-            if scene.psd_temp_sca_rest_bone:
+                label(text='无缩放捕捉')
+            sca_rest_bone = scene.psd_temp_sca_rest_bone
+            if sca_rest_bone:
                 sr = scene.psd_temp_sca_rest
-                box.label(text=f"缩放 (静止): {scene.psd_temp_sca_rest_bone} (X={sr[0]:.4f}, Y={sr[1]:.4f}, Z={sr[2]:.4f})")
+                label(text=f"缩放 (静止): {sca_rest_bone} (X={sr[0]:.4f}, Y={sr[1]:.4f}, Z={sr[2]:.4f})")
 
         # 骨骼触发器（collapsible）
         box = layout.box()
         row = box.row(align=True)
-        row.prop(scene, "psd_show_triggers", icon='ZOOM_IN' if scene.psd_show_triggers else 'ZOOM_OUT', text="骨骼触发器")
-        if scene.psd_show_triggers:
+        show_triggers = scene.psd_show_triggers
+        row.prop(scene, "psd_show_triggers", icon='ZOOM_IN' if show_triggers else 'ZOOM_OUT', text="骨骼触发器")
+        if show_triggers:
             subrow = box.row()
             subrow.template_list("PSDBoneTriggerUIList", "psd_triggers", arm, "psd_triggers", arm, "psd_trigger_index", rows=4)
             col = subrow.column(align=True)
@@ -386,9 +515,12 @@ class PSDPanel(bpy.types.Panel):
             col.operator("psd.select_trigger_bone", icon='RESTRICT_SELECT_OFF', text="").mode = 'TARGET'
 
             # 选中触发器详情
-            idx = arm.psd_trigger_index if arm.psd_trigger_index >= 0 and arm.psd_trigger_index < len(arm.psd_triggers) else -1
+            triggers = arm.psd_triggers
+            idx = arm.psd_trigger_index
+            if not (0 <= idx < len(triggers)):
+                idx = -1
             if idx != -1:
-                trig = arm.psd_triggers[idx]
+                trig = triggers[idx]
                 box.prop(trig, "enabled")
                 box.prop(trig, "name")
                 box.label(text=f"触发骨骼: {trig.bone_name}")
@@ -406,15 +538,16 @@ class PSDPanel(bpy.types.Panel):
         row.operator('psd.save_captured_location', text='位置')
         row.operator('psd.save_captured_scale', text='缩放')
         row = box.row(align=True)
-        row.operator('psd.record_channel_x', text="Record X")
-        row.operator('psd.record_channel_y', text="Record Y")
-        row.operator('psd.record_channel_z', text="Record Z")
+        row.operator('psd.record_channel', text="Record X").axis = 'X'
+        row.operator('psd.record_channel', text="Record Y").axis = 'Y'
+        row.operator('psd.record_channel', text="Record Z").axis = 'Z'
 
         # 已保存姿态（collapsible）
         box = layout.box()
         row = box.row(align=True)
-        row.prop(scene, "psd_show_saved_poses", icon='ZOOM_IN' if scene.psd_show_saved_poses else 'ZOOM_OUT', text="已保存姿态")
-        if scene.psd_show_saved_poses:
+        show_saved = scene.psd_show_saved_poses
+        row.prop(scene, "psd_show_saved_poses", icon='ZOOM_IN' if show_saved else 'ZOOM_OUT', text="已保存姿态")
+        if show_saved:
             bone_name = selected_bone if selected_bone != '<NONE>' else '无'
             subbox = box.box()
             subbox.label(text=f'骨骼 {bone_name} 的姿态条目:', icon='PRESET')
@@ -424,8 +557,10 @@ class PSDPanel(bpy.types.Panel):
             col.operator('psd.remove_saved_entry', icon='REMOVE', text='')
 
             # 选中条目详情
-            if arm.psd_saved_poses and arm.psd_saved_pose_index >= 0 and arm.psd_saved_pose_index < len(arm.psd_saved_poses):
-                e = arm.psd_saved_poses[arm.psd_saved_pose_index]
+            saved = arm.psd_saved_poses
+            saved_idx = arm.psd_saved_pose_index
+            if saved and 0 <= saved_idx < len(saved):
+                e = saved[saved_idx]
                 if e.bone_name == selected_bone or selected_bone == '<NONE>':
                     subbox.prop(e, 'name', text="名称")
                     subbox.label(text=f"骨骼: {e.bone_name}")
@@ -462,76 +597,49 @@ class PSDPanel(bpy.types.Panel):
         # PSD 结果显示（保持原 collapsible，但用 box 包装）
         box = layout.box()
         box.label(text='PSD 结果 (旋转/位置/缩放)', icon='GRAPH')
-        box.prop(scene, "psd_show_results", text="展开显示")
-        if scene.psd_show_results:
+        box.prop(settings, "show_results", text="展开显示")
+        if settings.show_results:
             subbox = box.box()
             row = subbox.row(align=True)
-            row.prop(scene, "psd_results_search", text="", icon='VIEWZOOM')
+            row.prop(settings, "results_search", text="", icon='VIEWZOOM')
             row = subbox.row(align=True)
-            row.prop(scene, "psd_results_sort_reverse", text="倒序")
-            row.prop(scene, "psd_results_limit", text="上限")
-
-            # 原结果收集/显示代码（不变）
-            # 收集所有结果到列表（安全地把 keys() 转为 list）
-            results = []
-            try:
-                a_stats = _psd_perf_stats.get(arm.name, {}) if isinstance(_psd_perf_stats, dict) else {}
-                entries_stats = a_stats.get("entries", {}) if isinstance(a_stats, dict) else {}
-                for k in list(arm.data.keys()):
-                    if isinstance(k, str) and (k.startswith(PREFIX_RESULT) or k.startswith(PREFIX_RESULT_LOC) or k.startswith(PREFIX_RESULT_SCA)):
-                        # 计算短名与 display 标识
-                        if k.startswith(PREFIX_RESULT):
-                            short = k[len(PREFIX_RESULT):]
-                        elif k.startswith(PREFIX_RESULT_LOC):
-                            short = k[len(PREFIX_RESULT_LOC):] + " (位移)"
-                        elif k.startswith(PREFIX_RESULT_SCA):
-                            short = k[len(PREFIX_RESULT_SCA):] + " (缩放)"
-                        else:
-                            short = k
-                        try:
-                            v = float(arm.data.get(k, 0.0))
-                        except Exception:
-                            v = 0.0
-                        ent = entries_stats.get(k, {}) if entries_stats else {}
-                        last_ms = float(ent.get("last_ms", 0.0) or 0.0)
-                        avg_ms = float(ent.get("avg_ms", 0.0) or 0.0)
-                        results.append({"key": k, "short": short, "value": v, "last_ms": last_ms, "avg_ms": avg_ms})
-            except Exception:
-                results = []
-
-            # 过滤（search 支持 key/short 的不区分大小写子串匹配）
-            s = (scene.psd_results_search or "").strip().lower()
-            if s:
-                results = [r for r in results if (s in (r["key"] or "").lower()) or (s in (r["short"] or "").lower())]
-
-            # 排序
-            # 排序（仅按短名）
-            rev = bool(getattr(scene, "psd_results_sort_reverse", False))
-            results.sort(key=lambda r: (r["short"] or "").lower(), reverse=rev)
+            row.prop(settings, "results_sort_reverse", text="倒序")
+            row.prop(settings, "results_limit", text="上限")
 
+            # 过滤 + 排序后的 (key, short) 列表按骨架缓存，面板重绘时只读取可见部分的数值
+            view = _get_results_view(arm, *_results_view_args(scene))
 
             # 显示（受上限限制）
-            limit = int(getattr(scene, "psd_results_limit", 200) or 200)
-            if limit < 1:
-                limit = 1
-            if limit > 5000:
-                limit = 5000
+            limit = settings.results_limit
 
-            if not results:
+            if not view:
                 box.label(text="<无匹配项>")
             else:
-                shown = 0
-                for r in results:
-                    if shown >= limit:
-                        break
+                arm_db = arm.data
+                show_perf = perf_enabled
+                entries_stats = _EMPTY_DICT
+                if show_perf:
+                    a_stats = _psd_perf_stats.get(arm.name) or _EMPTY_DICT
+                    entries_stats = a_stats.get("entries") or _EMPTY_DICT
+                label = box.label
+                for k, short in islice(view, limit):
+                    try:
+                        v = float(arm_db.get(k, 0.0))
+                    except Exception:
+                        v = 0.0
                     perf_note = ""
-                    if scene.psd_perf_enabled:
-                        perf_note = f"  ({r['avg_ms']:.2f}ms avg / {r['last_ms']:.2f}ms last)"
-                    box.label(text=f"{r['short']} = {r['value']:.4f}{perf_note}")
-                    shown += 1
+                    if show_perf:
+                        ent = entries_stats.get(k)
+                        if ent:
+                            last_ms = float(ent.get("last_ms") or 0.0)
+                            avg_ms = float(ent.get("avg_ms") or 0.0)
+                        else:
+                            last_ms = avg_ms = 0.0
+                        perf_note = f"  ({avg_ms:.2f}ms avg / {last_ms:.2f}ms last)"
+                    label(text=f"{short} = {v:.4f}{perf_note}")
 
             # 如果有被过滤掉但存在更多匹配，显示提示
-            total_matches = len(results)
+            total_matches = len(view)
             if total_matches > limit:
                 box.label(text=f"... 显示 {limit}/{total_matches} 条结果，缩小搜索或增加上限以查看更多")
         else:
@@ -540,12 +648,12 @@ class PSDPanel(bpy.types.Panel):
         # 模式和调试分组
         box = layout.box()
         box.label(text="运行模式 & 调试", icon='SETTINGS')
-        box.prop(scene, "psd_mode", text="模式")
-        if scene.psd_mode in ('AUTO', 'FORCE_TIMER'):
-            box.prop(scene, "psd_idle_hz", text="空闲 Hz", slider=True)
-        box.prop(scene, "psd_perf_enabled", text="性能调试")
-        if scene.psd_perf_enabled:
-            box.prop(scene, "psd_perf_history_len", text="历史长度")
+        box.prop(settings, "mode", text="模式")
+        if settings.mode in ('AUTO', 'FORCE_TIMER'):
+            box.prop(settings, "idle_hz", text="空闲 Hz", slider=True)
+        box.prop(settings, "perf_enabled", text="性能调试")
+        if perf_enabled:
+            box.prop(settings, "perf_history_len", text="历史长度")
             # 原性能显示代码（不变）
             arm_stats = _psd_perf_stats.get(arm.name)
             if arm_stats:
@@ -568,7 +676,7 @@ class PSDPanel(bpy.types.Panel):
 
         # 启动/停止按钮
         row = layout.row(align=True)
-        if scene.psd_running:
+        if settings.running:
             row.operator('object.psd_stop', icon='CANCEL', text='停止')
         else:
             row.operator('object.psd_start', icon='PLAY', text='启动')
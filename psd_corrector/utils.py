@@ -1,6 +1,8 @@
 import bpy
 import re
 import math
+from functools import lru_cache
+import numpy as np
 from mathutils import Vector, Euler, Quaternion  # 如果需要
 
 # 注册属性名（保存到 Armature datablock）
@@ -12,6 +14,18 @@ PREFIX_RESULT_SCA = "psd_sca_"
 
 # 内存缓存：{ arm_key -> { key_str -> float_value, ... }, ... }
 _psd_results_cache = {}
+# 脏键：{ arm_key -> set(key_str) }，记录内存缓存中自上次 flush 以来变化过的键，flush 只写这些键
+_psd_dirty_keys = {}
+# 已写入 Empty 但 update_tag() 失败、等待下次 flush 重新 tag 的 arm_key
+_psd_empty_tag_pending = set()
+
+# 静止姿态缓存：{ armature_data_name -> { bone_name -> (rest_local_inv, parent_name) } }
+# rest pose 在播放期间不会变化，load/undo/骨架数据更新时清空
+_rest_cache = {}
+# 批量采样布局缓存：{ armature_data_name -> { bone_names_tuple -> layout } }，与 _rest_cache 同时失效
+_rest_batch_cache = {}
+
+_FLT_EPSILON = 1.1920928955078125e-07
 
 #======================================================================
 
@@ -34,6 +48,8 @@ def psd_register_cache_empty(obj_arm: bpy.types.Object, empty_obj: bpy.types.Obj
 
     try:
         arm_db[_PSD_CACHE_OBJ_PROP] = empty_obj.name
+        # 新 Empty 上还没有任何结果，下次 flush 需要全量写入
+        psd_mark_results_dirty(obj_arm)
         if verbose:
             print(f"[PSD] 注册缓存 Empty '{empty_obj.name}' 到骨架 datablock '{arm_db.name}'（属性: {_PSD_CACHE_OBJ_PROP}）")
         return True
@@ -69,7 +85,8 @@ def psd_get_registered_empty(obj_arm: bpy.types.Object):
     """
     if not obj_arm or obj_arm.type != 'ARMATURE':
         return None
-    arm_db = bpy.data.armatures.get(obj_arm.data.name)
+    # obj_arm.data 就是骨架数据块本身，不需要再按名字到 bpy.data.armatures 里查找
+    arm_db = obj_arm.data
     if not arm_db:
         return None
     name = arm_db.get(_PSD_CACHE_OBJ_PROP, None)
@@ -121,24 +138,47 @@ def psd_flush_mem_to_registered_empty(obj_arm: bpy.types.Object, verbose=False)
                 print("[PSD] flush failed: 未注册缓存 Empty")
             return False
 
-        # 收集实际变化的属性（优化：只写变化的）
+        # 直接操作 Empty 的 ID 属性组：读取与写入都不再逐键经过 bpy_struct 的 [] 访问
+        try:
+            id_props = cache_obj.id_properties_ensure()
+        except Exception:
+            id_props = None
+        props_get = id_props.get if id_props is not None else cache_obj.get
+
+        # 只检查自上次 flush 以来变化过的键（脏键）；注册 Empty / 撤销 / 加载时由 psd_mark_results_dirty 全量标脏
+        dirty = _psd_dirty_keys.get(arm_key)
+        if not dirty and arm_key not in _psd_empty_tag_pending:
+            return False
+
         changes = {}
-        for k, v in mem.items():
+        for k in (dirty or ()):
+            v = mem.get(k)
+            if v is None:
+                continue
             fv = float(v)
-            prev = cache_obj.get(k, None)
+            prev = props_get(k, None)
             if prev is None or abs(prev - fv) > 0.001:
                 changes[k] = fv
 
-        if not changes:
-            return False  # 无变化，直接返回
+        if changes:
+            # 批量赋值：一次 update() 写入所有变化的键；属性组不可用时逐键写入
+            try:
+                id_props.update(changes)
+            except Exception:
+                for k, v in changes.items():
+                    cache_obj[k] = v
+            _psd_empty_tag_pending.add(arm_key)
 
-        # 批量赋值（仍是循环，但这是最快方式）
-        for k, v in changes.items():
-            cache_obj[k] = v
+        # 写入成功后才清除脏键；写入途中出错时脏键保留，下次 flush 重试
+        _psd_dirty_keys.pop(arm_key, None)
 
-        # 只在有变化时 tag（关键！减少 depsgraph 触发）
+        if arm_key not in _psd_empty_tag_pending:
+            return False  # 无变化，直接返回
+
+        # 只在有变化时 tag（关键！减少 depsgraph 触发）；失败时保留标记，下次 flush 再 tag
         try:
             cache_obj.update_tag()
+            _psd_empty_tag_pending.discard(arm_key)
         except Exception as e:
             if verbose:
                 print("[PSD] cache_obj.update_tag() 失败:", e)
@@ -153,6 +193,20 @@ def psd_flush_mem_to_registered_empty(obj_arm: bpy.types.Object, verbose=False)
         return False
 
 
+def psd_mark_results_dirty(obj_arm=None):
+    """
+    把内存缓存中的键全部标记为脏（下次 flush 全量比较/写入）。
+    在注册新 Empty、撤销（Empty 上的属性被回退）时调用；不传参数则处理所有骨架。
+    """
+    if obj_arm is None:
+        for arm_key, mem in _psd_results_cache.items():
+            _psd_dirty_keys.setdefault(arm_key, set()).update(mem.keys())
+        return
+    arm_key = _arm_key_for_obj(obj_arm)
+    mem = _psd_results_cache.get(arm_key)
+    if mem:
+        _psd_dirty_keys.setdefault(arm_key, set()).update(mem.keys())
+
 def psd_set_result_datablock_empty_only(obj_arm, key, value, verbose=False):
     """
     优先写入用户注册的 Empty（如果注册了），否则回退到写入 Armature datablock（保留旧行为）。
@@ -185,7 +239,7 @@ def psd_set_result_datablock_empty_only(obj_arm, key, value, verbose=False):
     # 如果没有注册 Empty，则回退到写入 Armature datablock（原行为）
     wrote = False
     try:
-        arm_db = bpy.data.armatures.get(obj_arm.data.name)
+        arm_db = obj_arm.data
         if arm_db is not None:
             prev = arm_db.get(key, None)
             if prev is None or abs(prev - fw) > 1e-6:
@@ -229,6 +283,7 @@ def psd_set_result_cache_only(obj_arm, key, value, verbose=False):
         prev = arm_cache.get(key, None)
         if prev is None or abs(prev - fw) > 0.001:
             arm_cache[key] = fw
+            _psd_dirty_keys.setdefault(arm_key, set()).add(key)
             if verbose:
                 print(f"[PSD CACHE] 写入缓存 {obj_arm.name} : {key} = {fw}")
 
@@ -266,19 +321,47 @@ def psd_clear_results_for_arm(obj_arm):
     """清除某个 arm 的缓存结果。"""
     arm_key = _arm_key_for_obj(obj_arm)
     _psd_results_cache.pop(arm_key, None)
+    _psd_dirty_keys.pop(arm_key, None)
+    _psd_empty_tag_pending.discard(arm_key)
 
 def psd_clear_all_results():
     """清除所有缓存（全局）。"""
     _psd_results_cache.clear()
+    _psd_dirty_keys.clear()
+    _psd_empty_tag_pending.clear()
 
 #=====================================================
 
 
+_SPACE_RE = re.compile(r"\s+")
+_NONNAME_RE = re.compile(r"[^0-9A-Za-z_\-]")
+
+@lru_cache(maxsize=4096)
 def _safe_name(s: str) -> str:
-    s = (s or "").strip()
-    s = re.sub(r"\s+", "_", s)
-    s = re.sub(r"[^0-9A-Za-z_\-]", "_", s)
-    return s
+    # 条目/骨骼名很少变化，结果按输入缓存（注意 \s+ 会把连续空白合并成一个 _，不能简单换成逐字符 translate）
+    s = _SPACE_RE.sub("_", (s or "").strip())
+    return _NONNAME_RE.sub("_", s)
+
+# 结果键缓存：{ (prefix, bone_name, entry_name) -> "prefix<bone>_<entry>" }
+# 反复改名会留下旧键，超过上限时整体清空（与 _safe_name 的 lru 上限一致）
+_RESULT_KEY_CACHE_MAX = 4096
+_result_key_cache = {}
+
+def psd_result_key(prefix, bone_name, entry_name):
+    """返回 f"{prefix}{_safe_name(bone_name)}_{_safe_name(entry_name)}"，命中时直接查表"""
+    k = (prefix, bone_name, entry_name)
+    key = _result_key_cache.get(k)
+    if key is None:
+        key = f"{prefix}{_safe_name(bone_name)}_{_safe_name(entry_name)}"
+        if len(_result_key_cache) >= _RESULT_KEY_CACHE_MAX:
+            _result_key_cache.clear()
+        _result_key_cache[k] = key
+    return key
+
+def psd_clear_name_caches():
+    """清空名称相关的缓存（_safe_name / 结果键），加载新文件或注销插件时调用"""
+    _safe_name.cache_clear()
+    _result_key_cache.clear()
 
 def _get_selected_pair_bone(context):
     """从活动骨架的psd_bone_pairs中返回当前选定的骨骼名称，如果没有则返回'<NONE>'。"""
@@ -308,9 +391,111 @@ def _get_pose_matrix(obj_with_pose, bone_name):
         raise RuntimeError(f"在对象 '{obj_with_pose.name}' 上找不到姿态骨骼 '{bone_name}'")
     return pb.matrix.copy()
 
-def _capture_bone_local_rotation_deg(arm_obj, bone_name, depsgraph=None):
+def _get_cached_rest_locals(arm_obj, bone_name):
     """
-    返回骨骼当前 pose 相对于其 rest pose 的局部旋转（度），作为 (x,y,z)（以 XYZ 欧拉返回）。
+    返回 (rest_local_inv, parent_name)，按骨架数据懒加载缓存。
+    rest_local = parent_rest⁻¹ @ rest，缓存的是它的逆矩阵。
+    """
+    arm_cache = _rest_cache.setdefault(arm_obj.data.name, {})
+    cached = arm_cache.get(bone_name)
+    if cached is not None:
+        return cached
+
+    rest_mat = _get_rest_matrix(arm_obj, bone_name)
+    rest_bone = arm_obj.data.bones.get(bone_name)
+    parent_name = rest_bone.parent.name if rest_bone and rest_bone.parent else None
+
+    if parent_name:
+        parent_rest = arm_obj.data.bones[parent_name].matrix_local.copy()
+        try:
+            rest_local = parent_rest.inverted_safe() @ rest_mat
+        except Exception:
+            rest_local = rest_mat.copy()
+    else:
+        rest_local = rest_mat
+
+    try:
+        rest_local_inv = rest_local.inverted_safe()
+    except Exception:
+        rest_local_inv = rest_local.copy()
+        rest_local_inv.identity()
+
+    cached = (rest_local_inv, parent_name)
+    arm_cache[bone_name] = cached
+    return cached
+
+def psd_invalidate_rest_cache(arm_data_name=None):
+    """清空静止姿态缓存（不传参数则全部清空）。"""
+    if arm_data_name is None:
+        _rest_cache.clear()
+        _rest_batch_cache.clear()
+    else:
+        _rest_cache.pop(arm_data_name, None)
+        _rest_batch_cache.pop(arm_data_name, None)
+
+def _get_batch_layout(arm_obj, bone_names):
+    """
+    返回 (names, idx, parent_idx, rest_local_inv, n_pose_bones)：
+    names 为实际存在的骨骼，idx/parent_idx 为其在 pose.bones 中的索引（无父级为 -1），
+    rest_local_inv 为 (k,4,4) 的 rest_local 逆矩阵（行主序）。
+    """
+    per_arm = _rest_batch_cache.setdefault(arm_obj.data.name, {})
+    layout = per_arm.get(bone_names)
+    if layout is not None:
+        return layout
+
+    pose_bones = arm_obj.pose.bones
+    pose_index = {pb.name: i for i, pb in enumerate(pose_bones)}
+    names, idx, parent_idx, rest_inv = [], [], [], []
+    for bn in bone_names:
+        i = pose_index.get(bn)
+        if i is None or arm_obj.data.bones.get(bn) is None:
+            continue
+        inv, parent_name = _get_cached_rest_locals(arm_obj, bn)
+        names.append(bn)
+        idx.append(i)
+        parent_idx.append(pose_index.get(parent_name, -1) if parent_name else -1)
+        rest_inv.append(np.array(inv, dtype=np.float64))
+
+    layout = (
+        names,
+        np.array(idx, dtype=np.intp),
+        np.array(parent_idx, dtype=np.intp),
+        np.array(rest_inv, dtype=np.float64).reshape(-1, 4, 4),
+        len(pose_bones),
+    )
+    per_arm[bone_names] = layout
+    return layout
+
+def _mat3_to_euler_xyz_batch(m):
+    """
+    (k,3,3) 行主序旋转矩阵 -> (k,3) XYZ 欧拉角（弧度）。
+    与 Blender Matrix.to_euler('XYZ') 一致：先归一化各轴，再在两组解中取绝对值和较小者。
+    """
+    m = m / np.linalg.norm(m, axis=1, keepdims=True)
+    r00, r10, r20 = m[:, 0, 0], m[:, 1, 0], m[:, 2, 0]
+    r11, r12 = m[:, 1, 1], m[:, 1, 2]
+    r21, r22 = m[:, 2, 1], m[:, 2, 2]
+    cy = np.hypot(r00, r10)
+
+    e1 = np.stack((np.arctan2(r21, r22), np.arctan2(-r20, cy), np.arctan2(r10, r00)), axis=1)
+    e2 = np.stack((np.arctan2(-r21, -r22), np.arctan2(-r20, -cy), np.arctan2(-r10, -r00)), axis=1)
+
+    degen = cy <= 16.0 * _FLT_EPSILON
+    if degen.any():
+        e_deg = np.stack((np.arctan2(-r12, r11), np.arctan2(-r20, cy), np.zeros_like(cy)), axis=1)
+        e1 = np.where(degen[:, None], e_deg, e1)
+        e2 = np.where(degen[:, None], e_deg, e2)
+
+    use_e2 = np.abs(e1).sum(axis=1) > np.abs(e2).sum(axis=1)
+    return np.where(use_e2[:, None], e2, e1)
+
+def _capture_bones_local_batch(arm_obj, bone_names, depsgraph=None):
+    """
+    批量版的 _capture_bone_local_rotation_deg / _capture_bone_local_translation_effective，
+    并一并读取 pose 缩放。用 foreach_get 一次取出所有 pose 矩阵，后续全部在 NumPy 中完成。
+    bone_names 需为 tuple（作为布局缓存 key）。
+    返回 (names, rot_deg(k,3), loc(k,3), sca(k,3))；父级矩阵不可逆等情况下抛出异常，由调用方回退逐骨骼计算。
     """
     if not arm_obj or arm_obj.type != 'ARMATURE':
         raise RuntimeError("必须传递一个骨架对象")
@@ -324,31 +509,87 @@ def _capture_bone_local_rotation_deg(arm_obj, bone_name, depsgraph=None):
         except Exception:
             source_obj = arm_obj
 
-    rest_mat = _get_rest_matrix(arm_obj, bone_name)
-    pose_mat = _get_pose_matrix(source_obj, bone_name)
-
-    rest_bone = arm_obj.data.bones.get(bone_name)
-    parent_name = rest_bone.parent.name if rest_bone and rest_bone.parent else None
+    names, idx, parent_idx, rest_inv, n_bones = _get_batch_layout(arm_obj, bone_names)
+    pose_bones = source_obj.pose.bones
+    if len(pose_bones) != n_bones:
+        psd_invalidate_rest_cache(arm_obj.data.name)
+        names, idx, parent_idx, rest_inv, n_bones = _get_batch_layout(arm_obj, bone_names)
+    if not names:
+        return names, np.empty((0, 3)), np.empty((0, 3)), np.empty((0, 3))
+
+    # foreach_get 按内存顺序（列主序）输出，转置为行主序
+    flat = np.empty(n_bones * 16, dtype=np.float32)
+    pose_bones.foreach_get('matrix', flat)
+    mats = flat.reshape(-1, 4, 4).transpose(0, 2, 1).astype(np.float64)
+
+    pose_local = mats[idx]
+    has_parent = parent_idx >= 0
+    if has_parent.any():
+        # parent⁻¹ @ child：直接解线性方程组，不显式求逆（与 rotation_difference 同理）
+        pose_local[has_parent] = np.linalg.solve(mats[parent_idx[has_parent]], pose_local[has_parent])
+
+    delta = rest_inv @ pose_local
+    rot_deg = np.degrees(_mat3_to_euler_xyz_batch(delta[:, :3, :3]))
+    loc = delta[:, :3, 3]
+
+    sca_flat = np.empty(n_bones * 3, dtype=np.float32)
+    pose_bones.foreach_get('scale', sca_flat)
+    sca = sca_flat.reshape(-1, 3)[idx]
+    return names, rot_deg, loc, sca
+
+def _capture_bone_local_delta(arm_obj, bone_name, source_obj, pb=None):
+    """
+    返回骨骼 pose 相对 rest 的局部变换矩阵 delta = rest_local⁻¹ @ pose_local。
+    pb 可传入已取得的姿态骨骼，避免重复 pose.bones.get()。
+    """
+    rest_local_inv, parent_name = _get_cached_rest_locals(arm_obj, bone_name)
+    if pb is None:
+        pose_mat = _get_pose_matrix(source_obj, bone_name)
+    else:
+        pose_mat = pb.matrix
 
     if parent_name:
-        parent_rest = arm_obj.data.bones[parent_name].matrix_local.copy()
-        parent_pose = _get_pose_matrix(source_obj, parent_name)
-        try:
-            rest_local = parent_rest.inverted_safe() @ rest_mat
-        except Exception:
-            rest_local = rest_mat.copy()
+        parent_pb = pb.parent if pb is not None else None
+        if parent_pb is not None and parent_pb.name == parent_name:
+            parent_pose = parent_pb.matrix
+        else:
+            parent_pose = _get_pose_matrix(source_obj, parent_name)
         try:
             pose_local = parent_pose.inverted_safe() @ pose_mat
         except Exception:
             pose_local = pose_mat.copy()
     else:
-        rest_local = rest_mat
         pose_local = pose_mat
 
-    try:
-        delta = rest_local.inverted_safe() @ pose_local
-    except Exception:
-        delta = pose_local.copy()
+    return rest_local_inv @ pose_local
+
+def _capture_bone_local_rot_loc(arm_obj, bone_name, source_obj, pb=None):
+    """
+    一次计算 delta，同时返回 (旋转度数 (x,y,z), 等效平移 Vector)。
+    等价于分别调用 _capture_bone_local_rotation_deg / _capture_bone_local_translation_effective。
+    """
+    delta = _capture_bone_local_delta(arm_obj, bone_name, source_obj, pb=pb)
+    delta_rot = delta.to_3x3().to_euler('XYZ')
+    rot_deg = (math.degrees(delta_rot.x), math.degrees(delta_rot.y), math.degrees(delta_rot.z))
+    return rot_deg, delta.to_translation()
+
+def _capture_bone_local_rotation_deg(arm_obj, bone_name, depsgraph=None):
+    """
+    返回骨骼当前 pose 相对于其 rest pose 的局部旋转（度），作为 (x,y,z)（以 XYZ 欧拉返回）。
+    """
+    if not arm_obj or arm_obj.type != 'ARMATURE':
+        raise RuntimeError("必须传递一个骨架对象")
+
+    source_obj = arm_obj
+    if depsgraph is not None:
+        try:
+            eval_obj = arm_obj.evaluated_get(depsgraph)
+            if eval_obj:
+                source_obj = eval_obj
+        except Exception:
+            source_obj = arm_obj
+
+    delta = _capture_bone_local_delta(arm_obj, bone_name, source_obj)
 
     delta_rot = delta.to_3x3().to_euler('XYZ')
     return (math.degrees(delta_rot.x), math.degrees(delta_rot.y), math.degrees(delta_rot.z))
@@ -395,31 +636,7 @@ def _capture_bone_local_translation_effective(arm_obj, bone_name, depsgraph=None
         except Exception:
             source_obj = arm_obj
 
-    rest_mat = _get_rest_matrix(arm_obj, bone_name)
-    pose_mat = _get_pose_matrix(source_obj, bone_name)
-
-    rest_bone = arm_obj.data.bones.get(bone_name)
-    parent_name = rest_bone.parent.name if rest_bone and rest_bone.parent else None
-
-    if parent_name:
-        parent_rest = arm_obj.data.bones[parent_name].matrix_local.copy()
-        parent_pose = _get_pose_matrix(source_obj, parent_name)
-        try:
-            rest_local = parent_rest.inverted_safe() @ rest_mat
-        except Exception:
-            rest_local = rest_mat.copy()
-        try:
-            pose_local = parent_pose.inverted_safe() @ pose_mat
-        except Exception:
-            pose_local = pose_mat.copy()
-    else:
-        rest_local = rest_mat
-        pose_local = pose_mat
-
-    try:
-        delta = rest_local.inverted_safe() @ pose_local
-    except Exception:
-        delta = pose_local.copy()
+    delta = _capture_bone_local_delta(arm_obj, bone_name, source_obj)
 
     return delta.to_translation()
 
@@ -456,7 +673,8 @@ def psd_set_result_datablock_only(obj_arm, key, value, verbose=False):
 
     wrote = False
     try:
-        arm_db = bpy.data.armatures.get(obj_arm.data.name)
+        # 直接用 obj_arm.data，省去按名查找（链接库中同名数据块时按名查找还可能拿错）
+        arm_db = obj_arm.data
         if arm_db is not None:
             prev = arm_db.get(key, None)
             if prev is None or abs(prev - fw) > 1e-6:
@@ -464,17 +682,17 @@ def psd_set_result_datablock_only(obj_arm, key, value, verbose=False):
                 wrote = True
                 if verbose:
                     print(f"[PSD] 已写入骨架数据块 '{arm_db.name}': {key} = {fw}")
-            try:
-                arm_db.update_tag()
-            except Exception:
-                pass
+                # 只在有变化时 tag
+                try:
+                    arm_db.update_tag()
+                except Exception:
+                    pass
     except Exception as e:
         if verbose:
             print("psd_set_result_datablock_only: 写入失败:", e)
         return False
     return wrote
 
-
 def bone_items(self, context):
     obj = context.object
     items = []